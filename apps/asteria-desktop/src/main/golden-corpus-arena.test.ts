@@ -0,0 +1,36 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus page arena", () => {
+  it("hands worker pages over in place through recycled arena slots", () => {
+    const script = `\
+import sys\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, ArenaImage, PageArena, build_pages, max_page_bytes, render_page\n\
+jobs = PAGE_JOBS[:4]\n\
+with PageArena(3, max_page_bytes(300, "RGB")) as arena:\n\
+    for job, (handle, truth, _) in zip(jobs, build_pages(1337, workers=2, jobs=jobs, arena=arena)):\n\
+        arena.retain(handle.slot, 1)\n\
+        pixels = arena.view(handle)\n\
+        expected = render_page(job, 1337)[0]\n\
+        print(truth.pageId, isinstance(handle, ArenaImage), pixels.tobytes() == expected.tobytes(), pixels.flags.owndata)\n\
+        del pixels\n\
+        arena.release(handle.slot)\n\
+    print(arena._free.qsize())\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines).toHaveLength(5);
+    for (const line of lines.slice(0, 4)) {
+      expect(line.endsWith(" True True False")).toBe(true);
+    }
+    expect(lines[4]).toBe("3");
+  });
+});
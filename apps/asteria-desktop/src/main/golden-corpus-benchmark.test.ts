@@ -0,0 +1,43 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus benchmark suite", () => {
+  it("records baselines and fails on regressions", () => {
+    const script = `\
+import json, os, subprocess, sys, tempfile\n\
+from pathlib import Path\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from benchmark import SUITE_OPERATORS, find_regressions\n\
+from generate import PAGE_JOBS\n\
+base = {"a": {"medianMs": 10.0, "p95Ms": 11.0, "peakMb": 5.0}, "b": {"medianMs": 0.5, "p95Ms": 0.6, "peakMb": 5.0}}\n\
+now = {"a": {"medianMs": 14.0, "p95Ms": 15.0, "peakMb": 5.5}, "b": {"medianMs": 1.5, "p95Ms": 1.6, "peakMb": 9.0}, "c": {"medianMs": 1.0, "p95Ms": 1.0, "peakMb": 1.0}}\n\
+print([m.split()[:2] for m in find_regressions(now, base, 0.25, 2.0, 1.0)])\n\
+tmp = Path(tempfile.mkdtemp())\n\
+env = {**os.environ, "ASTERIA_OBS_DIR": str(tmp / "obs")}\n\
+cmd = [sys.executable, "tools/golden_corpus/benchmark.py", "--suite", "--dpi-levels", "30", "--repeats", "1"]\n\
+run = subprocess.run(cmd + ["--save-baseline", str(tmp / "base.json")], env=env, capture_output=True)\n\
+baseline = json.loads((tmp / "base.json").read_text())\n\
+cases = baseline["cases"]\n\
+print(run.returncode, len(cases) == len(PAGE_JOBS) + len(SUITE_OPERATORS), sorted(cases["op.save_png@30"]))\n\
+cases["op.apply_vignette@30"]["medianMs"] = 0.0\n\
+(tmp / "slow.json").write_text(json.dumps(baseline))\n\
+run = subprocess.run(cmd + ["--baseline", str(tmp / "slow.json"), "--min-ms", "0"], env=env, capture_output=True, text=True)\n\
+print(run.returncode, "GOLDEN_BENCHMARK_REGRESSION op.apply_vignette@30" in run.stderr)\n\
+events = [json.loads(line) for f in (tmp / "obs").rglob("*.jsonl") for line in f.read_text().splitlines()]\n\
+print(sum(e["kind"] == "metric" and e["phase"] == "benchmark" for e in events) == 2 * len(cases))\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("[['a', 'medianMs'], ['b', 'peakMb']]");
+    expect(lines[1]).toBe("0 True ['medianMs', 'p95Ms', 'peakMb']");
+    expect(lines[2]).toBe("1 True");
+    expect(lines[3]).toBe("True");
+  });
+});
@@ -0,0 +1,44 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus build cache", () => {
+  it("reuses only pages whose cache key and checksums still match under --only", () => {
+    const script = `\
+import json, os, subprocess, sys, tempfile\n\
+from pathlib import Path\n\
+tmp = Path(tempfile.mkdtemp())\n\
+out = tmp / "golden"\n\
+env = {**os.environ, "ASTERIA_OBS_DIR": str(tmp / "obs")}\n\
+def run(*args):\n\
+    cmd = [sys.executable, "tools/golden_corpus/generate.py", "--out", str(out), *args]\n\
+    return subprocess.run(cmd, env=env, capture_output=True, text=True)\n\
+miss = run("--only", "p01_clean_single")\n\
+print(miss.returncode, "15 page(s) are missing or stale" in miss.stderr, (out / "manifest.json").exists())\n\
+print(run().returncode, run("--no-cache", "--only", "p01_clean_single").returncode)\n\
+reused = (out / "inputs" / "p02_clean_double.png").stat().st_mtime_ns\n\
+hit = run("--only", "p01_clean_single")\n\
+manifest = json.loads((out / "manifest.json").read_text())\n\
+print(hit.returncode, len(manifest["pages"]), (out / "inputs" / "p02_clean_double.png").stat().st_mtime_ns == reused, run("--verify").returncode)\n\
+reseeded = run("--seed", "7", "--only", "p01_clean_single")\n\
+print(reseeded.returncode, "15 page(s) are missing or stale" in reseeded.stderr)\n\
+with open(out / "truth" / "p02_clean_double.json", "a") as handle:\n\
+    handle.write(" ")\n\
+stale = run("--only", "p01_clean_single")\n\
+print(stale.returncode, "1 page(s) are missing or stale: p02_clean_double;" in stale.stderr)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("1 True False");
+    expect(lines[1]).toBe("0 2");
+    expect(lines[2]).toBe("0 16 True 0");
+    expect(lines[3]).toBe("1 True");
+    expect(lines[4]).toBe("1 True");
+  });
+});
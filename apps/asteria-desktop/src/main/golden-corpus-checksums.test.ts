@@ -0,0 +1,39 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import path from "node:path";
+import os from "node:os";
+import fsp from "node:fs/promises";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus checksum verification", () => {
+  it("indexes outputs, detects tampering and checks render determinism", async () => {
+    const tmpDir = await fsp.mkdtemp(path.join(os.tmpdir(), "asteria-golden-checksums-"));
+    const outDir = path.join(tmpDir, "golden");
+    const env = { ...process.env, ASTERIA_OBS_DIR: path.join(tmpDir, "observability") };
+    const run = (...args: string[]) =>
+      spawnSync(python.command, ["tools/golden_corpus/generate.py", ...args], {
+        cwd: repoRoot,
+        env,
+        encoding: "utf-8",
+      });
+
+    expect(run("--out", outDir, "--pages", "1").status).toBe(0);
+    const index = JSON.parse(await fsp.readFile(path.join(outDir, "checksums.json"), "utf-8"));
+    expect(Object.keys(index.files).sort()).toEqual([
+      "inputs/s000000_spread.png",
+      "manifest.json",
+      "truth/s000000_spread.json",
+    ]);
+    expect(run("--out", outDir, "--verify").status).toBe(0);
+
+    await fsp.appendFile(path.join(outDir, "truth", "s000000_spread.json"), " ");
+    expect(run("--out", outDir, "--verify").status).not.toBe(0);
+
+    const determinism = run("--verify-determinism", "--only", "p11_curved_warp");
+    expect(determinism.status).toBe(0);
+    expect(determinism.stdout).toContain("1 page(s) rendered identically twice");
+  });
+});
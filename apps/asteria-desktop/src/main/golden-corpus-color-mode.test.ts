@@ -0,0 +1,36 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus color mode", () => {
+  it("renders single-channel pages matching the RGB luminance", () => {
+    const script = `\
+import sys\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+import numpy as np\n\
+from generate import PAGE_JOBS, render_page\n\
+for job in PAGE_JOBS:\n\
+    if job.page_id not in ("p07_plate", "p11_curved_warp", "p14_spread_light_gutter"):\n\
+        continue\n\
+    rgb, rgb_truth, _ = render_page(job, 1337, "RGB")\n\
+    gray, gray_truth, _ = render_page(job, 1337, "L")\n\
+    same = np.array_equal(np.asarray(rgb)[..., 0], np.asarray(gray))\n\
+    print(job.page_id, gray.mode, same, rgb_truth == gray_truth)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines).toHaveLength(3);
+    for (const line of lines) {
+      const [, mode, same, truthSame] = line.split(" ");
+      expect(mode).toBe("L");
+      expect(same).toBe("True");
+      expect(truthSame).toBe("True");
+    }
+  });
+});
@@ -0,0 +1,52 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus DPI levels", () => {
+  it("derives lower levels from one high-resolution render", () => {
+    const script = `\
+import sys\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+import numpy as np\n\
+from generate import PAGE_JOBS, render_page, resample_image, scale_truth\n\
+job = next(job for job in PAGE_JOBS if job.page_id == "p13_rotation_only")\n\
+native, truth, _ = render_page(job, 1337)\n\
+high, high_truth, _ = render_page(job, 1337, dpi=600)\n\
+derived = resample_image(high, native.size)\n\
+diff = np.abs(np.asarray(derived, dtype=np.int16) - np.asarray(native, dtype=np.int16))\n\
+doubled = scale_truth(truth, 2.0)\n\
+print(list(high.size), doubled.pageBoundsPx)\n\
+print(high_truth == truth, round(float(diff.mean()), 3))\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const [sizes, comparison] = result.stdout.trim().split("\n");
+    expect(sizes).toBe("[4350, 6150] [0, 0, 4349, 6149]");
+    const [sameTruth, meanDiff] = comparison.split(" ");
+    expect(sameTruth).toBe("True");
+    expect(Number(meanDiff)).toBeLessThan(1.5);
+  });
+
+  it("does not leak a page's render settings into later calls", () => {
+    const script = `\
+import sys\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, RenderSettings, apply_rotation_perspective, current_render_settings, new_canvas, render_page\n\
+img, _truth, _entry = render_page(PAGE_JOBS[0], 1337, "L", 150, 1.0, True)\n\
+print(current_render_settings() == RenderSettings(), new_canvas(100, 50).size, new_canvas(100, 50).mode)\n\
+print(img.size, apply_rotation_perspective(img, 3.5).size)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("True (100, 50) RGB");
+    expect(lines[1]).toBe("(1088, 1538) (1088, 1538)");
+  });
+});
@@ -0,0 +1,43 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus encoder pool", () => {
+  it("writes the same bytes for any encoder count and bounds the queue", () => {
+    const script = `\
+import os, subprocess, sys, tempfile\n\
+from pathlib import Path\n\
+tmp = Path(tempfile.mkdtemp())\n\
+def build(name, *args):\n\
+    env = {**os.environ, "ASTERIA_OBS_DIR": str(tmp / f"obs-{name}")}\n\
+    cmd = [sys.executable, "tools/golden_corpus/generate.py", "--out", str(tmp / name), "--dpi-levels", "100,50", *args]\n\
+    run = subprocess.run(cmd, env=env, capture_output=True)\n\
+    files = {str(path.relative_to(tmp / name)): path.read_bytes() for path in sorted((tmp / name).rglob("*")) if path.is_file()}\n\
+    return run.returncode, files\n\
+inline = build("inline", "--encoders", "0")\n\
+pooled = build("pooled", "--encoders", "3")\n\
+scheduled = build("scheduled", "--encoders", "2", "--workers", "2")\n\
+print(inline[0], pooled[0], scheduled[0], len(inline[1]))\n\
+print(inline[1] == pooled[1], inline[1] == scheduled[1])\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, OutputLevel, build_pages, write_pages\n\
+for encoders in (0, 1, 3):\n\
+    level = OutputLevel(100, tmp / f"depth-{encoders}")\n\
+    pages = build_pages(1337, jobs=PAGE_JOBS[:6], dpi=100)\n\
+    print(encoders, [written.queue_depth for written in write_pages(pages, [level], encoders=encoders)])\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("0 0 0 68");
+    expect(lines[1]).toBe("True True");
+    expect(lines[2]).toBe("0 [0, 0, 0, 0, 0, 0]");
+    expect(lines[3]).toBe("1 [1, 1, 1, 1, 1, 0]");
+    expect(lines[4]).toBe("3 [3, 3, 3, 2, 1, 0]");
+  });
+});
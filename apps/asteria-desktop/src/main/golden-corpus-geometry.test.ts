@@ -0,0 +1,42 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus geometry stage", () => {
+  it("composes rotate+perspective like the old two passes and maps truth boxes", () => {
+    const script = `\
+import sys\n\
+import cv2\n\
+import numpy as np\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import BODY, HEIGHT, PAGE_JOBS, WIDTH, GeometryStage, render_page\n\
+w, h = WIDTH, HEIGHT\n\
+rotation = np.vstack([cv2.getRotationMatrix2D((w / 2.0, h / 2.0), 3.5, 1.0), [0.0, 0.0, 1.0]])\n\
+src = np.float32([[0, 0], [w - 1, 0], [w - 1, h - 1], [0, h - 1]])\n\
+dst = np.float32([[40, 20], [w - 60, 0], [w - 20, h - 40], [0, h - 10]])\n\
+perspective = cv2.getPerspectiveTransform(src, dst)\n\
+stage = GeometryStage(w, h).rotate(3.5).perspective(src, dst)\n\
+points = np.random.default_rng(0).uniform(0, (w, h), (200, 1, 2))\n\
+two_pass = cv2.perspectiveTransform(cv2.perspectiveTransform(points, rotation), perspective)\n\
+print(np.allclose(stage.matrix, perspective @ rotation), np.allclose(cv2.perspectiveTransform(points, stage.matrix), two_pass))\n\
+x0, y0, x1, y1 = BODY\n\
+corners = cv2.perspectiveTransform(cv2.perspectiveTransform(np.float64([[[x0, y0]], [[x1, y0]], [[x1, y1]], [[x0, y1]]]), rotation), perspective).reshape(-1, 2)\n\
+print(np.floor(corners.min(axis=0)).astype(int).tolist() + np.ceil(corners.max(axis=0)).astype(int).tolist() == stage.transform_box(BODY))\n\
+truth = {job.page_id: render_page(job, 1337)[1] for job in PAGE_JOBS if job.page_id in ("p12_rot_perspective", "p13_rotation_only")}\n\
+print(stage.transform_box(BODY), truth["p12_rot_perspective"].contentBoxPx)\n\
+print(GeometryStage(w, h).rotate(-2.8).transform_box(BODY), truth["p13_rotation_only"].contentBoxPx)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("True True");
+    expect(lines[1]).toBe("True");
+    expect(lines[2]).toBe("[93, 120, 2098, 2976] [93, 120, 2098, 2976]");
+    expect(lines[3]).toBe("[72, 135, 2101, 2980] [72, 135, 2101, 2980]");
+  });
+});
@@ -0,0 +1,89 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus gutter calibration", () => {
+  it("picks the same gutter colours as the old blend-and-score loop", () => {
+    const script = `\
+import sys\n\
+import cv2\n\
+import numpy as np\n\
+from PIL import Image\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+import generate\n\
+def legacy_confidence(image):\n\
+    arr = np.array(image)\n\
+    h, w = arr.shape[:2]\n\
+    if w == 0 or h == 0 or w / h < 1.25:\n\
+        return 0.0\n\
+    preview_width = min(320, w)\n\
+    preview_height = max(1, int(round(h * preview_width / w)))\n\
+    preview = cv2.resize(arr, (preview_width, preview_height), interpolation=cv2.INTER_AREA)\n\
+    column_means = cv2.cvtColor(preview, cv2.COLOR_RGB2GRAY).mean(axis=0)\n\
+    global_mean = float(column_means.mean())\n\
+    center_start, center_end = int(preview_width * 0.4), int(preview_width * 0.6)\n\
+    min_index = center_start\n\
+    min_value = float(column_means[min_index])\n\
+    for x in range(center_start, center_end):\n\
+        if column_means[x] < min_value:\n\
+            min_value, min_index = float(column_means[x]), x\n\
+    darkness = global_mean - min_value\n\
+    if darkness < 10:\n\
+        return 0.0\n\
+    mid = preview_width // 2\n\
+    center_distance = abs(min_index - mid) / max(1, mid)\n\
+    symmetry = 1 - min(1, abs(column_means[:mid].mean() - column_means[mid:].mean()) / max(1, global_mean))\n\
+    return max(0.0, min(1.0, (darkness / 35) * 0.6 + symmetry * 0.3 + (1 - center_distance) * 0.1))\n\
+def legacy_gutter(img, gutter, color, alpha, attempts, target, color_range, steps):\n\
+    colors = []\n\
+    for _attempt in range(attempts):\n\
+        overlay = np.full((img.height, img.width, 3), generate.BACKGROUND, dtype=np.uint8)\n\
+        overlay[:, gutter[0] : gutter[1]] = color\n\
+        img = Image.blend(img, Image.fromarray(overlay, mode="RGB"), alpha=alpha)\n\
+        confidence = legacy_confidence(img)\n\
+        colors.append(color)\n\
+        if target[0] <= confidence < target[1]:\n\
+            break\n\
+        step = steps[0] if confidence < target[0] else -steps[1]\n\
+        color = max(color_range[0], min(color_range[1], color + step))\n\
+    return img, colors\n\
+def colors_tried(confidences, color, target, color_range, steps, **_rest):\n\
+    colors = []\n\
+    for confidence in confidences:\n\
+        colors.append(color)\n\
+        if target[0] <= confidence < target[1]:\n\
+            break\n\
+        step = steps[0] if confidence < target[0] else -steps[1]\n\
+        color = max(color_range[0], min(color_range[1], color + step))\n\
+    return colors\n\
+calls = []\n\
+blend, score = generate.blend_calibrated_gutter, generate.column_confidence\n\
+def recording_score(means):\n\
+    calls[-1][2].append(score(means))\n\
+    return calls[-1][2][-1]\n\
+def recording_blend(img, span, **calibration):\n\
+    calls.append((img.copy(), span, [], calibration))\n\
+    out = blend(img, span, **calibration)\n\
+    calls[-1] = calls[-1] + (out,)\n\
+    return out\n\
+generate.blend_calibrated_gutter, generate.column_confidence = recording_blend, recording_score\n\
+for job in generate.PAGE_JOBS:\n\
+    if job.page_id in ("p10_spread_dark_gutter", "p14_spread_light_gutter"):\n\
+        generate.render_page(job, 1337)\n\
+for before, span, confidences, calibration, after in calls:\n\
+    expected, legacy_colors = legacy_gutter(before, span, **calibration)\n\
+    diff = np.abs(np.asarray(expected, dtype=np.int16) - np.asarray(after, dtype=np.int16))\n\
+    print(colors_tried(confidences, **calibration) == legacy_colors, len(legacy_colors), int(diff.max()) <= 2)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("True 3 True");
+    expect(lines[1]).toBe("True 5 True");
+  });
+});
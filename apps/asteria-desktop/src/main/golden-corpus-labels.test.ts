@@ -0,0 +1,42 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus label masks", () => {
+  it("labels drawn elements and warps masks with the page", () => {
+    const script = `\
+import sys\n\
+import numpy as np\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import LABEL_CLASSES, PAGE_JOBS, decode_labels, encode_labels, render_page, scale_truth\n\
+jobs = {job.page_id: job for job in PAGE_JOBS}\n\
+img, truth, _entry = render_page(jobs["p16_overlay_elements"], 1337, "L", 150, None, True)\n\
+mask = decode_labels(truth.labels)\n\
+print(mask.shape == (img.height, img.width), sorted(LABEL_CLASSES[v] for v in np.unique(mask)))\n\
+pixels = np.asarray(img)\n\
+print(pixels[mask == LABEL_CLASSES.index("marginalia")].mean() < 60, "labels" in truth.model_dump())\n\
+img, truth, _entry = render_page(jobs["p13_rotation_only"], 1337, "L", 150, None, True)\n\
+mask = decode_labels(truth.labels)\n\
+ink = np.asarray(img) < 100\n\
+print(round(float((mask[ink] == 1).mean()), 2), np.array_equal(decode_labels(encode_labels(mask)), mask))\n\
+print(decode_labels(scale_truth(truth, 0.25).labels).shape)\n\
+img, truth, _entry = render_page(jobs["p13_rotation_only"], 1337, "L", 150)\n\
+print(truth.labels)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe(
+      "True ['background', 'body', 'drop-cap', 'folio', 'footnotes', 'marginalia', 'ornament', 'running-head', 'title']"
+    );
+    expect(lines[1]).toBe("True False");
+    expect(lines[2]).toBe("1.0 True");
+    expect(lines[3]).toBe("(769, 544)");
+    expect(lines[4]).toBe("None");
+  });
+});
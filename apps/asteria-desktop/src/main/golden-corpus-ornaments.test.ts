@@ -0,0 +1,50 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython({ deps: false });
+
+describe.skipIf(!python.available)("golden corpus ornament index", () => {
+  it("matches a linear scan and round-trips through corpora and disk", () => {
+    const script = `\
+import json, random, sys, tempfile\n\
+from pathlib import Path\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from ornaments import OrnamentIndex, OrnamentRecord, iter_corpus_ornaments\n\
+rng = random.Random(7)\n\
+bases = [rng.getrandbits(64) for _ in range(50)]\n\
+values = []\n\
+for _ in range(5000):\n\
+    value = rng.choice(bases)\n\
+    for _ in range(rng.randrange(8)):\n\
+        value ^= 1 << rng.randrange(64)\n\
+    values.append(value)\n\
+index = OrnamentIndex(OrnamentRecord(f"{v:016x}", "c", f"p{i}") for i, v in enumerate(values))\n\
+ok = True\n\
+for distance in (0, 3, 7, 12, 20):\n\
+    for query in bases[:5] + [rng.getrandbits(64) for _ in range(5)]:\n\
+        found = {r.pageId for _d, r in index.query(f"{query:016x}", distance)}\n\
+        ok &= found == {f"p{i}" for i, v in enumerate(values) if (v ^ query).bit_count() <= distance}\n\
+print(ok)\n\
+root = Path(tempfile.mkdtemp())\n\
+(root / "truth").mkdir()\n\
+pages = [{"id": "a", "truthFile": "a.json"}, {"id": "b", "truthFile": "b.json", "ornamentHash": "00000000000000ff"}]\n\
+(root / "manifest.json").write_text(json.dumps({"pages": pages}))\n\
+(root / "truth" / "a.json").write_text(json.dumps({"ornaments": [{"box": [1, 2, 3, 4], "hash": "00000000000000f0"}]}))\n\
+index = OrnamentIndex(iter_corpus_ornaments(root))\n\
+index.save(root / "index.json")\n\
+loaded = OrnamentIndex.load(root / "index.json")\n\
+print([(d, r.pageId, r.box) for d, r in loaded.query("00000000000000f1", 4)])\n\
+print(len(loaded.without([root.resolve().as_posix()])))\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("True");
+    expect(lines[1]).toBe("[(1, 'a', (1, 2, 3, 4)), (3, 'b', None)]");
+    expect(lines[2]).toBe("0");
+  });
+});
@@ -0,0 +1,42 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus pack container", () => {
+  it("round-trips pages and truth through raw and zlib packs", () => {
+    const script = `\
+import sys, tempfile\n\
+from pathlib import Path\n\
+import numpy as np\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, render_page\n\
+from pack import ALIGNMENT, CorpusPack, PackWriter, pack_pixels\n\
+pages = [render_page(job, 1337, color_mode) for job, color_mode in ((PAGE_JOBS[0], "RGB"), (PAGE_JOBS[9], "L"))]\n\
+with tempfile.TemporaryDirectory() as tmp:\n\
+    for codec in ("raw", "zlib"):\n\
+        path = Path(tmp) / f"{codec}.pack"\n\
+        with PackWriter(path, codec) as writer:\n\
+            for img, truth, _ in pages:\n\
+                writer.add(truth.pageId, pack_pixels(img, codec), truth.model_dump(exclude_none=True))\n\
+            writer.close({"seed": 1337})\n\
+        with CorpusPack(path) as pack:\n\
+            arrays = [pack.array(truth.pageId) for _, truth, _ in pages]\n\
+            same = all(np.array_equal(a, np.asarray(img)) for a, (img, _, _) in zip(arrays, pages))\n\
+            truths = all(pack.truth(t.pageId) == t.model_dump(exclude_none=True) for _, t, _ in pages)\n\
+            aligned = all(pack.record(page_id)["offset"] % ALIGNMENT == 0 for page_id in pack)\n\
+            views = all(not a.flags.owndata and not a.flags.writeable for a in arrays)\n\
+            print(codec, len(pack), same, truths, aligned, views, pack.verify(pages[1][1].pageId), pack.manifest)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("raw 2 True True True True True {'seed': 1337}");
+    expect(lines[1].startsWith("zlib 2 True True True ")).toBe(true);
+    expect(lines[1].endsWith(" True {'seed': 1337}")).toBe(true);
+  });
+});
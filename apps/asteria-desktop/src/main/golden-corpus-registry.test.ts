@@ -0,0 +1,31 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus page registry", () => {
+  it("compiles specs into fused plans and times each step", () => {
+    const script = `\
+import sys\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, PAGE_SPECS, compile_plan, operator_timings, render_page\n\
+print([job.page_id for job in PAGE_JOBS] == [spec.page_id for spec in PAGE_SPECS], sum(job.spread for job in PAGE_JOBS))\n\
+by_id = {spec.page_id: spec for spec in PAGE_SPECS}\n\
+print([step.label for step in compile_plan(by_id["p03_running_head_folio"].ops)][-1])\n\
+print([step.label for step in compile_plan(by_id["p12_rot_perspective"].ops)][-1])\n\
+img, truth, entry = render_page(PAGE_JOBS[3], 1337, "L", 75)\n\
+print(entry.ornamentHash == truth.ornaments[0].hash, sorted(operator_timings()))\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("True 2");
+    expect(lines[1]).toBe("illumination+vignette");
+    expect(lines[2]).toBe("rotate+perspective");
+    expect(lines[3]).toBe("True ['canvas', 'ornament', 'text', 'texture']");
+  });
+});
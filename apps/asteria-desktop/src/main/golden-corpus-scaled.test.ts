@@ -0,0 +1,46 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus scaled mode", () => {
+  it("parses --mix and samples families by weight, deterministically and lazily", () => {
+    const script = `\
+import argparse, sys\n\
+from collections import Counter\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import iter_scaled_jobs, parse_mix, sample_scaled_spec\n\
+print(parse_mix("clean=3, warp,spread=0"))\n\
+for text in ("paper=1", "clean=-1", "clean=0", "clean=x"):\n\
+    try:\n\
+        parse_mix(text)\n\
+    except argparse.ArgumentTypeError as exc:\n\
+        print(str(exc).split(";")[0])\n\
+mix = parse_mix("clean=3,warp=1,spread=0")\n\
+samples = [sample_scaled_spec(7, index, mix) for index in range(4000)]\n\
+families = Counter(spec.family for _id, spec in samples)\n\
+print(sorted(families), abs(families["clean"] / 4000 - 0.75) < 0.03)\n\
+warps = [spec for _id, spec in samples if spec.family == "warp"]\n\
+print(all(8.0 <= spec.amplitude <= 30.0 and spec.angle == 0.0 for spec in warps), all(page_id == f"s{index:06d}_{spec.family}" for index, (page_id, spec) in enumerate(samples)))\n\
+print(samples[:50] == [sample_scaled_spec(7, index, mix) for index in reversed(range(50))][::-1], samples[0] != sample_scaled_spec(8, 0, mix))\n\
+jobs = iter_scaled_jobs(7, 10**9, mix)\n\
+print([next(jobs).page_id for _ in range(3)] == [page_id for page_id, _spec in samples[:3]])\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("{'clean': 3.0, 'warp': 1.0, 'spread': 0.0}");
+    expect(lines[1]).toBe("unknown family 'paper'");
+    expect(lines[2]).toBe("negative weight for clean");
+    expect(lines[3]).toBe("mix needs at least one positive weight");
+    expect(lines[4]).toBe("invalid weight for clean");
+    expect(lines[5]).toBe("['clean', 'warp'] True");
+    expect(lines[6]).toBe("True True");
+    expect(lines[7]).toBe("True True");
+    expect(lines[8]).toBe("True");
+  });
+});
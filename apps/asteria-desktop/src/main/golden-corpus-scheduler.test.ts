@@ -0,0 +1,67 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus memory scheduler", () => {
+  it("admits spreads first and keeps estimated peaks under the budget", () => {
+    const script = `\
+import sys\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, MemoryScheduler, estimate_page_bytes\n\
+spread = estimate_page_bytes(PAGE_JOBS[9])\n\
+single = estimate_page_bytes(PAGE_JOBS[0])\n\
+events = []\n\
+scheduler = MemoryScheduler(PAGE_JOBS, estimate_page_bytes, spread + single, lambda kind, attrs: events.append((kind, attrs)))\n\
+first = scheduler.admit()\n\
+second = scheduler.admit()\n\
+print(first.spread, second.spread, scheduler.admit() is None)\n\
+scheduler.finish(first)\n\
+print(scheduler.admit().spread, scheduler.in_flight_bytes <= scheduler.budget_bytes)\n\
+tight = MemoryScheduler(PAGE_JOBS[9:10], estimate_page_bytes, single, lambda kind, attrs: events.append((kind, attrs)))\n\
+print(tight.admit().page_id, events[-2][0])\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("True False True");
+    expect(lines[1]).toBe("True True");
+    expect(lines[2]).toBe("p10_spread_dark_gutter over-budget");
+  });
+
+  it("pulls a large job generator through a bounded lookahead window", () => {
+    const script = `\
+import sys\n\
+from collections import deque\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import MemoryScheduler, estimate_page_bytes, iter_scaled_jobs\n\
+pulled = []\n\
+def jobs():\n\
+    for job in iter_scaled_jobs(3, 50000):\n\
+        pulled.append(job.page_id)\n\
+        yield job\n\
+budget = 3 * estimate_page_bytes(next(iter_scaled_jobs(3, 1)), dpi=600)\n\
+scheduler = MemoryScheduler(jobs(), estimate_page_bytes, budget, lookahead=16)\n\
+running, done, window, ok = deque(), 0, 0, True\n\
+while True:\n\
+    while len(running) < 4 and (job := scheduler.admit()) is not None:\n\
+        running.append(job)\n\
+        window = max(window, len(pulled) - done - len(running))\n\
+        ok &= scheduler.in_flight_bytes <= budget\n\
+    if not running:\n\
+        break\n\
+    scheduler.finish(running.popleft())\n\
+    done += 1\n\
+print(done, len(set(pulled)), window <= 16, ok)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    expect(result.stdout.trim()).toBe("50000 50000 True True");
+  });
+});
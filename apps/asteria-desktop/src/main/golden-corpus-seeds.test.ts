@@ -0,0 +1,33 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus page seeds", () => {
+  it("renders each page the same regardless of order, workers or neighbours", () => {
+    const script = `\
+import random, sys\n\
+import numpy as np\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, build_pages, derive_page_seed, render_page\n\
+ids = [job.page_id for job in PAGE_JOBS]\n\
+seeds = [derive_page_seed(1337, page_id) for page_id in ids]\n\
+print(len(set(seeds)) == len(ids), seeds[::-1] == [derive_page_seed(1337, page_id) for page_id in reversed(ids)], seeds[0] != derive_page_seed(1338, ids[0]))\n\
+jobs = PAGE_JOBS[:4]\n\
+forward = {truth.pageId: img.tobytes() for img, truth, _ in build_pages(1337, jobs=jobs, dpi=100)}\n\
+backward = {truth.pageId: img.tobytes() for img, truth, _ in build_pages(1337, workers=2, jobs=jobs[::-1], dpi=100)}\n\
+random.random(); np.random.random()\n\
+alone = render_page(jobs[2], 1337, dpi=100)[0].tobytes()\n\
+print(len(forward), forward == backward, alone == forward[jobs[2].page_id])\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("True True True");
+    expect(lines[1]).toBe("4 True True");
+  });
+});
@@ -0,0 +1,53 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus SSIM scorer", () => {
+  it("scores pages against thresholds with tiled filters and coarse early failure", () => {
+    const script = `\
+import sys, tempfile\n\
+from pathlib import Path\n\
+import numpy as np\n\
+from PIL import Image\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, render_page\n\
+from score import ScoreOptions, load_luma, score_pages, ssim\n\
+with tempfile.TemporaryDirectory() as tmp:\n\
+    expected, actual = Path(tmp) / "expected", Path(tmp) / "actual"\n\
+    expected.mkdir(); actual.mkdir()\n\
+    clean = render_page(PAGE_JOBS[0], 1337)[0]\n\
+    clean.save(expected / "a.png"); clean.save(actual / "a.png")\n\
+    clean.save(expected / "b.png")\n\
+    noisy = np.asarray(clean).astype(np.int16) + np.random.default_rng(0).integers(-2, 3, (3075, 2175, 1))\n\
+    Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)).save(actual / "b.png")\n\
+    clean.save(expected / "c.png"); render_page(PAGE_JOBS[3], 1337)[0].save(actual / "c.png")\n\
+    clean.save(expected / "d.png")\n\
+    footnotes = render_page(PAGE_JOBS[4], 1337)[0]\n\
+    footnotes.save(expected / "e.png")\n\
+    Image.fromarray(np.roll(np.asarray(footnotes), 24, axis=1)).save(actual / "e.png")\n\
+    tasks = [(name, 0.9, expected / f"{name}.png", actual / f"{name}.png") for name in "abcd"]\n\
+    tasks.append(("e", 0.915, expected / "e.png", actual / "e.png"))\n\
+    for page in score_pages(tasks, ScoreOptions(), workers=2):\n\
+        print(page.pageId, page.passed, page.earlyExit, page.reason, page.score is not None and page.score > 0.95)\n\
+    x, y = load_luma(expected / "b.png"), load_luma(actual / "b.png")\n\
+    tiled = ssim(x, y, ScoreOptions(filter="gaussian", tile_rows=256))\n\
+    full = ssim(x, y, ScoreOptions(filter="gaussian", tile_rows=4096))\n\
+    print(abs(tiled - full) < 1e-6)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    expect(result.stdout.trim().split("\n")).toEqual([
+      "a True True identical True",
+      "b True False None True",
+      "c False True None False",
+      "d False False missing-actual False",
+      "e False False None False",
+      "True",
+    ]);
+  });
+});
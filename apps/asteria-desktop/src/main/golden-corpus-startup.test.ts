@@ -0,0 +1,46 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+// Cumulative `-X importtime` budgets in microseconds. Locally generate.py
+// imports in ~50 ms and py_reporter in ~15 ms; the slack absorbs slow CI
+// runners while still catching an eager imaging or pydantic import.
+const BUDGET_US: Record<string, number> = {
+  generate: 400_000,
+  py_reporter: 100_000,
+};
+const DEFERRED = ["cv2", "numpy", "PIL.Image", "imagehash", "pydantic", "rich"];
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus startup", () => {
+  it("defers the imaging stack, pydantic and rich until first use", () => {
+    const script = `\
+import sys\n\
+sys.path[:0] = ["tools/golden_corpus", "tools/observability"]\n\
+import generate\n\
+import py_reporter\n\
+print(len(generate.PAGE_JOBS))\n\
+`;
+
+    const result = spawnSync(python.command, ["-X", "importtime", "-c", script], {
+      cwd: repoRoot,
+      encoding: "utf-8",
+    });
+
+    expect(result.status).toBe(0);
+    expect(result.stdout.trim()).toBe("16");
+    const cumulative = new Map<string, number>();
+    for (const line of result.stderr.split("\n")) {
+      const match = /^import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*(\S+)\s*$/.exec(line);
+      if (match) cumulative.set(match[2], Number(match[1]));
+    }
+    for (const name of DEFERRED) {
+      expect(cumulative.has(name), `${name} was imported at startup`).toBe(false);
+    }
+    for (const [name, budget] of Object.entries(BUDGET_US)) {
+      expect(cumulative.get(name)).toBeLessThan(budget);
+    }
+  });
+});
@@ -0,0 +1,42 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus streaming", () => {
+  it("streams rendered pages as length-prefixed frames", () => {
+    const script = `\
+import io, os, subprocess, sys, tempfile\n\
+import numpy as np\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import iter_scaled_jobs, render_page\n\
+from stream import read_frames, decode_pixels\n\
+cmd = [sys.executable, "tools/golden_corpus/generate.py", "--stream", "-", "--pages", "3", "--seed", "9", "--color-mode", "L", "--workers", "2", "--stream-inflight", "1", "--label-masks"]\n\
+env = {**os.environ, "ASTERIA_OBS_DIR": tempfile.mkdtemp()}\n\
+run = subprocess.run(cmd + ["--run-id", "golden-stream-test"], env=env, capture_output=True)\n\
+frames = list(read_frames(io.BytesIO(run.stdout)))\n\
+print(run.returncode, [f.kind for f in frames])\n\
+pages = {f.header["pageId"]: f for f in frames if f.kind == "page"}\n\
+job = next(iter_scaled_jobs(9, 3))\n\
+img, truth, _entry = render_page(job, 9, "L")\n\
+frame = pages[job.page_id]\n\
+print(np.array_equal(decode_pixels(frame), np.asarray(img)), frame.header["truth"] == truth.model_dump(exclude_none=True), "labels" in frame.header)\n\
+print([page["id"] for page in frames[-1].header["manifest"]["pages"]] == sorted(pages))\n\
+try:\n\
+    list(read_frames(io.BytesIO(run.stdout[:-1])))\n\
+except EOFError as exc:\n\
+    print(exc)\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("0 ['start', 'page', 'page', 'page', 'end']");
+    expect(lines[1]).toBe("True True True");
+    expect(lines[2]).toBe("True");
+    expect(lines[3]).toBe("stream ended inside a frame");
+  });
+});
@@ -0,0 +1,53 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus text blocks", () => {
+  it("matches the per-line loop in extents, pixels and RNG state", () => {
+    const script = `\
+import sys\n\
+import numpy as np\n\
+from PIL import Image, ImageDraw\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import TEXT_COLOR, add_text_block, text_line_extents\n\
+def legacy(rng, box, line_height):\n\
+    x0, y0, x1, y1 = box\n\
+    max_width = x1 - x0\n\
+    y, line_index, lines = y0, 0, []\n\
+    while y + line_height <= y1:\n\
+        line_len = int(max_width * rng.uniform(0.6, 0.98))\n\
+        if line_index % 7 == 0:\n\
+            line_len = int(max_width * rng.uniform(0.4, 0.7))\n\
+        lines.append([x0, y, x0 + line_len, y + line_height - 6])\n\
+        y += line_height\n\
+        line_index += 1\n\
+    return lines\n\
+cases = [((160, 200, 2015, 2915), 40), ((160, 200, 1020, 2915), 28), ((0, 0, 300, 39), 40), ((0, 0, 300, 40), 40), ((10, 50, 900, 10), 40), ((5, 5, 700, 5 + 48 * 15), 48)]\n\
+same = True\n\
+for seed in range(5):\n\
+    for box, line_height in cases:\n\
+        old, new = np.random.default_rng(seed), np.random.default_rng(seed)\n\
+        same &= legacy(old, box, line_height) == text_line_extents(new, box, line_height).tolist()\n\
+        same &= old.bit_generator.state == new.bit_generator.state\n\
+print(same)\n\
+old, new = np.random.default_rng(9), np.random.default_rng(9)\n\
+img = Image.new("RGB", (2175, 3075), (255, 255, 255))\n\
+lines = add_text_block(img, cases[0][0], 40, new)\n\
+reference = Image.new("RGB", img.size, (255, 255, 255))\n\
+draw = ImageDraw.Draw(reference)\n\
+for line in legacy(old, cases[0][0], 40):\n\
+    draw.rectangle(line, fill=TEXT_COLOR)\n\
+print(lines.tolist() == legacy(np.random.default_rng(9), cases[0][0], 40), img.tobytes() == reference.tobytes(), old.random() == new.random(), len(lines))\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines[0]).toBe("True");
+    expect(lines[1]).toBe("True True True 67");
+  });
+});
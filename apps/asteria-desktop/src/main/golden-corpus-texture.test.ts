@@ -0,0 +1,32 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus paper texture", () => {
+  it("is byte-stable per seed", () => {
+    const script = `\
+import hashlib\n\
+import sys\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+import numpy as np\n\
+from generate import add_paper_texture, new_canvas\n\
+def digest(seed):\n\
+    img = add_paper_texture(new_canvas(640, 480), np.random.default_rng(seed), strength=1.5)\n\
+    return hashlib.sha256(img.tobytes()).hexdigest()\n\
+print(digest(1337))\n\
+print(digest(1337))\n\
+print(digest(7))\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const [first, second, other] = result.stdout.trim().split("\n");
+    expect(first).toBe(second);
+    expect(other).not.toBe(first);
+    expect(first).toBe("3bd557ab930559ac8b1712d9ab54ad25ed96695218922c99a0adee08c7fc66ad");
+  });
+});
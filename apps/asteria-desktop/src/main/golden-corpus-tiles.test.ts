@@ -0,0 +1,32 @@
+// @vitest-environment node
+import { describe, expect, it } from "vitest";
+import { spawnSync } from "node:child_process";
+import { goldenPython, repoRoot } from "./test/golden-python.js";
+
+const python = goldenPython();
+
+describe.skipIf(!python.available)("golden corpus banded rendering", () => {
+  it("matches full-frame output under a tile budget", () => {
+    const script = `\
+import sys\n\
+sys.path.insert(0, "tools/golden_corpus")\n\
+from generate import PAGE_JOBS, render_page\n\
+pages = ("p03_running_head_folio", "p10_spread_dark_gutter", "p11_curved_warp")\n\
+for job in PAGE_JOBS:\n\
+    if job.page_id not in pages:\n\
+        continue\n\
+    full = render_page(job, 1337)[0]\n\
+    banded = render_page(job, 1337, max_tile_mb=0.5)[0]\n\
+    print(job.page_id, full.tobytes() == banded.tobytes())\n\
+`;
+
+    const result = spawnSync(python.command, ["-c", script], { cwd: repoRoot, encoding: "utf-8" });
+
+    expect(result.status).toBe(0);
+    const lines = result.stdout.trim().split("\n");
+    expect(lines).toHaveLength(3);
+    for (const line of lines) {
+      expect(line.endsWith(" True")).toBe(true);
+    }
+  });
+});
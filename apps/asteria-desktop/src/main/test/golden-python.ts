@@ -0,0 +1,33 @@
+import path from "node:path";
+import { spawnSync } from "node:child_process";
+
+export const repoRoot = path.resolve(process.cwd(), "../..");
+
+const GOLDEN_DEPS = "import cv2, imagehash, numpy, PIL, pydantic";
+
+export interface GoldenPython {
+  command: string;
+  available: boolean;
+}
+
+/**
+ * Interpreter for the golden corpus tools. `available` is false when no Python
+ * is installed or, unless `deps` is false, it lacks the generator's imaging
+ * stack; tests pass it to `it.skipIf` so a missing toolchain reports as skipped.
+ */
+export const goldenPython = ({ deps = true }: { deps?: boolean } = {}): GoldenPython => {
+  const candidates = [process.env.GOLDEN_PYTHON, "python3.11", "python3", "python"].filter(
+    Boolean
+  ) as string[];
+  const command = candidates.find(
+    (candidate) => spawnSync(candidate, ["--version"], { stdio: "ignore" }).status === 0
+  );
+  if (command === undefined) {
+    return { command: "python3", available: false };
+  }
+  if (!deps) {
+    return { command, available: true };
+  }
+  const check = spawnSync(command, ["-c", GOLDEN_DEPS], { stdio: "ignore" });
+  return { command, available: check.status === 0 };
+};
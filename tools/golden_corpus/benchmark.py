@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+from generate import (
+    DARK_GUTTER,
+    DPI,
+    HEIGHT,
+    MASK_CACHE,
+    PAGE_JOBS,
+    WIDTH,
+    add_paper_texture,
+    apply_curved_warp,
+    apply_rotation_perspective,
+    apply_vignette,
+    blend_calibrated_gutter,
+    new_canvas,
+    paper_noise,
+    parse_dpi_levels,
+    render_page,
+    save_image,
+    spread_confidence,
+)
+from pack import CODECS, CorpusPack, PackWriter, pack_pixels
+
+BASELINE_VERSION = 2
+SUITE_OPERATORS = (
+    "add_paper_texture",
+    "apply_vignette",
+    "apply_curved_warp",
+    "apply_rotation_perspective",
+    "blend_calibrated_gutter",
+    "spread_confidence",
+    "save_png",
+)
+Case = Tuple[str, int, Callable[[], object]]
+
+
+def time_call(fn: Callable[[], object], repeats: int) -> List[float]:
+    fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def legacy_noise(
+    rng: np.random.Generator, height: int, width: int, strength: float
+) -> np.ndarray:
+    return rng.normal(0, strength, size=(height, width, 3)).astype(np.float32)
+
+
+def bench_texture(width: int, height: int, repeats: int) -> Dict[str, float]:
+    img = new_canvas(width, height)
+    rng = np.random.default_rng(0)
+    results = {
+        "noise.legacy": time_call(
+            lambda: legacy_noise(rng, height, width, 1.5), repeats
+        ),
+        "noise.atlas": time_call(lambda: paper_noise(rng, height, width, 1.5), repeats),
+        "add_paper_texture": time_call(
+            lambda: add_paper_texture(img, rng, strength=1.5), repeats
+        ),
+    }
+    return {name: statistics.median(samples) for name, samples in results.items()}
+
+
+def read_png_corpus(root: Path) -> int:
+    manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+    touched = 0
+    for entry in manifest["pages"]:
+        json.loads((root / "truth" / entry["truthFile"]).read_text(encoding="utf-8"))
+        with Image.open(root / "inputs" / f"{entry['id']}.png") as img:
+            touched += int(np.asarray(img).max())
+    return touched
+
+
+def read_pack(path: Path) -> int:
+    touched = 0
+    with CorpusPack(path) as pack:
+        for page_id in pack:
+            pack.truth(page_id)
+            touched += int(pack.array(page_id).max())
+    return touched
+
+
+def fetch_one(path: Path, page_id: str) -> None:
+    with CorpusPack(path) as pack:
+        pack.array(page_id)
+
+
+def bench_pack(root: Path, repeats: int) -> Dict[str, float]:
+    # Packs are built from the PNG corpus so both layouts hold the same pages.
+    manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+    page_ids = [entry["id"] for entry in manifest["pages"]]
+    results = {"png.read_all": time_call(lambda: read_png_corpus(root), repeats)}
+    sizes = {"png": sum(p.stat().st_size for p in (root / "inputs").glob("*.png"))}
+    with tempfile.TemporaryDirectory(prefix="golden-pack-") as tmp:
+        for codec in CODECS:
+            path = Path(tmp) / f"{codec}.pack"
+            with PackWriter(path, codec) as writer:
+                for entry in manifest["pages"]:
+                    truth = json.loads(
+                        (root / "truth" / entry["truthFile"]).read_text(
+                            encoding="utf-8"
+                        )
+                    )
+                    with Image.open(root / "inputs" / f"{entry['id']}.png") as img:
+                        writer.add(entry["id"], pack_pixels(img, codec), truth)
+                writer.close(manifest)
+            sizes[codec] = path.stat().st_size
+            results[f"pack.{codec}.read_all"] = time_call(
+                lambda path=path: read_pack(path), repeats
+            )
+            results[f"pack.{codec}.fetch_one"] = time_call(
+                lambda path=path: fetch_one(path, page_ids[-1]), repeats
+            )
+    medians = {name: statistics.median(samples) for name, samples in results.items()}
+    for layout, size in sizes.items():
+        print(f"{layout + ' bytes':<20} {size / 1024 / 1024:8.1f} MB")
+    return medians
+
+
+def p95(samples: List[float]) -> float:
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=20, method="inclusive")[18]
+
+
+def peak_traced_bytes(fn: Callable[[], object]) -> int:
+    # tracemalloc sees Python and numpy buffers (and so OpenCV outputs), but
+    # not Pillow's own image memory; it also slows the call, so it is run
+    # once on its own rather than inside the timed samples.
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def cold(fn: Callable[[], object]) -> Callable[[], object]:
+    # Masks and remap grids are cached per page size; clearing the cache first
+    # keeps their construction inside every sample.
+    def run() -> object:
+        MASK_CACHE.clear()
+        return fn()
+
+    return run
+
+
+def keeps_size(
+    fn: Callable[[], Image.Image], size: Tuple[int, int]
+) -> Callable[[], Image.Image]:
+    # Guards against timing a smaller workload than the page, e.g. a warp
+    # resampling into a rescaled canvas.
+    def run() -> Image.Image:
+        out = fn()
+        if out.size != size:
+            raise RuntimeError(f"operator returned {out.size}, expected {size}")
+        return out
+
+    return run
+
+
+def suite_cases(dpi: int, seed: int, out_dir: Path) -> Iterator[Case]:
+    """Every golden page builder, then the costly effect operators, at `dpi`.
+
+    Operators run on pages rendered at the same resolution: a single page for
+    the pixel and geometry effects and PNG save, a spread for the gutter
+    calibration and spread detection. They are called outside any render, so
+    their parameters are given in device pixels of those pages.
+    """
+    jobs = {job.page_id: job for job in PAGE_JOBS}
+    for job in PAGE_JOBS:
+        yield f"page.{job.page_id}@{dpi}", dpi, partial(
+            render_page, job, seed, "RGB", dpi
+        )
+    scale = dpi / DPI
+    page, _truth, _entry = render_page(jobs["p01_clean_single"], seed, "RGB", dpi)
+    spread, _truth, _entry = render_page(
+        jobs["p10_spread_dark_gutter"], seed, "RGB", dpi
+    )
+    expected = (int(round(WIDTH * scale)), int(round(HEIGHT * scale)))
+    if page.size != expected:
+        raise RuntimeError(f"{dpi} DPI page is {page.size}, expected {expected}")
+    gutter = (int(round((WIDTH - 60) * scale)), int(round((WIDTH + 60) * scale)))
+    rng = np.random.default_rng(seed)
+    operators: Dict[str, Callable[[], object]] = {
+        "add_paper_texture": keeps_size(
+            lambda: add_paper_texture(page, rng, strength=1.5), page.size
+        ),
+        "apply_vignette": keeps_size(lambda: apply_vignette(page), page.size),
+        "apply_curved_warp": keeps_size(
+            lambda: apply_curved_warp(page, amplitude=20 * scale), page.size
+        ),
+        "apply_rotation_perspective": keeps_size(
+            lambda: apply_rotation_perspective(page, 3.5), page.size
+        ),
+        "blend_calibrated_gutter": keeps_size(
+            lambda: blend_calibrated_gutter(spread, gutter, **DARK_GUTTER),
+            spread.size,
+        ),
+        "spread_confidence": lambda: spread_confidence(spread),
+        "save_png": lambda: save_image(page, out_dir / f"page-{dpi}.png"),
+    }
+    for name in SUITE_OPERATORS:
+        yield f"op.{name}@{dpi}", dpi, operators[name]
+
+
+def run_suite(
+    cases: Iterable[Case], repeats: int, reporter, total: int
+) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with reporter.phase("benchmark", total=total) as phase:
+        for name, dpi, fn in cases:
+            samples = time_call(cold(fn), repeats)
+            peak = peak_traced_bytes(cold(fn))
+            results[name] = {
+                "medianMs": round(statistics.median(samples), 3),
+                "p95Ms": round(p95(samples), 3),
+                "peakMb": round(peak / 1024 / 1024, 2),
+            }
+            reporter.log_event(
+                "metric",
+                phase="benchmark",
+                ms=int(results[name]["medianMs"]),
+                attrs={"case": name, "dpi": dpi, "repeats": repeats, **results[name]},
+            )
+            phase.tick(1, attrs={"case": name})
+    return results
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, float]]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} has unsupported baseline version")
+    return payload["cases"]
+
+
+def save_baseline(
+    path: Path, results: Dict[str, Dict[str, float]], repeats: int
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": BASELINE_VERSION, "repeats": repeats, "cases": results}
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    min_ms: float,
+    min_mb: float,
+) -> List[str]:
+    """Cases whose median time or peak memory grew past `threshold`.
+
+    The absolute floors keep sub-millisecond cases from failing on timer noise.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key, unit, floor in (("medianMs", "ms", min_ms), ("peakMb", "MB", min_mb)):
+            limit = base[key] * (1 + threshold)
+            if current[key] > limit and current[key] - base[key] >= floor:
+                regressions.append(
+                    f"{name} {key} {current[key]:.1f} {unit} > "
+                    f"{base[key]:.1f} {unit} baseline (+{threshold:.0%})"
+                )
+    return regressions
+
+
+def main_suite(args: argparse.Namespace) -> None:
+    run_id = args.run_id or f"golden-benchmark-{int(time.time() * 1000)}"
+    obs_path = Path(__file__).resolve().parents[1] / "observability"
+    if str(obs_path) not in sys.path:
+        sys.path.append(str(obs_path))
+    from py_reporter import create_run_reporter
+
+    reporter = create_run_reporter("golden_benchmark", run_id=run_id)
+    baseline = load_baseline(args.baseline) if args.baseline is not None else {}
+    total = len(args.dpi_levels) * (len(PAGE_JOBS) + len(SUITE_OPERATORS))
+    with tempfile.TemporaryDirectory(prefix="golden-bench-") as tmp:
+        cases: Iterator[Case] = (
+            case
+            for dpi in args.dpi_levels
+            for case in suite_cases(dpi, args.seed, Path(tmp))
+        )
+        results = run_suite(cases, args.repeats, reporter, total)
+
+    print(f"{'case':<44} {'median':>9} {'p95':>9} {'peak':>9} {'baseline':>9}")
+    for name, result in results.items():
+        base = baseline.get(name, {}).get("medianMs")
+        print(
+            f"{name:<44} {result['medianMs']:7.1f}ms {result['p95Ms']:7.1f}ms "
+            f"{result['peakMb']:7.1f}MB "
+            + (f"{base:7.1f}ms" if base is not None else f"{'-':>9}")
+        )
+    if args.save_baseline is not None:
+        save_baseline(args.save_baseline, results, args.repeats)
+        print(f"baseline written to {args.save_baseline}")
+
+    regressions = find_regressions(
+        results, baseline, args.threshold, args.min_ms, args.min_mb
+    )
+    for message in regressions:
+        reporter.error(
+            "GOLDEN_BENCHMARK_REGRESSION",
+            message,
+            file=str(args.baseline.resolve()),
+            line=0,
+            col=0,
+        )
+    reporter.finalize(
+        {
+            "cases": len(results),
+            "compared": sum(name in baseline for name in results),
+            "regressions": len(regressions),
+        }
+    )
+    if regressions:
+        raise SystemExit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark golden corpus operators")
+    parser.add_argument("--width", type=int, default=WIDTH)
+    parser.add_argument("--height", type=int, default=HEIGHT)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=None,
+        help="Compare reading this PNG corpus with raw and zlib packs of it.",
+    )
+    parser.add_argument(
+        "--suite",
+        action="store_true",
+        help="Time every page builder and effect operator at each --dpi-levels resolution.",
+    )
+    parser.add_argument("--dpi-levels", type=parse_dpi_levels, default=[300, 150])
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Compare --suite results with this baseline JSON and fail on regressions.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=Path,
+        default=None,
+        help="Write --suite results to this baseline JSON.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed fractional growth of median time or peak memory.",
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=2.0,
+        help="Ignore time regressions smaller than this many milliseconds.",
+    )
+    parser.add_argument(
+        "--min-mb",
+        type=float,
+        default=1.0,
+        help="Ignore memory regressions smaller than this many megabytes.",
+    )
+    parser.add_argument("--run-id", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.suite:
+        main_suite(args)
+        return
+
+    if args.corpus is not None:
+        medians = bench_pack(args.corpus, args.repeats)
+        for name, ms in medians.items():
+            print(f"{name:<24} {ms:8.1f} ms")
+        speedup = medians["png.read_all"] / max(medians["pack.raw.read_all"], 1e-6)
+        print(f"raw pack read speedup: {speedup:.1f}x")
+        return
+
+    medians = bench_texture(args.width, args.height, args.repeats)
+    for name, ms in medians.items():
+        print(f"{name:<20} {ms:8.1f} ms")
+    speedup = medians["noise.legacy"] / max(medians["noise.atlas"], 1e-6)
+    print(f"texture noise speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
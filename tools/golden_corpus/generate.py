@@ -1,21 +1,73 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import argparse
+import bisect
+import hashlib
+import inspect
+import io
 import json
 import math
+import mmap
 import os
+import queue
 import random
 import sys
+import tempfile
+import threading
 import time
 import traceback
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import List, Optional, Tuple
-
-import cv2
-import imagehash
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-from pydantic import BaseModel
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from lazy import lazy_import, preload
+from pack import CODECS as PACK_CODECS
+from pack import PackedPage, PackWriter, pack_pixels
+from stream import FORMATS as STREAM_FORMATS
+from stream import VERSION as STREAM_VERSION
+from stream import FrameSink, encode_pixels
+
+if TYPE_CHECKING:
+    from models import LabelMask, ManifestEntry, TruthPage
+    from pydantic import BaseModel
+
+    # main() puts tools/observability on sys.path before importing it.
+    from py_reporter import RunReporter
+
+# The imaging stack loads on first use, so --help, --verify and callers that
+# only need page ids, specs or cache keys start without it.
+cv2 = lazy_import("cv2")
+imagehash = lazy_import("imagehash")
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
+# pydantic costs most of what is left of startup; truth models are only built
+# once pages render or a manifest is read back.
+models = lazy_import("models")
 
 WIDTH = 2175
 HEIGHT = 3075
@@ -23,6 +75,25 @@ DPI = 300
 MARGIN = 140
 BACKGROUND = 245
 TEXT_COLOR = (25, 25, 25)
+COLOR_MODES = ("RGB", "L")
+MASK_CACHE_MB = int(os.environ.get("ASTERIA_GOLDEN_MASK_CACHE_MB", "256"))
+RENDER_BASE_BYTES = 96 * 1024 * 1024
+NOISE_ATLAS_SEED = 0x61746C73
+NOISE_ATLAS_SIZE = 2048
+NOISE_TILE = 256
+# Class ids of the label masks written with --label-masks; index = pixel value.
+LABEL_CLASSES = (
+    "background",
+    "body",
+    "running-head",
+    "folio",
+    "ornament",
+    "title",
+    "drop-cap",
+    "marginalia",
+    "footnotes",
+    "plate",
+)
 
 
 def seed_everything(seed: int) -> np.random.Generator:
@@ -33,6 +104,11 @@ def seed_everything(seed: int) -> np.random.Generator:
     return np.random.default_rng(seed)
 
 
+def derive_page_seed(seed: int, page_id: str) -> int:
+    digest = hashlib.sha256(f"{seed}:{page_id}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") & 0x7FFFFFFF
+
+
 def load_font(size: int) -> ImageFont.FreeTypeFont:
     try:
         return ImageFont.truetype("DejaVuSans.ttf", size=size)
@@ -40,160 +116,595 @@ def load_font(size: int) -> ImageFont.FreeTypeFont:
         return ImageFont.load_default()
 
 
+@dataclass(frozen=True)
+class RenderSettings:
+    color_mode: str = "RGB"
+    scale: float = 1.0
+    tile_bytes: Optional[int] = None
+    label_masks: bool = False
+
+
+_settings = RenderSettings()
+
+
+def current_render_settings() -> RenderSettings:
+    return _settings
+
+
+@contextmanager
+def render_settings(
+    color_mode: str = "RGB",
+    dpi: int = DPI,
+    max_tile_mb: Optional[float] = None,
+    label_masks: bool = False,
+) -> Iterator[RenderSettings]:
+    """Settings for the drawing primitives during one render.
+
+    The previous settings are restored on exit, so nothing rendered or
+    resampled afterwards in the same process inherits this page's scale,
+    colour mode, tile budget or label masks.
+    """
+    global _settings
+    if color_mode not in COLOR_MODES:
+        raise ValueError(f"Unsupported color mode: {color_mode}")
+    if dpi <= 0:
+        raise ValueError(f"DPI must be positive: {dpi}")
+    previous = _settings
+    _settings = RenderSettings(
+        color_mode=color_mode,
+        scale=dpi / DPI,
+        tile_bytes=None if max_tile_mb is None else int(max_tile_mb * 1024 * 1024),
+        label_masks=label_masks,
+    )
+    try:
+        yield _settings
+    finally:
+        _settings = previous
+
+
+def px(value: float) -> int:
+    # Builders lay pages out in DPI (300) design pixels; drawing primitives map
+    # them to device pixels so one layout renders at any resolution.
+    return int(round(value * _settings.scale))
+
+
+def px_box(box: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    # Inclusive rectangle: scale the far edges as exclusive bounds.
+    x0, y0, x1, y1 = box
+    return px(x0), px(y0), px(x1 + 1) - 1, px(y1 + 1) - 1
+
+
+def stroke(width: int) -> int:
+    return max(1, px(width))
+
+
+def ink(mode: str, color: Tuple[int, int, int]) -> Union[int, Tuple[int, int, int]]:
+    # Every colour in the corpus is a neutral grey, so single-channel pages
+    # take the first component.
+    return color[0] if mode == "L" else color
+
+
 def new_canvas(width: int, height: int, value: int = BACKGROUND) -> Image.Image:
-    arr = np.full((height, width, 3), value, dtype=np.uint8)
-    return Image.fromarray(arr, mode="RGB")
+    size = (px(width), px(height))
+    if _settings.color_mode == "L":
+        return Image.new("L", size, value)
+    return Image.new("RGB", size, (value, value, value))
+
+
+class MaskCache:
+    """LRU cache for size-dependent masks and remap grids, capped in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, Tuple[Any, int]]" = OrderedDict()
+
+    def get(self, key: tuple, factory: Callable[[], Any]) -> Any:
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+        self.misses += 1
+        value = factory()
+        arrays = value if isinstance(value, tuple) else (value,)
+        size = 0
+        for arr in arrays:
+            arr.setflags(write=False)
+            size += arr.nbytes
+        if size > self.max_bytes:
+            return value
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _key, (_value, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+
+MASK_CACHE = MaskCache(MASK_CACHE_MB * 1024 * 1024)
+
+
+def row_bands(height: int, row_bytes: int) -> Iterator[Tuple[int, int]]:
+    # Horizontal bands sized so float working buffers fit the tile budget;
+    # without a budget the whole page is one band.
+    tile_bytes = _settings.tile_bytes
+    rows = height if tile_bytes is None else max(1, tile_bytes // max(1, row_bytes))
+    for y0 in range(0, height, rows):
+        yield y0, min(height, y0 + rows)
+
+
+def vignette_rows(
+    width: int, height: int, strength: float, y0: int, y1: int
+) -> np.ndarray:
+    cy, cx = height / 2.0, width / 2.0
+    dx = np.square(np.arange(width, dtype=np.float32) - np.float32(cx))
+    dy = np.square(np.arange(y0, y1, dtype=np.float32) - np.float32(cy))
+    mask = np.sqrt(dy[:, None] + dx[None, :])
+    mask *= np.float32((1.0 - strength) / math.sqrt(cx**2 + cy**2))
+    np.subtract(np.float32(1.0), mask, out=mask)
+    np.clip(mask, strength, 1.0, out=mask)
+    return mask
+
+
+def vignette_mask(width: int, height: int, strength: float) -> np.ndarray:
+    build = partial(vignette_rows, width, height, strength, 0, height)
+    return MASK_CACHE.get(("vignette", width, height, strength), build)
+
+
+def noise_atlas() -> np.ndarray:
+    def build() -> np.ndarray:
+        rng = np.random.default_rng(NOISE_ATLAS_SEED)
+        shape = (NOISE_ATLAS_SIZE, NOISE_ATLAS_SIZE)
+        return rng.standard_normal(shape, dtype=np.float32)
+
+    return MASK_CACHE.get(("noise-atlas", NOISE_ATLAS_SIZE), build)
+
+
+def noise_tile() -> int:
+    return min(NOISE_ATLAS_SIZE, max(1, px(NOISE_TILE)))
+
+
+def noise_offsets(rng: np.random.Generator, height: int, width: int) -> np.ndarray:
+    # Luminance-only white noise is assembled from random patches of a fixed
+    # atlas. The page RNG only draws one offset pair per tile, so texture
+    # cost is a handful of slice copies instead of h*w*3 fresh normals.
+    # Tiles follow the render scale and offsets are drawn in design units, so
+    # every resolution consumes the same draws and keeps the same layout.
+    tile = noise_tile()
+    rows = -(-height // tile)
+    cols = -(-width // tile)
+    span = NOISE_ATLAS_SIZE - NOISE_TILE
+    offsets = rng.integers(0, span + 1, size=(rows, cols, 2))
+    if tile != NOISE_TILE:
+        offsets = offsets * (NOISE_ATLAS_SIZE - tile) // span
+    return offsets
+
+
+def noise_rows(
+    offsets: np.ndarray, y0: int, y1: int, width: int, strength: float
+) -> np.ndarray:
+    atlas = noise_atlas()
+    tile = noise_tile()
+    noise = np.empty((y1 - y0, width), dtype=np.float32)
+    scale = np.float32(strength)
+    for r in range(y0 // tile, -(-y1 // tile)):
+        top = r * tile
+        ty0 = max(y0, top)
+        ty1 = min(y1, top + tile)
+        for c in range(offsets.shape[1]):
+            x0 = c * tile
+            x1 = min(width, x0 + tile)
+            oy, ox = offsets[r, c]
+            np.multiply(
+                atlas[oy + ty0 - top : oy + ty1 - top, ox : ox + x1 - x0],
+                scale,
+                out=noise[ty0 - y0 : ty1 - y0, x0:x1],
+            )
+    return noise
+
+
+def paper_noise(
+    rng: np.random.Generator, height: int, width: int, strength: float
+) -> np.ndarray:
+    return noise_rows(noise_offsets(rng, height, width), 0, height, width, strength)
+
+
+def curved_warp_rows(
+    width: int, amplitude: float, y0: int, y1: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Stored in OpenCV's fixed-point form so cv2.remap skips the per-call
+    # float-to-fixed conversion.
+    xs = np.arange(width).astype(np.float32)
+    ys = np.arange(y0, y1).astype(np.float32)
+    offset = amplitude * np.sin(2 * math.pi * xs / width)
+    map_x = np.broadcast_to(xs[None, :], (y1 - y0, width))
+    map_y = ys[:, None] + offset[None, :]
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+
+def curved_warp_maps(
+    width: int, height: int, amplitude: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    build = partial(curved_warp_rows, width, amplitude, 0, height)
+    return MASK_CACHE.get(("curved_warp", width, height, amplitude), build)
+
+
+class EffectChain:
+    """Apply pixel effects in float32 and quantize once.
+
+    Multiplicative shading is accumulated as separable per-column/per-row
+    gains plus optional radial masks and folded in as a single step. Steps
+    are replayed over horizontal bands sized by the tile budget; each one is
+    elementwise, so banded output is bit-identical to a full-frame pass.
+    """
+
+    def __init__(self, img: Image.Image) -> None:
+        self.pixels = np.array(img)
+        h, w = self.pixels.shape[:2]
+        self._steps: List[Tuple[str, Any]] = []
+        self._col_gain: Optional[np.ndarray] = None
+        self._row_gain: Optional[np.ndarray] = None
+        self._vignettes: List[float] = []
+        self.width = w
+        self.height = h
+
+    def _cols(self) -> np.ndarray:
+        if self._col_gain is None:
+            self._col_gain = np.ones(self.width, dtype=np.float32)
+        return self._col_gain
+
+    def _rows(self) -> np.ndarray:
+        if self._row_gain is None:
+            self._row_gain = np.ones(self.height, dtype=np.float32)
+        return self._row_gain
+
+    def paper_texture(
+        self, rng: np.random.Generator, strength: float = 2.0
+    ) -> "EffectChain":
+        self.flush()
+        offsets = noise_offsets(rng, self.height, self.width)
+        self._steps.append(("noise", (offsets, strength)))
+        return self
+
+    def shadow_gradient(
+        self, side: str, width: int, min_factor: float
+    ) -> "EffectChain":
+        w = self.width
+        width = max(1, min(px(width), w))
+        if side == "left":
+            cols = self._cols()
+            cols[:width] *= np.linspace(min_factor, 1.0, width, dtype=np.float32)
+        elif side == "right":
+            cols = self._cols()
+            cols[w - width : w] *= np.linspace(1.0, min_factor, width, dtype=np.float32)
+        return self
+
+    def linear_illumination(self, axis: str, start: float, end: float) -> "EffectChain":
+        if axis == "x":
+            self._cols()[:] *= np.linspace(start, end, self.width, dtype=np.float32)
+        else:
+            self._rows()[:] *= np.linspace(start, end, self.height, dtype=np.float32)
+        return self
+
+    def vignette(self, strength: float = 0.9) -> "EffectChain":
+        self._vignettes.append(strength)
+        return self
+
+    def flush(self) -> "EffectChain":
+        cols, rows, vignettes = self._col_gain, self._row_gain, self._vignettes
+        if cols is not None or rows is not None or vignettes:
+            self._steps.append(("gain", (cols, rows, tuple(vignettes))))
+        self._col_gain = self._row_gain = None
+        self._vignettes = []
+        return self
+
+    def _vignette_rows(self, strength: float, y0: int, y1: int) -> np.ndarray:
+        if y0 == 0 and y1 == self.height:
+            return vignette_mask(self.width, self.height, strength)
+        return vignette_rows(self.width, self.height, strength, y0, y1)
+
+    def _apply(
+        self, buffer: np.ndarray, step: Tuple[str, Any], y0: int, y1: int
+    ) -> None:
+        kind, value = step
+        if kind == "noise":
+            offsets, strength = value
+            noise = noise_rows(offsets, y0, y1, self.width, strength)
+            buffer += noise[..., None] if buffer.ndim == 3 else noise
+            return
+        cols, rows, vignettes = value
+        if vignettes:
+            # Cached masks are read-only, so fold the gains into a new array.
+            mask = self._vignette_rows(vignettes[0], y0, y1)
+            for strength in vignettes[1:]:
+                mask = mask * self._vignette_rows(strength, y0, y1)
+            if cols is not None:
+                mask = mask * cols[None, :]
+            if rows is not None:
+                mask = mask * rows[y0:y1, None]
+            self._scale(buffer, mask)
+        else:
+            if rows is not None:
+                self._scale(buffer, rows[y0:y1, None])
+            if cols is not None:
+                self._scale(buffer, cols[None, :])
+
+    @staticmethod
+    def _scale(buffer: np.ndarray, gain: np.ndarray) -> None:
+        if buffer.ndim == 3:
+            gain = gain[..., None]
+        buffer *= gain
+
+    def to_image(self) -> Image.Image:
+        self.flush()
+        channels = self.pixels.shape[2] if self.pixels.ndim == 3 else 1
+        # One float32 band plus a noise or mask band of the same height.
+        row_bytes = self.width * 4 * (channels + 1)
+        for y0, y1 in row_bands(self.height, row_bytes):
+            buffer = self.pixels[y0:y1].astype(np.float32)
+            for step in self._steps:
+                self._apply(buffer, step, y0, y1)
+            np.clip(buffer, 0, 255, out=buffer)
+            np.copyto(self.pixels[y0:y1], buffer, casting="unsafe")
+        self._steps = []
+        mode = "RGB" if self.pixels.ndim == 3 else "L"
+        return Image.fromarray(self.pixels, mode=mode)
 
 
 def add_paper_texture(
     img: Image.Image, rng: np.random.Generator, strength: float = 2.0
 ) -> Image.Image:
-    arr = np.array(img, dtype=np.float32)
-    noise = rng.normal(0, strength, size=arr.shape).astype(np.float32)
-    arr = np.clip(arr + noise, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGB")
+    return EffectChain(img).paper_texture(rng, strength).to_image()
+
+
+def text_line_extents(
+    rng: np.random.Generator, box: Tuple[int, int, int, int], line_height: int
+) -> np.ndarray:
+    # RNG contract: one uniform draw per line in [0.6, 0.98) of the box width,
+    # and every seventh line (starting with the first) takes a second draw in
+    # [0.4, 0.7) that replaces the first. All draws come from one rng.random
+    # call in line order, which matches drawing them one line at a time.
+    x0, y0, x1, y1 = box
+    max_width = x1 - x0
+    count = max(0, (y1 - y0) // line_height)
+    index = np.arange(count)
+    short = index % 7 == 0
+    draws = rng.random(count + int(short.sum()))
+    first = index + np.cumsum(short) - short
+    fractions = 0.6 + (0.98 - 0.6) * draws[first]
+    fractions[short] = 0.4 + (0.7 - 0.4) * draws[first[short] + 1]
+    lengths = (max_width * fractions).astype(np.int64)
+    top = y0 + index * line_height
+    return np.stack(
+        [np.full(count, x0), top, x0 + lengths, top + line_height - 6], axis=1
+    )
 
 
 def add_text_block(
-    draw: ImageDraw.ImageDraw,
+    img: Image.Image,
     box: Tuple[int, int, int, int],
     line_height: int,
     rng: np.random.Generator,
     color: Tuple[int, int, int] = TEXT_COLOR,
-) -> None:
-    x0, y0, x1, y1 = box
-    max_width = x1 - x0
-    y = y0
-    line_index = 0
-    while y + line_height <= y1:
-        line_len = int(max_width * rng.uniform(0.6, 0.98))
-        if line_index % 7 == 0:
-            line_len = int(max_width * rng.uniform(0.4, 0.7))
-        draw.rectangle([x0, y, x0 + line_len, y + line_height - 6], fill=color)
-        y += line_height
-        line_index += 1
-
-
-def draw_running_head(draw: ImageDraw.ImageDraw, width: int, top: int) -> None:
-    font = load_font(32)
+) -> np.ndarray:
+    # Image.paste with a colour is a plain fill, so each line costs one C call
+    # instead of a trip through ImageDraw's per-shape dispatch.
+    fill = ink(img.mode, color)
+    lines = text_line_extents(rng, box, line_height)
+    for left, top, right, bottom in lines.tolist():
+        img.paste(fill, (px(left), px(top), px(right + 1), px(bottom + 1)))
+    return lines
+
+
+def draw_running_head(
+    draw: ImageDraw.ImageDraw, width: int, top: int
+) -> Tuple[int, int, int, int]:
+    # Returns the inked box in device pixels (font metrics are device-sized).
+    font = load_font(px(32))
     text = "ASTERIA STUDIO"
     text_width = draw.textlength(text, font=font)
-    draw.text(((width - text_width) / 2, top), text, fill=(40, 40, 40), font=font)
+    fill = ink(draw.mode, (40, 40, 40))
+    xy = ((px(width) - text_width) / 2, px(top))
+    draw.text(xy, text, fill=fill, font=font)
+    return draw.textbbox(xy, text, font=font)
 
 
-def draw_folio(draw: ImageDraw.ImageDraw, width: int, bottom: int, folio: str) -> None:
-    font = load_font(30)
+def draw_folio(
+    draw: ImageDraw.ImageDraw, width: int, bottom: int, folio: str
+) -> Tuple[int, int, int, int]:
+    font = load_font(px(30))
     text_width = draw.textlength(folio, font=font)
-    draw.text(((width - text_width) / 2, bottom), folio, fill=(50, 50, 50), font=font)
+    fill = ink(draw.mode, (50, 50, 50))
+    xy = ((px(width) - text_width) / 2, px(bottom))
+    draw.text(xy, folio, fill=fill, font=font)
+    return draw.textbbox(xy, folio, font=font)
 
 
 def apply_shadow_gradient(
     img: Image.Image, side: str, width: int, min_factor: float
 ) -> Image.Image:
-    arr = np.array(img, dtype=np.float32)
-    h, w = arr.shape[:2]
-    width = max(1, min(width, w))
-    if side == "left":
-        gradient = np.linspace(min_factor, 1.0, width, dtype=np.float32)
-        mask = np.ones((h, w), dtype=np.float32)
-        mask[:, :width] = gradient[None, :]
-    elif side == "right":
-        gradient = np.linspace(1.0, min_factor, width, dtype=np.float32)
-        mask = np.ones((h, w), dtype=np.float32)
-        mask[:, w - width : w] = gradient[None, :]
-    else:
-        return img
-    arr = np.clip(arr * mask[..., None], 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGB")
+    return EffectChain(img).shadow_gradient(side, width, min_factor).to_image()
 
 
 def apply_linear_illumination(
     img: Image.Image, axis: str, start: float, end: float
 ) -> Image.Image:
-    arr = np.array(img, dtype=np.float32)
-    h, w = arr.shape[:2]
-    if axis == "x":
-        gradient = np.linspace(start, end, w, dtype=np.float32)
-        mask = gradient[None, :, None]
-    else:
-        gradient = np.linspace(start, end, h, dtype=np.float32)
-        mask = gradient[:, None, None]
-    arr = np.clip(arr * mask, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGB")
+    return EffectChain(img).linear_illumination(axis, start, end).to_image()
 
 
 def apply_vignette(img: Image.Image, strength: float = 0.9) -> Image.Image:
-    arr = np.array(img, dtype=np.float32)
-    h, w = arr.shape[:2]
-    y, x = np.ogrid[:h, :w]
-    cy, cx = h / 2.0, w / 2.0
-    dist = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
-    max_dist = np.sqrt(cx**2 + cy**2)
-    mask = 1.0 - (dist / max_dist) * (1.0 - strength)
-    mask = np.clip(mask, strength, 1.0)
-    arr = np.clip(arr * mask[..., None], 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGB")
+    return EffectChain(img).vignette(strength).to_image()
+
+
+class GeometryStage:
+    """Collect geometric operators and resample the page once.
+
+    Rotation, perspective and affine operators are composed as forward 3x3
+    matrices. A curved warp is folded into a remap grid, so any stack of
+    operators costs a single interpolation pass. Operators and boxes are in
+    design pixels and are mapped to the render scale when applied.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.matrix = np.eye(3, dtype=np.float64)
+        self._ops: List[Tuple[str, Any]] = []
+
+    def affine(self, matrix: np.ndarray) -> "GeometryStage":
+        return self.homography(np.vstack([matrix, [0.0, 0.0, 1.0]]))
+
+    def homography(self, matrix: np.ndarray) -> "GeometryStage":
+        matrix = np.asarray(matrix, dtype=np.float64)
+        self.matrix = matrix @ self.matrix
+        self._ops.append(("matrix", tuple(matrix.ravel().tolist())))
+        return self
+
+    def rotate(self, angle: float) -> "GeometryStage":
+        center = (self.width / 2.0, self.height / 2.0)
+        return self.affine(cv2.getRotationMatrix2D(center, angle, 1.0))
+
+    def perspective(self, src: np.ndarray, dst: np.ndarray) -> "GeometryStage":
+        return self.homography(cv2.getPerspectiveTransform(src, dst))
+
+    def curved_warp(self, amplitude: float) -> "GeometryStage":
+        self._ops.append(("warp", amplitude))
+        return self
+
+    def transform_box(self, box: Tuple[int, int, int, int]) -> List[int]:
+        x0, y0, x1, y1 = box
+        corners = np.float64([[[x0, y0]], [[x1, y0]], [[x1, y1]], [[x0, y1]]])
+        moved = cv2.perspectiveTransform(corners, self.matrix).reshape(-1, 2)
+        lo = np.floor(moved.min(axis=0))
+        hi = np.ceil(moved.max(axis=0))
+        return [
+            int(max(0, lo[0])),
+            int(max(0, lo[1])),
+            int(min(self.width - 1, hi[0])),
+            int(min(self.height - 1, hi[1])),
+        ]
+
+    def _remap_grid(self, y0: int, y1: int) -> Tuple[np.ndarray, np.ndarray]:
+        w, h = self.width, self.height
+        full = y0 == 0 and y1 == h
+        if len(self._ops) == 1:
+            amplitude = self._ops[0][1]
+            if full:
+                return curved_warp_maps(w, h, amplitude)
+            return curved_warp_rows(w, amplitude, y0, y1)
+        ops = tuple(self._ops)
+
+        def build() -> Tuple[np.ndarray, np.ndarray]:
+            xs, ys = np.meshgrid(
+                np.arange(w, dtype=np.float64), np.arange(y0, y1, dtype=np.float64)
+            )
+            # Walk the operators backwards, mapping output pixels to source.
+            for kind, value in reversed(ops):
+                if kind == "warp":
+                    ys = ys + value * np.sin(2 * math.pi * xs / w)
+                    continue
+                inv = np.linalg.inv(np.array(value, dtype=np.float64).reshape(3, 3))
+                denom = inv[2, 0] * xs + inv[2, 1] * ys + inv[2, 2]
+                xs, ys = (
+                    (inv[0, 0] * xs + inv[0, 1] * ys + inv[0, 2]) / denom,
+                    (inv[1, 0] * xs + inv[1, 1] * ys + inv[1, 2]) / denom,
+                )
+            return cv2.convertMaps(
+                xs.astype(np.float32), ys.astype(np.float32), cv2.CV_16SC2
+            )
 
+        if not full:
+            return build()
+        return MASK_CACHE.get(("geometry", w, h, ops), build)
 
-def apply_curved_warp(img: Image.Image, amplitude: float) -> Image.Image:
-    arr = np.array(img)
-    h, w = arr.shape[:2]
-    map_x, map_y = np.meshgrid(np.arange(w), np.arange(h))
-    map_y = map_y.astype(np.float32)
-    map_x = map_x.astype(np.float32)
-    map_y = map_y + amplitude * np.sin(2 * math.pi * map_x / w)
-    warped = cv2.remap(
-        arr,
-        map_x,
-        map_y,
-        interpolation=cv2.INTER_LINEAR,
-        borderMode=cv2.BORDER_CONSTANT,
-        borderValue=(255, 255, 255),
-    )
-    return Image.fromarray(warped, mode="RGB")
+    def to_device(self, scale: float) -> "GeometryStage":
+        if scale == 1.0:
+            return self
+        stage = GeometryStage(
+            int(round(self.width * scale)), int(round(self.height * scale))
+        )
+        to_device = np.diag([scale, scale, 1.0])
+        to_design = np.diag([1.0 / scale, 1.0 / scale, 1.0])
+        for kind, value in self._ops:
+            if kind == "warp":
+                stage.curved_warp(value * scale)
+            else:
+                matrix = np.array(value, dtype=np.float64).reshape(3, 3)
+                stage.homography(to_device @ matrix @ to_design)
+        return stage
+
+    def apply(self, img: Image.Image, scale: float = 1.0) -> Image.Image:
+        # `scale` maps the design-pixel operators onto `img`; the default
+        # treats them as pixels of `img` itself.
+        if not self._ops:
+            return img
+        stage = self.to_device(scale)
+        out = stage._resample(np.asarray(img), cv2.INTER_LINEAR, (255, 255, 255))
+        return Image.fromarray(out, mode=img.mode)
+
+    def apply_labels(self, labels: np.ndarray, scale: float = 1.0) -> np.ndarray:
+        # Class ids must not blend, so masks take the nearest source pixel and
+        # anything pulled in from outside the page is background.
+        if not self._ops:
+            return labels
+        return self.to_device(scale)._resample(labels, cv2.INTER_NEAREST, 0)
+
+    def _resample(
+        self, arr: np.ndarray, interpolation: int, border_value: Any
+    ) -> np.ndarray:
+        size = (self.width, self.height)
+        border = dict(borderMode=cv2.BORDER_CONSTANT, borderValue=border_value)
+        if any(kind == "warp" for kind, _value in self._ops):
+            # Output rows only depend on their own grid rows, so the grid is
+            # built per band; the float64 meshgrid dominates at ~48 B/pixel.
+            out = np.empty_like(arr)
+            for y0, y1 in row_bands(self.height, self.width * 48):
+                map_xy, map_frac = self._remap_grid(y0, y1)
+                cv2.remap(
+                    arr,
+                    map_xy,
+                    map_frac,
+                    dst=out[y0:y1],
+                    interpolation=interpolation,
+                    **border,
+                )
+        elif np.allclose(self.matrix[2], [0.0, 0.0, 1.0]):
+            out = cv2.warpAffine(
+                arr, self.matrix[:2], size, flags=interpolation, **border
+            )
+        else:
+            out = cv2.warpPerspective(
+                arr, self.matrix, size, flags=interpolation, **border
+            )
+        return out
 
 
-def apply_rotation_perspective(img: Image.Image, angle: float) -> Image.Image:
-    arr = np.array(img)
-    h, w = arr.shape[:2]
-    center = (w / 2.0, h / 2.0)
-    rot = cv2.getRotationMatrix2D(center, angle, 1.0)
-    rotated = cv2.warpAffine(
-        arr,
-        rot,
-        (w, h),
-        flags=cv2.INTER_LINEAR,
-        borderMode=cv2.BORDER_CONSTANT,
-        borderValue=(255, 255, 255),
-    )
+def page_perspective_quad(width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    w, h = width, height
     src = np.float32([[0, 0], [w - 1, 0], [w - 1, h - 1], [0, h - 1]])
     dst = np.float32([[40, 20], [w - 60, 0], [w - 20, h - 40], [0, h - 10]])
-    matrix = cv2.getPerspectiveTransform(src, dst)
-    warped = cv2.warpPerspective(
-        rotated,
-        matrix,
-        (w, h),
-        flags=cv2.INTER_LINEAR,
-        borderMode=cv2.BORDER_CONSTANT,
-        borderValue=(255, 255, 255),
-    )
-    return Image.fromarray(warped, mode="RGB")
+    return src, dst
+
+
+def apply_curved_warp(img: Image.Image, amplitude: float) -> Image.Image:
+    return GeometryStage(img.width, img.height).curved_warp(amplitude).apply(img)
+
+
+def apply_rotation_perspective(img: Image.Image, angle: float) -> Image.Image:
+    src, dst = page_perspective_quad(img.width, img.height)
+    stage = GeometryStage(img.width, img.height).rotate(angle).perspective(src, dst)
+    return stage.apply(img)
 
 
 def apply_rotation(img: Image.Image, angle: float) -> Image.Image:
-    arr = np.array(img)
-    h, w = arr.shape[:2]
-    center = (w / 2.0, h / 2.0)
-    rot = cv2.getRotationMatrix2D(center, angle, 1.0)
-    rotated = cv2.warpAffine(
-        arr,
-        rot,
-        (w, h),
-        flags=cv2.INTER_LINEAR,
-        borderMode=cv2.BORDER_CONSTANT,
-        borderValue=(255, 255, 255),
-    )
-    return Image.fromarray(rotated, mode="RGB")
+    return GeometryStage(img.width, img.height).rotate(angle).apply(img)
 
 
 def draw_ornament(
@@ -201,57 +712,52 @@ def draw_ornament(
 ) -> Tuple[int, int, int, int]:
     cx, cy = center
     radius = size // 2
-    bbox = [cx - radius, cy - radius, cx + radius, cy + radius]
-    draw.ellipse(bbox, outline=(20, 20, 20), width=4)
-    draw.line([cx - radius, cy, cx + radius, cy], fill=(20, 20, 20), width=3)
-    draw.line([cx, cy - radius, cx, cy + radius], fill=(20, 20, 20), width=3)
-    return bbox[0], bbox[1], bbox[2], bbox[3]
+    bbox = (cx - radius, cy - radius, cx + radius, cy + radius)
+    color = ink(draw.mode, (20, 20, 20))
+    draw.ellipse(px_box(bbox), outline=color, width=stroke(4))
+    horizontal = [px(cx - radius), px(cy), px(cx + radius), px(cy)]
+    vertical = [px(cx), px(cy - radius), px(cx), px(cy + radius)]
+    draw.line(horizontal, fill=color, width=stroke(3))
+    draw.line(vertical, fill=color, width=stroke(3))
+    return bbox
+
+
+def ornament_hash(img: Image.Image, box: Tuple[int, int, int, int]) -> str:
+    return str(imagehash.phash(img.crop(tuple(px(v) for v in box))))
 
 
 def draw_title_block(draw: ImageDraw.ImageDraw, box: Tuple[int, int, int, int]) -> None:
-    x0, y0, x1, y1 = box
-    draw.rectangle([x0, y0, x1, y1], fill=(30, 30, 30))
+    draw.rectangle(px_box(box), fill=ink(draw.mode, (30, 30, 30)))
 
 
 def draw_drop_cap(draw: ImageDraw.ImageDraw, box: Tuple[int, int, int, int]) -> None:
-    x0, y0, x1, y1 = box
-    draw.rectangle([x0, y0, x1, y1], fill=(35, 35, 35))
+    draw.rectangle(px_box(box), fill=ink(draw.mode, (35, 35, 35)))
 
 
-def spread_confidence(image: Image.Image) -> float:
-    arr = np.array(image)
+def preview_column_means(arr: np.ndarray) -> np.ndarray:
     h, w = arr.shape[:2]
-    if w == 0 or h == 0:
-        return 0.0
-    if w / h < 1.25:
-        return 0.0
     preview_width = min(320, w)
     scale = preview_width / w
     preview_height = max(1, int(round(h * scale)))
     preview = cv2.resize(
         arr, (preview_width, preview_height), interpolation=cv2.INTER_AREA
     )
-    gray = cv2.cvtColor(preview, cv2.COLOR_RGB2GRAY)
-    column_means = gray.mean(axis=0)
+    gray = preview if preview.ndim == 2 else cv2.cvtColor(preview, cv2.COLOR_RGB2GRAY)
+    return gray.mean(axis=0)
+
+
+def column_confidence(column_means: np.ndarray) -> float:
+    preview_width = len(column_means)
     global_mean = float(column_means.mean())
     center_start = int(preview_width * 0.4)
     center_end = int(preview_width * 0.6)
     min_index = center_start
+    if center_end > center_start:
+        min_index += int(np.argmin(column_means[center_start:center_end]))
     min_value = float(column_means[min_index])
-    for x in range(center_start, center_end):
-        if column_means[x] < min_value:
-            min_value = float(column_means[x])
-            min_index = x
     darkness = global_mean - min_value
     if darkness < 10:
         return 0.0
-    threshold = min_value + darkness * 0.5
-    left = min_index
-    right = min_index
-    while left > 0 and column_means[left] < threshold:
-        left -= 1
-    while right < preview_width - 1 and column_means[right] < threshold:
-        right += 1
     mid = preview_width // 2
     center_distance = abs(min_index - mid) / max(1, mid)
     left_density = column_means[:mid].mean() if mid > 0 else global_mean
@@ -266,618 +772,813 @@ def spread_confidence(image: Image.Image) -> float:
     return confidence
 
 
-class Ornament(BaseModel):
-    box: List[int]
-    hash: str
+def draw_outline(
+    draw: ImageDraw.ImageDraw,
+    box: Tuple[int, int, int, int],
+    color: Tuple[int, int, int],
+    width: int = 4,
+) -> None:
+    draw.rectangle(px_box(box), outline=ink(draw.mode, color), width=stroke(width))
+
+
+def draw_plate(
+    draw: ImageDraw.ImageDraw, img: Image.Image, box: Tuple[int, int, int, int]
+) -> None:
+    draw_outline(draw, box, (20, 20, 20))
+    x0, y0, x1, y1 = (px(v) for v in box)
+    gradient = np.tile(np.linspace(200, 240, x1 - x0, dtype=np.uint8), (y1 - y0, 1))
+    # Pasting an L image converts it to the page mode, replicating channels.
+    img.paste(Image.fromarray(gradient, mode="L"), (x0, y0))
+
+
+def spread_confidence(image: Image.Image) -> float:
+    arr = np.array(image)
+    h, w = arr.shape[:2]
+    if w == 0 or h == 0:
+        return 0.0
+    if w / h < 1.25:
+        return 0.0
+    return column_confidence(preview_column_means(arr))
+
+
+def blend_calibrated_gutter(
+    img: Image.Image,
+    gutter: Tuple[int, int],
+    color: int,
+    alpha: float,
+    attempts: int,
+    target: Tuple[float, float],
+    color_range: Tuple[int, int],
+    steps: Tuple[int, int],
+) -> Image.Image:
+    # Each attempt blends a column-constant gutter overlay into the running
+    # composite. Blending and INTER_AREA previews are both linear, so the
+    # search runs on 1-D column means and the full-resolution page is
+    # composited once with the accumulated overlay.
+    arr = np.array(img)
+    h, w = arr.shape[:2]
+    gutter = (px(gutter[0]), px(gutter[1]))
+    wide = w > 0 and h > 0 and w / h >= 1.25
+    means = preview_column_means(arr).astype(np.float64)
+    preview_width = len(means)
+    overlay = np.full((1, w), BACKGROUND, dtype=np.float32)
+    accumulated = np.zeros(w, dtype=np.float64)
+    keep = 1.0
+    for _attempt in range(attempts):
+        overlay[:, gutter[0] : gutter[1]] = color
+        overlay_means = cv2.resize(
+            overlay, (preview_width, 1), interpolation=cv2.INTER_AREA
+        )[0]
+        means = (1 - alpha) * means + alpha * overlay_means
+        accumulated = (1 - alpha) * accumulated + alpha * overlay[0]
+        keep *= 1 - alpha
+        confidence = column_confidence(means) if wide else 0.0
+        if target[0] <= confidence < target[1]:
+            break
+        step = steps[0] if confidence < target[0] else -steps[1]
+        color = max(color_range[0], min(color_range[1], color + step))
+    column_gain = accumulated.astype(np.float32)[None, :]
+    if arr.ndim == 3:
+        column_gain = column_gain[..., None]
+    channels = arr.shape[2] if arr.ndim == 3 else 1
+    for y0, y1 in row_bands(h, w * channels * 4):
+        out = arr[y0:y1].astype(np.float32)
+        out *= np.float32(keep)
+        out += column_gain
+        np.rint(out, out=out)
+        np.clip(out, 0, 255, out=out)
+        np.copyto(arr[y0:y1], out, casting="unsafe")
+    return Image.fromarray(arr, mode=img.mode)
+
+
+def save_image(img: Image.Image, path: Path) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", compress_level=6, optimize=False)
+    data = buffer.getvalue()
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
 
 
-class Gutter(BaseModel):
-    side: str
-    widthPx: int
+def dump_json(obj: BaseModel) -> bytes:
+    payload = obj.model_dump(exclude_none=True)
+    return json.dumps(payload, indent=2).encode("utf-8")
 
 
-class BaselineGrid(BaseModel):
-    medianSpacingPx: Optional[float]
+def save_json(obj: BaseModel, path: Path) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = dump_json(obj)
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
 
 
-class TruthPage(BaseModel):
-    pageId: str
-    pageBoundsPx: List[int]
-    contentBoxPx: List[int]
-    gutter: Gutter
-    baselineGrid: BaselineGrid
-    ornaments: List[Ornament]
-    shouldSplit: bool
-    expectedReviewReasons: List[str]
+def save_labels(mask: LabelMask, path: Path) -> str:
+    # Compact separators: run lists are long and indenting them would put
+    # every count on its own line.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(mask.model_dump(), separators=(",", ":")).encode("utf-8")
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
 
 
-class ManifestEntry(BaseModel):
-    id: str
-    description: str
-    tags: List[str]
-    truthFile: str
-    ssimThreshold: float
-    ornamentHash: Optional[str] = None
+def resample_image(img: Image.Image, size: Tuple[int, int]) -> Image.Image:
+    if img.size == size:
+        return img
+    out = cv2.resize(np.asarray(img), size, interpolation=cv2.INTER_AREA)
+    return Image.fromarray(out, mode=img.mode)
+
+
+def encode_labels(labels: np.ndarray) -> LabelMask:
+    flat = labels.ravel()
+    starts = np.flatnonzero(np.diff(flat)) + 1
+    starts = np.concatenate([[0], starts])
+    counts = np.diff(np.concatenate([starts, [flat.size]]))
+    height, width = labels.shape
+    return models.LabelMask(
+        sizePx=[width, height],
+        classes=list(LABEL_CLASSES),
+        values=flat[starts].tolist(),
+        counts=counts.tolist(),
+    )
 
 
-class Manifest(BaseModel):
-    version: str
-    seed: int
-    dpi: int
-    imageSizePx: dict
-    pages: List[ManifestEntry]
+def decode_labels(mask: LabelMask) -> np.ndarray:
+    width, height = mask.sizePx
+    values = np.asarray(mask.values, dtype=np.uint8)
+    return np.repeat(values, mask.counts).reshape(height, width)
+
+
+def resample_labels(mask: LabelMask, size: Tuple[int, int]) -> LabelMask:
+    if tuple(mask.sizePx) == size:
+        return mask
+    labels = cv2.resize(decode_labels(mask), size, interpolation=cv2.INTER_NEAREST)
+    return encode_labels(labels)
+
+
+def scale_truth(truth: TruthPage, factor: float) -> TruthPage:
+    if factor == 1.0:
+        return truth
+
+    def scale(value: float) -> int:
+        return int(round(value * factor))
+
+    spacing = truth.baselineGrid.medianSpacingPx
+    width = scale(truth.pageBoundsPx[2] + 1)
+    height = scale(truth.pageBoundsPx[3] + 1)
+    return truth.model_copy(
+        update={
+            "pageBoundsPx": [0, 0, width - 1, height - 1],
+            "contentBoxPx": [scale(v) for v in truth.contentBoxPx],
+            "gutter": models.Gutter(
+                side=truth.gutter.side, widthPx=scale(truth.gutter.widthPx)
+            ),
+            "baselineGrid": models.BaselineGrid(
+                medianSpacingPx=None if spacing is None else round(spacing * factor, 2)
+            ),
+            "ornaments": [
+                models.Ornament(
+                    box=[scale(v) for v in ornament.box], hash=ornament.hash
+                )
+                for ornament in truth.ornaments
+            ],
+            "labels": (
+                None
+                if truth.labels is None
+                else resample_labels(truth.labels, (width, height))
+            ),
+        }
+    )
+
+
+def file_sha256(path: Path) -> Optional[str]:
+    try:
+        with path.open("rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+@dataclass(frozen=True)
+class Op:
+    name: str
+    params: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        return dict(self.params)
+
+
+@dataclass(frozen=True)
+class Operator:
+    name: str
+    kind: str
+    apply: Callable[..., None]
+
+
+# Operator kinds: "draw" operators act on the page state directly; "pixel"
+# operators add steps to a shared EffectChain and "geometry" operators to a
+# shared GeometryStage, so runs of either fuse into a single pass.
+OPERATORS: Dict[str, Operator] = {}
+
+
+def operator(name: str, kind: str = "draw") -> Callable[[Callable], Callable]:
+    def register(fn: Callable) -> Callable:
+        OPERATORS[name] = Operator(name, kind, fn)
+        return fn
+
+    return register
+
+
+def op(name: str, **params: Any) -> Op:
+    if name not in OPERATORS:
+        raise KeyError(f"Unknown page operator: {name}")
+    return Op(name, tuple(params.items()))
 
 
 @dataclass
-class PageSpec:
-    page_id: str
-    description: str
-    tags: List[str]
-    ssim_threshold: float
-    renderer: callable
+class PageState:
+    rng: np.random.Generator
+    width: int
+    height: int
+    img: Optional[Image.Image] = None
+    ornaments: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    stages: List[GeometryStage] = field(default_factory=list)
+    labels: Optional[np.ndarray] = None
+    settings: RenderSettings = field(default_factory=RenderSettings)
+
+    @property
+    def draw(self) -> ImageDraw.ImageDraw:
+        return ImageDraw.Draw(self.img)
+
+    def mark(self, label: str, box: Tuple[int, int, int, int]) -> None:
+        # Inclusive design box, mapped like the fills that draw it.
+        x0, y0, x1, y1 = box
+        self.mark_px(label, (px(x0), px(y0), px(x1 + 1), px(y1 + 1)))
+
+    def mark_px(self, label: str, box: Tuple[float, float, float, float]) -> None:
+        # Exclusive device box; later elements overwrite earlier ones.
+        if self.labels is None:
+            return
+        x0, y0, x1, y1 = (max(0, int(math.ceil(v))) for v in box)
+        self.labels[y0:y1, x0:x1] = LABEL_CLASSES.index(label)
+
+
+@operator("canvas")
+def op_canvas(page: PageState, value: int = BACKGROUND) -> None:
+    page.img = new_canvas(page.width, page.height, value)
+    if page.settings.label_masks:
+        page.labels = np.zeros((page.img.height, page.img.width), dtype=np.uint8)
+
+
+@operator("texture", kind="pixel")
+def op_texture(chain: EffectChain, page: PageState, strength: float) -> None:
+    chain.paper_texture(page.rng, strength)
+
+
+@operator("shadow", kind="pixel")
+def op_shadow(
+    chain: EffectChain, page: PageState, side: str, width: int, min_factor: float
+) -> None:
+    chain.shadow_gradient(side, width, min_factor)
 
 
-def save_image(img: Image.Image, path: Path) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(path, format="PNG", compress_level=6, optimize=False)
+@operator("illumination", kind="pixel")
+def op_illumination(
+    chain: EffectChain, page: PageState, axis: str, start: float, end: float
+) -> None:
+    chain.linear_illumination(axis, start, end)
 
 
-def save_json(obj: BaseModel, path: Path) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    payload = obj.model_dump(exclude_none=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+@operator("vignette", kind="pixel")
+def op_vignette(chain: EffectChain, page: PageState, strength: float = 0.9) -> None:
+    chain.vignette(strength)
 
 
-def build_clean_single(
-    rng: np.random.Generator, width: int, height: int
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.5)
-    draw = ImageDraw.Draw(img)
-    content = (MARGIN, MARGIN + 40, width - MARGIN, height - MARGIN)
-    add_text_block(draw, content, 40, rng)
-    truth = TruthPage(
-        pageId="p01_clean_single",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=list(content),
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=20.08),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p01_clean_single",
-        description="clean single column",
-        tags=["clean", "single-column"],
-        truthFile="p01_clean_single.json",
-        ssimThreshold=0.99,
-    )
-    return img, truth, manifest
+@operator("text")
+def op_text(
+    page: PageState,
+    box: Tuple[int, int, int, int],
+    line_height: int,
+    label: str = "body",
+) -> None:
+    lines = add_text_block(page.img, box, line_height, page.rng)
+    for line in lines.tolist():
+        page.mark(label, line)
 
 
-def build_clean_double(
-    rng: np.random.Generator, width: int, height: int
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.5)
-    draw = ImageDraw.Draw(img)
-    gap = 80
-    column_width = (width - 2 * MARGIN - gap) // 2
-    left = (MARGIN, MARGIN + 40, MARGIN + column_width, height - MARGIN)
-    right = (MARGIN + column_width + gap, MARGIN + 40, width - MARGIN, height - MARGIN)
-    add_text_block(draw, left, 40, rng)
-    add_text_block(draw, right, 40, rng)
-    content = (MARGIN, MARGIN + 40, width - MARGIN, height - MARGIN)
-    truth = TruthPage(
-        pageId="p02_clean_double",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=list(content),
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=28.67),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p02_clean_double",
-        description="clean two column",
-        tags=["clean", "double-column"],
-        truthFile="p02_clean_double.json",
-        ssimThreshold=0.99,
-    )
-    return img, truth, manifest
+@operator("running_head")
+def op_running_head(page: PageState, top: int) -> None:
+    page.mark_px("running-head", draw_running_head(page.draw, page.width, top))
 
 
-def build_running_head(
-    rng: np.random.Generator, width: int, height: int
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.8)
-    draw = ImageDraw.Draw(img)
-    draw_running_head(draw, width, 50)
-    draw_folio(draw, width, height - 80, "12")
-    content = (MARGIN, MARGIN + 140, width - MARGIN, height - MARGIN - 120)
-    add_text_block(draw, content, 40, rng)
-    img = apply_linear_illumination(img, "x", 1.0, 0.93)
-    img = apply_vignette(img, strength=0.92)
-    truth = TruthPage(
-        pageId="p03_running_head_folio",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=list(content),
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=18.71),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p03_running_head_folio",
-        description="running head and folio bands",
-        tags=["running-head", "folio"],
-        truthFile="p03_running_head_folio.json",
-        ssimThreshold=0.99,
-    )
-    return img, truth, manifest
+@operator("folio")
+def op_folio(page: PageState, bottom: int, folio: str) -> None:
+    page.mark_px("folio", draw_folio(page.draw, page.width, bottom, folio))
 
 
-def build_ornament(
-    rng: np.random.Generator, width: int, height: int
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.5)
-    draw = ImageDraw.Draw(img)
-    ornament_box = draw_ornament(draw, (width // 2, MARGIN + 120), 120)
-    content = (MARGIN, MARGIN + 220, width - MARGIN, height - MARGIN)
-    add_text_block(draw, content, 40, rng)
-    ornament_crop = img.crop(ornament_box)
-    ornament_hash = str(imagehash.phash(ornament_crop))
-    truth = TruthPage(
-        pageId="p04_ornament",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=list(content),
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=16.85),
-        ornaments=[Ornament(box=list(ornament_box), hash=ornament_hash)],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p04_ornament",
-        description="ornament page",
-        tags=["ornament"],
-        truthFile="p04_ornament.json",
-        ssimThreshold=0.99,
-        ornamentHash=ornament_hash,
-    )
-    return img, truth, manifest
+@operator("ornament")
+def op_ornament(
+    page: PageState, center: Tuple[int, int], size: int, truth: bool = True
+) -> None:
+    box = draw_ornament(page.draw, center, size)
+    page.mark("ornament", box)
+    if truth:
+        page.ornaments.append(box)
 
 
-def build_footnotes_marginalia(
-    rng: np.random.Generator, width: int, height: int
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.7)
-    draw = ImageDraw.Draw(img)
-    content = (MARGIN + 80, MARGIN + 40, width - MARGIN, height - MARGIN - 220)
-    add_text_block(draw, content, 38, rng)
-    footnotes = (MARGIN + 80, height - MARGIN - 180, width - MARGIN, height - MARGIN)
-    add_text_block(draw, footnotes, 28, rng)
-    marginalia = (MARGIN - 90, MARGIN + 200, MARGIN + 40, height - MARGIN - 300)
-    add_text_block(draw, marginalia, 30, rng)
-    truth = TruthPage(
-        pageId="p05_footnotes_marginalia",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=[MARGIN - 90, MARGIN + 40, width - MARGIN, height - MARGIN],
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=25.76),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p05_footnotes_marginalia",
-        description="footnotes and marginalia",
-        tags=["footnotes", "marginalia"],
-        truthFile="p05_footnotes_marginalia.json",
-        ssimThreshold=0.99,
-    )
-    return img, truth, manifest
+@operator("title_block")
+def op_title_block(page: PageState, box: Tuple[int, int, int, int]) -> None:
+    draw_title_block(page.draw, box)
+    page.mark("title", box)
 
 
-def build_blank_verso(
-    rng: np.random.Generator, width: int, height: int
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(width, height, value=248)
-    img = add_paper_texture(img, rng, strength=1.0)
-    truth = TruthPage(
-        pageId="p06_blank_verso",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=[MARGIN, MARGIN, width - MARGIN, height - MARGIN],
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=None),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=[
-            "low-skew-confidence",
-            "low-shading-confidence",
-        ],
-    )
-    manifest = ManifestEntry(
-        id="p06_blank_verso",
-        description="blank verso",
-        tags=["blank"],
-        truthFile="p06_blank_verso.json",
-        ssimThreshold=0.99,
-    )
-    return img, truth, manifest
+@operator("drop_cap")
+def op_drop_cap(page: PageState, box: Tuple[int, int, int, int]) -> None:
+    draw_drop_cap(page.draw, box)
+    page.mark("drop-cap", box)
 
 
-def build_plate(
-    rng: np.random.Generator, width: int, height: int
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.3)
-    draw = ImageDraw.Draw(img)
-    plate_box = (
-        MARGIN + 100,
-        MARGIN + 200,
-        width - MARGIN - 100,
-        height - MARGIN - 300,
-    )
-    draw.rectangle(plate_box, outline=(20, 20, 20), width=4)
-    gradient = np.tile(
-        np.linspace(200, 240, plate_box[2] - plate_box[0], dtype=np.uint8),
-        (plate_box[3] - plate_box[1], 1),
-    )
-    gradient_img = np.stack([gradient] * 3, axis=2)
-    plate = Image.fromarray(gradient_img, mode="RGB")
-    img.paste(plate, plate_box[:2])
-    truth = TruthPage(
-        pageId="p07_plate",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=list(plate_box),
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=None),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-skew-confidence", "low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p07_plate",
-        description="illustration plate",
-        tags=["illustration", "plate"],
-        truthFile="p07_plate.json",
-        ssimThreshold=0.99,
-    )
-    return img, truth, manifest
+@operator("outline")
+def op_outline(
+    page: PageState, box: Tuple[int, int, int, int], color: Tuple[int, int, int]
+) -> None:
+    draw_outline(page.draw, box, color)
 
 
-def build_shadow_page(
-    rng: np.random.Generator,
-    width: int,
-    height: int,
-    side: str,
-    page_id: str,
-    baseline_spacing: float,
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.6)
-    draw = ImageDraw.Draw(img)
-    content = (MARGIN, MARGIN + 40, width - MARGIN, height - MARGIN)
-    add_text_block(draw, content, 40, rng)
-    img = apply_shadow_gradient(img, side, width=140, min_factor=0.55)
-    img = apply_linear_illumination(img, "x", 0.95, 1.0)
-    truth = TruthPage(
-        pageId=page_id,
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=list(content),
-        gutter=Gutter(side=side, widthPx=140),
-        baselineGrid=BaselineGrid(medianSpacingPx=baseline_spacing),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id=page_id,
-        description=f"{side} gutter shadow",
-        tags=["shadow", f"gutter-{side}"],
-        truthFile=f"{page_id}.json",
-        ssimThreshold=0.985,
-    )
-    return img, truth, manifest
+@operator("plate")
+def op_plate(page: PageState, box: Tuple[int, int, int, int]) -> None:
+    draw_plate(page.draw, page.img, box)
+    page.mark("plate", box)
 
 
-def build_spread(
-    rng: np.random.Generator,
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    width = WIDTH * 2
-    height = HEIGHT
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.4)
-    draw = ImageDraw.Draw(img)
-    gutter_width = 220
-    left_box = (
-        MARGIN,
-        MARGIN + 40,
-        WIDTH - MARGIN - gutter_width // 2,
-        height - MARGIN,
-    )
-    right_box = (
-        WIDTH + gutter_width // 2 + MARGIN,
-        MARGIN + 40,
-        width - MARGIN,
-        height - MARGIN,
-    )
-    add_text_block(draw, left_box, 40, rng)
-    add_text_block(draw, right_box, 40, rng)
-
-    gutter_start = WIDTH - gutter_width // 2
-    gutter_end = WIDTH + gutter_width // 2
-    gutter_color = 225
-    for _ in range(6):
-        overlay = Image.new(
-            "RGB", (width, height), (BACKGROUND, BACKGROUND, BACKGROUND)
-        )
-        overlay_arr = np.array(overlay)
-        overlay_arr[:, gutter_start:gutter_end, :] = gutter_color
-        overlay = Image.fromarray(overlay_arr, mode="RGB")
-        composite = Image.blend(img, overlay, alpha=0.4)
-        confidence = spread_confidence(composite)
-        if 0.6 <= confidence < 0.7:
-            img = composite
-            break
-        gutter_color = max(
-            200, min(240, gutter_color + (2 if confidence < 0.6 else -3))
-        )
-        img = composite
-
-    truth = TruthPage(
-        pageId="p10_spread_dark_gutter",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=[MARGIN, MARGIN, width - MARGIN, height - MARGIN],
-        gutter=Gutter(side="center", widthPx=gutter_width),
-        baselineGrid=BaselineGrid(medianSpacingPx=22.83),
-        ornaments=[],
-        shouldSplit=True,
-        expectedReviewReasons=[
-            "low-shading-confidence",
-            "spread-split-low-confidence",
-        ],
-    )
-    manifest = ManifestEntry(
-        id="p10_spread_dark_gutter",
-        description="two-page spread with dark gutter",
-        tags=["spread", "gutter"],
-        truthFile="p10_spread_dark_gutter.json",
-        ssimThreshold=0.985,
-    )
-    return img, truth, manifest
+@operator("gutter")
+def op_gutter(page: PageState, span: Tuple[int, int], **calibration: Any) -> None:
+    page.img = blend_calibrated_gutter(page.img, span, **calibration)
 
 
-def build_curved_warp(
-    rng: np.random.Generator,
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(WIDTH, HEIGHT)
-    img = add_paper_texture(img, rng, strength=1.5)
-    draw = ImageDraw.Draw(img)
-    content = (MARGIN, MARGIN + 40, WIDTH - MARGIN, HEIGHT - MARGIN)
-    add_text_block(draw, content, 44, rng)
-    img = apply_curved_warp(img, amplitude=20)
-    truth = TruthPage(
-        pageId="p11_curved_warp",
-        pageBoundsPx=[0, 0, WIDTH - 1, HEIGHT - 1],
-        contentBoxPx=list(content),
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=34.85),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p11_curved_warp",
-        description="curved warp baseline",
-        tags=["warp", "baseline"],
-        truthFile="p11_curved_warp.json",
-        ssimThreshold=0.985,
-    )
-    return img, truth, manifest
+@operator("rotate", kind="geometry")
+def op_rotate(stage: GeometryStage, page: PageState, angle: float) -> None:
+    stage.rotate(angle)
 
 
-def build_rotation_perspective(
-    rng: np.random.Generator,
+@operator("perspective", kind="geometry")
+def op_perspective(stage: GeometryStage, page: PageState) -> None:
+    src, dst = page_perspective_quad(page.width, page.height)
+    stage.perspective(src, dst)
+
+
+@operator("curved_warp", kind="geometry")
+def op_curved_warp(stage: GeometryStage, page: PageState, amplitude: float) -> None:
+    stage.curved_warp(amplitude)
+
+
+DARK_GUTTER = dict(
+    color=225,
+    alpha=0.4,
+    attempts=6,
+    target=(0.6, 0.7),
+    color_range=(200, 240),
+    steps=(2, 3),
+)
+LIGHT_GUTTER = dict(
+    color=232,
+    alpha=0.3,
+    attempts=5,
+    target=(0.45, 0.58),
+    color_range=(210, 240),
+    steps=(2, 2),
+)
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """Declarative page: an ordered operator list plus its truth fields."""
+
+    page_id: str
+    description: str
+    tags: Tuple[str, ...]
+    ssim_threshold: float
+    ops: Tuple[Op, ...]
+    content_box: Tuple[int, int, int, int]
+    baseline_spacing: Optional[float]
+    gutter_side: str = "none"
+    gutter_width: int = 0
+    review_reasons: Tuple[str, ...] = ("low-shading-confidence",)
+    width: int = WIDTH
+    height: int = HEIGHT
+
+    @property
+    def spread(self) -> bool:
+        return self.width > WIDTH
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    kind: str
+    ops: Tuple[Op, ...]
+
+    @property
+    def label(self) -> str:
+        return "+".join(item.name for item in self.ops)
+
+
+def compile_plan(ops: Iterable[Op]) -> Tuple[PlanStep, ...]:
+    # Adjacent pixel operators are fused into one EffectChain (one float pass,
+    # one quantization) and adjacent geometry operators into one
+    # GeometryStage (one resample). Vignette masks and warp grids come from
+    # the shared mask cache, so pages with the same parameters reuse them.
+    steps: List[PlanStep] = []
+    for item in ops:
+        kind = OPERATORS[item.name].kind
+        if kind != "draw" and steps and steps[-1].kind == kind:
+            steps[-1] = PlanStep(kind, steps[-1].ops + (item,))
+        else:
+            steps.append(PlanStep(kind, (item,)))
+    return tuple(steps)
+
+
+_operator_ms: Dict[str, float] = {}
+
+
+def operator_timings() -> Dict[str, float]:
+    """Milliseconds per plan step label for the last page rendered here."""
+    return dict(_operator_ms)
+
+
+def execute_plan(plan: Iterable[PlanStep], page: PageState) -> None:
+    for step in plan:
+        start = time.perf_counter()
+        if step.kind == "pixel":
+            chain = EffectChain(page.img)
+            for item in step.ops:
+                OPERATORS[item.name].apply(chain, page, **item.kwargs)
+            page.img = chain.to_image()
+        elif step.kind == "geometry":
+            stage = GeometryStage(page.width, page.height)
+            for item in step.ops:
+                OPERATORS[item.name].apply(stage, page, **item.kwargs)
+            page.img = stage.apply(page.img, page.settings.scale)
+            if page.labels is not None:
+                page.labels = stage.apply_labels(page.labels, page.settings.scale)
+            page.stages.append(stage)
+        else:
+            for item in step.ops:
+                OPERATORS[item.name].apply(page, **item.kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        _operator_ms[step.label] = _operator_ms.get(step.label, 0.0) + elapsed
+
+
+def render_spec(
+    rng: np.random.Generator, spec: PageSpec
 ) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(WIDTH, HEIGHT)
-    img = add_paper_texture(img, rng, strength=1.5)
-    draw = ImageDraw.Draw(img)
-    content = (MARGIN, MARGIN + 40, WIDTH - MARGIN, HEIGHT - MARGIN)
-    add_text_block(draw, content, 40, rng)
-    img = apply_rotation_perspective(img, angle=3.5)
-    truth = TruthPage(
-        pageId="p12_rot_perspective",
-        pageBoundsPx=[0, 0, WIDTH - 1, HEIGHT - 1],
-        contentBoxPx=list(content),
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=23.86),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
+    page = PageState(rng, spec.width, spec.height, settings=current_render_settings())
+    execute_plan(compile_plan(spec.ops), page)
+    content = list(spec.content_box)
+    for stage in page.stages:
+        content = stage.transform_box(content)
+    ornaments = [
+        models.Ornament(box=list(box), hash=ornament_hash(page.img, box))
+        for box in page.ornaments
+    ]
+    truth = models.TruthPage(
+        pageId=spec.page_id,
+        pageBoundsPx=[0, 0, spec.width - 1, spec.height - 1],
+        contentBoxPx=content,
+        gutter=models.Gutter(side=spec.gutter_side, widthPx=spec.gutter_width),
+        baselineGrid=models.BaselineGrid(medianSpacingPx=spec.baseline_spacing),
+        ornaments=ornaments,
+        shouldSplit=spec.spread,
+        expectedReviewReasons=list(spec.review_reasons),
+        labels=None if page.labels is None else encode_labels(page.labels),
     )
-    manifest = ManifestEntry(
-        id="p12_rot_perspective",
-        description="rotation + perspective warp",
-        tags=["warp", "perspective"],
-        truthFile="p12_rot_perspective.json",
-        ssimThreshold=0.985,
+    manifest = models.ManifestEntry(
+        id=spec.page_id,
+        description=spec.description,
+        tags=list(spec.tags),
+        truthFile=f"{spec.page_id}.json",
+        ssimThreshold=spec.ssim_threshold,
+        ornamentHash=ornaments[0].hash if ornaments else None,
     )
-    return img, truth, manifest
+    return page.img, truth, manifest
 
 
-def build_rotation_only(
-    rng: np.random.Generator,
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(WIDTH, HEIGHT)
-    img = add_paper_texture(img, rng, strength=1.6)
-    draw = ImageDraw.Draw(img)
+def shadow_spec(side: str, page_id: str, baseline_spacing: float) -> PageSpec:
     content = (MARGIN, MARGIN + 40, WIDTH - MARGIN, HEIGHT - MARGIN)
-    add_text_block(draw, content, 40, rng)
-    img = apply_rotation(img, angle=-2.8)
-    truth = TruthPage(
-        pageId="p13_rotation_only",
-        pageBoundsPx=[0, 0, WIDTH - 1, HEIGHT - 1],
-        contentBoxPx=list(content),
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=24.11),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p13_rotation_only",
-        description="rotation only",
-        tags=["rotation", "skew"],
-        truthFile="p13_rotation_only.json",
-        ssimThreshold=0.985,
+    return PageSpec(
+        page_id=page_id,
+        description=f"{side} gutter shadow",
+        tags=("shadow", f"gutter-{side}"),
+        ssim_threshold=0.985,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.6),
+            op("text", box=content, line_height=40),
+            op("shadow", side=side, width=140, min_factor=0.55),
+            op("illumination", axis="x", start=0.95, end=1.0),
+        ),
+        content_box=content,
+        baseline_spacing=baseline_spacing,
+        gutter_side=side,
+        gutter_width=140,
     )
-    return img, truth, manifest
 
 
-def build_spread_light_gutter(
-    rng: np.random.Generator,
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
+def spread_spec(
+    page_id: str,
+    description: str,
+    tags: Tuple[str, ...],
+    ssim_threshold: float,
+    texture: float,
+    gutter_width: int,
+    calibration: Dict[str, Any],
+    baseline_spacing: float,
+) -> PageSpec:
     width = WIDTH * 2
-    height = HEIGHT
-    img = new_canvas(width, height)
-    img = add_paper_texture(img, rng, strength=1.5)
-    draw = ImageDraw.Draw(img)
-    gutter_width = 160
-    left_box = (
-        MARGIN,
-        MARGIN + 40,
-        WIDTH - MARGIN - gutter_width // 2,
-        height - MARGIN,
-    )
-    right_box = (
-        WIDTH + gutter_width // 2 + MARGIN,
-        MARGIN + 40,
-        width - MARGIN,
-        height - MARGIN,
+    half = gutter_width // 2
+    left_box = (MARGIN, MARGIN + 40, WIDTH - MARGIN - half, HEIGHT - MARGIN)
+    right_box = (WIDTH + half + MARGIN, MARGIN + 40, width - MARGIN, HEIGHT - MARGIN)
+    return PageSpec(
+        page_id=page_id,
+        description=description,
+        tags=tags,
+        ssim_threshold=ssim_threshold,
+        ops=(
+            op("canvas"),
+            op("texture", strength=texture),
+            op("text", box=left_box, line_height=40),
+            op("text", box=right_box, line_height=40),
+            op("gutter", span=(WIDTH - half, WIDTH + half), **calibration),
+        ),
+        content_box=(MARGIN, MARGIN, width - MARGIN, HEIGHT - MARGIN),
+        baseline_spacing=baseline_spacing,
+        gutter_side="center",
+        gutter_width=gutter_width,
+        review_reasons=("low-shading-confidence", "spread-split-low-confidence"),
+        width=width,
     )
-    add_text_block(draw, left_box, 40, rng)
-    add_text_block(draw, right_box, 40, rng)
-
-    gutter_start = WIDTH - gutter_width // 2
-    gutter_end = WIDTH + gutter_width // 2
-    gutter_color = 232
-    for _attempt in range(5):
-        overlay = Image.new(
-            "RGB", (width, height), (BACKGROUND, BACKGROUND, BACKGROUND)
-        )
-        overlay_arr = np.array(overlay)
-        overlay_arr[:, gutter_start:gutter_end, :] = gutter_color
-        overlay = Image.fromarray(overlay_arr, mode="RGB")
-        composite = Image.blend(img, overlay, alpha=0.3)
-        confidence = spread_confidence(composite)
-        img = composite
-        if 0.45 <= confidence < 0.58:
-            break
-        gutter_color = max(
-            210, min(240, gutter_color + (2 if confidence < 0.45 else -2))
-        )
 
-    truth = TruthPage(
-        pageId="p14_spread_light_gutter",
-        pageBoundsPx=[0, 0, width - 1, height - 1],
-        contentBoxPx=[MARGIN, MARGIN, width - MARGIN, height - MARGIN],
-        gutter=Gutter(side="center", widthPx=gutter_width),
-        baselineGrid=BaselineGrid(medianSpacingPx=21.44),
-        ornaments=[],
-        shouldSplit=True,
-        expectedReviewReasons=[
-            "low-shading-confidence",
-            "spread-split-low-confidence",
-        ],
-    )
-    manifest = ManifestEntry(
-        id="p14_spread_light_gutter",
-        description="two-page spread with light gutter",
-        tags=["spread", "gutter", "split"],
-        truthFile="p14_spread_light_gutter.json",
-        ssimThreshold=0.98,
-    )
-    return img, truth, manifest
 
+BODY = (MARGIN, MARGIN + 40, WIDTH - MARGIN, HEIGHT - MARGIN)
+COLUMN = (WIDTH - 2 * MARGIN - 80) // 2
 
-def build_crop_adjustment(
-    rng: np.random.Generator,
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(WIDTH, HEIGHT)
-    img = add_paper_texture(img, rng, strength=1.9)
-    draw = ImageDraw.Draw(img)
-    content = (MARGIN - 40, MARGIN + 10, WIDTH - MARGIN + 30, HEIGHT - MARGIN + 10)
-    add_text_block(draw, content, 38, rng)
-    trim_box = (MARGIN - 70, MARGIN - 30, WIDTH - MARGIN + 60, HEIGHT - MARGIN + 60)
-    draw.rectangle(trim_box, outline=(15, 15, 15), width=4)
-    img = apply_linear_illumination(img, "y", 1.02, 0.92)
-    truth = TruthPage(
-        pageId="p15_crop_adjustment",
-        pageBoundsPx=[0, 0, WIDTH - 1, HEIGHT - 1],
-        contentBoxPx=[
+PAGE_SPECS: List[PageSpec] = [
+    PageSpec(
+        page_id="p01_clean_single",
+        description="clean single column",
+        tags=("clean", "single-column"),
+        ssim_threshold=0.99,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.5),
+            op("text", box=BODY, line_height=40),
+        ),
+        content_box=BODY,
+        baseline_spacing=20.08,
+    ),
+    PageSpec(
+        page_id="p02_clean_double",
+        description="clean two column",
+        tags=("clean", "double-column"),
+        ssim_threshold=0.99,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.5),
+            op(
+                "text",
+                box=(MARGIN, MARGIN + 40, MARGIN + COLUMN, HEIGHT - MARGIN),
+                line_height=40,
+            ),
+            op(
+                "text",
+                box=(
+                    MARGIN + COLUMN + 80,
+                    MARGIN + 40,
+                    WIDTH - MARGIN,
+                    HEIGHT - MARGIN,
+                ),
+                line_height=40,
+            ),
+        ),
+        content_box=BODY,
+        baseline_spacing=28.67,
+    ),
+    PageSpec(
+        page_id="p03_running_head_folio",
+        description="running head and folio bands",
+        tags=("running-head", "folio"),
+        ssim_threshold=0.99,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.8),
+            op("running_head", top=50),
+            op("folio", bottom=HEIGHT - 80, folio="12"),
+            op(
+                "text",
+                box=(MARGIN, MARGIN + 140, WIDTH - MARGIN, HEIGHT - MARGIN - 120),
+                line_height=40,
+            ),
+            op("illumination", axis="x", start=1.0, end=0.93),
+            op("vignette", strength=0.92),
+        ),
+        content_box=(MARGIN, MARGIN + 140, WIDTH - MARGIN, HEIGHT - MARGIN - 120),
+        baseline_spacing=18.71,
+    ),
+    PageSpec(
+        page_id="p04_ornament",
+        description="ornament page",
+        tags=("ornament",),
+        ssim_threshold=0.99,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.5),
+            op("ornament", center=(WIDTH // 2, MARGIN + 120), size=120),
+            op(
+                "text",
+                box=(MARGIN, MARGIN + 220, WIDTH - MARGIN, HEIGHT - MARGIN),
+                line_height=40,
+            ),
+        ),
+        content_box=(MARGIN, MARGIN + 220, WIDTH - MARGIN, HEIGHT - MARGIN),
+        baseline_spacing=16.85,
+    ),
+    PageSpec(
+        page_id="p05_footnotes_marginalia",
+        description="footnotes and marginalia",
+        tags=("footnotes", "marginalia"),
+        ssim_threshold=0.99,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.7),
+            op(
+                "text",
+                box=(MARGIN + 80, MARGIN + 40, WIDTH - MARGIN, HEIGHT - MARGIN - 220),
+                line_height=38,
+            ),
+            op(
+                "text",
+                box=(
+                    MARGIN + 80,
+                    HEIGHT - MARGIN - 180,
+                    WIDTH - MARGIN,
+                    HEIGHT - MARGIN,
+                ),
+                line_height=28,
+                label="footnotes",
+            ),
+            op(
+                "text",
+                box=(MARGIN - 90, MARGIN + 200, MARGIN + 40, HEIGHT - MARGIN - 300),
+                line_height=30,
+                label="marginalia",
+            ),
+        ),
+        content_box=(MARGIN - 90, MARGIN + 40, WIDTH - MARGIN, HEIGHT - MARGIN),
+        baseline_spacing=25.76,
+    ),
+    PageSpec(
+        page_id="p06_blank_verso",
+        description="blank verso",
+        tags=("blank",),
+        ssim_threshold=0.99,
+        ops=(op("canvas", value=248), op("texture", strength=1.0)),
+        content_box=(MARGIN, MARGIN, WIDTH - MARGIN, HEIGHT - MARGIN),
+        baseline_spacing=None,
+        review_reasons=("low-skew-confidence", "low-shading-confidence"),
+    ),
+    PageSpec(
+        page_id="p07_plate",
+        description="illustration plate",
+        tags=("illustration", "plate"),
+        ssim_threshold=0.99,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.3),
+            op(
+                "plate",
+                box=(
+                    MARGIN + 100,
+                    MARGIN + 200,
+                    WIDTH - MARGIN - 100,
+                    HEIGHT - MARGIN - 300,
+                ),
+            ),
+        ),
+        content_box=(
+            MARGIN + 100,
+            MARGIN + 200,
+            WIDTH - MARGIN - 100,
+            HEIGHT - MARGIN - 300,
+        ),
+        baseline_spacing=None,
+        review_reasons=("low-skew-confidence", "low-shading-confidence"),
+    ),
+    shadow_spec("left", "p08_shadow_left", 21.16),
+    shadow_spec("right", "p09_shadow_right", 25.58),
+    spread_spec(
+        "p10_spread_dark_gutter",
+        "two-page spread with dark gutter",
+        ("spread", "gutter"),
+        0.985,
+        texture=1.4,
+        gutter_width=220,
+        calibration=DARK_GUTTER,
+        baseline_spacing=22.83,
+    ),
+    PageSpec(
+        page_id="p11_curved_warp",
+        description="curved warp baseline",
+        tags=("warp", "baseline"),
+        ssim_threshold=0.985,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.5),
+            op("text", box=BODY, line_height=44),
+            op("curved_warp", amplitude=20),
+        ),
+        content_box=BODY,
+        baseline_spacing=34.85,
+    ),
+    PageSpec(
+        page_id="p12_rot_perspective",
+        description="rotation + perspective warp",
+        tags=("warp", "perspective"),
+        ssim_threshold=0.985,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.5),
+            op("text", box=BODY, line_height=40),
+            op("rotate", angle=3.5),
+            op("perspective"),
+        ),
+        content_box=BODY,
+        baseline_spacing=23.86,
+    ),
+    PageSpec(
+        page_id="p13_rotation_only",
+        description="rotation only",
+        tags=("rotation", "skew"),
+        ssim_threshold=0.985,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.6),
+            op("text", box=BODY, line_height=40),
+            op("rotate", angle=-2.8),
+        ),
+        content_box=BODY,
+        baseline_spacing=24.11,
+    ),
+    spread_spec(
+        "p14_spread_light_gutter",
+        "two-page spread with light gutter",
+        ("spread", "gutter", "split"),
+        0.98,
+        texture=1.5,
+        gutter_width=160,
+        calibration=LIGHT_GUTTER,
+        baseline_spacing=21.44,
+    ),
+    PageSpec(
+        page_id="p15_crop_adjustment",
+        description="crop adjustment stress",
+        tags=("crop", "adjustment"),
+        ssim_threshold=0.985,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.9),
+            op(
+                "text",
+                box=(
+                    MARGIN - 40,
+                    MARGIN + 10,
+                    WIDTH - MARGIN + 30,
+                    HEIGHT - MARGIN + 10,
+                ),
+                line_height=38,
+            ),
+            op(
+                "outline",
+                box=(
+                    MARGIN - 70,
+                    MARGIN - 30,
+                    WIDTH - MARGIN + 60,
+                    HEIGHT - MARGIN + 60,
+                ),
+                color=(15, 15, 15),
+            ),
+            op("illumination", axis="y", start=1.02, end=0.92),
+        ),
+        content_box=(
             MARGIN - 70,
             MARGIN - 30,
             WIDTH - MARGIN + 60,
             HEIGHT - MARGIN + 60,
-        ],
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=27.35),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p15_crop_adjustment",
-        description="crop adjustment stress",
-        tags=["crop", "adjustment"],
-        truthFile="p15_crop_adjustment.json",
-        ssimThreshold=0.985,
-    )
-    return img, truth, manifest
-
-
-def build_overlay_element_classes(
-    rng: np.random.Generator,
-) -> Tuple[Image.Image, TruthPage, ManifestEntry]:
-    img = new_canvas(WIDTH, HEIGHT)
-    img = add_paper_texture(img, rng, strength=1.6)
-    draw = ImageDraw.Draw(img)
-    draw_running_head(draw, WIDTH, 50)
-    draw_folio(draw, WIDTH, HEIGHT - 80, "247")
-    draw_ornament(draw, (WIDTH // 2, MARGIN + 140), 110)
-    title_box = (MARGIN + 120, MARGIN + 40, WIDTH - MARGIN - 120, MARGIN + 120)
-    draw_title_block(draw, title_box)
-    drop_cap_box = (MARGIN + 30, MARGIN + 200, MARGIN + 120, MARGIN + 320)
-    draw_drop_cap(draw, drop_cap_box)
-    content = (MARGIN + 140, MARGIN + 180, WIDTH - MARGIN, HEIGHT - MARGIN - 200)
-    add_text_block(draw, content, 36, rng)
-    footnotes = (MARGIN + 120, HEIGHT - MARGIN - 170, WIDTH - MARGIN, HEIGHT - MARGIN)
-    add_text_block(draw, footnotes, 26, rng)
-    marginalia = (MARGIN - 90, MARGIN + 260, MARGIN + 20, HEIGHT - MARGIN - 320)
-    add_text_block(draw, marginalia, 28, rng)
-    truth = TruthPage(
-        pageId="p16_overlay_elements",
-        pageBoundsPx=[0, 0, WIDTH - 1, HEIGHT - 1],
-        contentBoxPx=[MARGIN - 90, MARGIN + 40, WIDTH - MARGIN, HEIGHT - MARGIN],
-        gutter=Gutter(side="none", widthPx=0),
-        baselineGrid=BaselineGrid(medianSpacingPx=23.02),
-        ornaments=[],
-        shouldSplit=False,
-        expectedReviewReasons=["low-shading-confidence"],
-    )
-    manifest = ManifestEntry(
-        id="p16_overlay_elements",
+        ),
+        baseline_spacing=27.35,
+    ),
+    PageSpec(
+        page_id="p16_overlay_elements",
         description="overlay element class showcase",
-        tags=[
+        tags=(
             "overlay",
             "elements",
             "title",
@@ -885,73 +1586,1263 @@ def build_overlay_element_classes(
             "marginalia",
             "footnotes",
             "ornament",
-        ],
-        truthFile="p16_overlay_elements.json",
-        ssimThreshold=0.985,
+        ),
+        ssim_threshold=0.985,
+        ops=(
+            op("canvas"),
+            op("texture", strength=1.6),
+            op("running_head", top=50),
+            op("folio", bottom=HEIGHT - 80, folio="247"),
+            # Drawn as a distractor; the truth lists no ornaments for p16.
+            op("ornament", center=(WIDTH // 2, MARGIN + 140), size=110, truth=False),
+            op(
+                "title_block",
+                box=(MARGIN + 120, MARGIN + 40, WIDTH - MARGIN - 120, MARGIN + 120),
+            ),
+            op("drop_cap", box=(MARGIN + 30, MARGIN + 200, MARGIN + 120, MARGIN + 320)),
+            op(
+                "text",
+                box=(MARGIN + 140, MARGIN + 180, WIDTH - MARGIN, HEIGHT - MARGIN - 200),
+                line_height=36,
+            ),
+            op(
+                "text",
+                box=(
+                    MARGIN + 120,
+                    HEIGHT - MARGIN - 170,
+                    WIDTH - MARGIN,
+                    HEIGHT - MARGIN,
+                ),
+                line_height=26,
+                label="footnotes",
+            ),
+            op(
+                "text",
+                box=(MARGIN - 90, MARGIN + 260, MARGIN + 20, HEIGHT - MARGIN - 320),
+                line_height=28,
+                label="marginalia",
+            ),
+        ),
+        content_box=(MARGIN - 90, MARGIN + 40, WIDTH - MARGIN, HEIGHT - MARGIN),
+        baseline_spacing=23.02,
+    ),
+]
+
+
+SCALED_FAMILIES = (
+    "clean",
+    "double",
+    "shadow",
+    "spread",
+    "warp",
+    "rotation",
+    "plate",
+    "ornament",
+)
+DEFAULT_MIX = {
+    "clean": 4.0,
+    "double": 2.0,
+    "shadow": 2.0,
+    "spread": 1.0,
+    "warp": 1.0,
+    "rotation": 1.0,
+    "plate": 0.5,
+    "ornament": 0.5,
+}
+
+
+@dataclass(frozen=True)
+class ScaledPageSpec:
+    family: str
+    margin: int
+    line_height: int
+    texture: float
+    angle: float = 0.0
+    amplitude: float = 0.0
+    gutter_width: int = 0
+    shadow_side: str = "none"
+    shadow_width: int = 0
+    shadow_min: float = 1.0
+
+
+def parse_dpi_levels(text: str) -> List[int]:
+    try:
+        levels = {int(part) for part in text.split(",") if part.strip()}
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid DPI list {text!r}") from exc
+    if not levels or min(levels) < 1:
+        raise argparse.ArgumentTypeError("DPI levels must be positive integers")
+    return sorted(levels, reverse=True)
+
+
+def parse_size(text: str) -> int:
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    value = text.strip().upper().rstrip("B")
+    unit = units["M"]
+    if value and value[-1] in units:
+        unit = units[value[-1]]
+        value = value[:-1]
+    try:
+        size = int(float(value) * unit)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid size {text!r}") from exc
+    if size <= 0:
+        raise argparse.ArgumentTypeError("size must be positive")
+    return size
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCALED_FAMILIES:
+            raise argparse.ArgumentTypeError(
+                f"unknown family {name!r}; expected one of {', '.join(SCALED_FAMILIES)}"
+            )
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(f"invalid weight for {name}") from exc
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"negative weight for {name}")
+    if not mix or sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return mix
+
+
+def sample_scaled_spec(
+    seed: int, index: int, mix: Dict[str, float]
+) -> Tuple[str, ScaledPageSpec]:
+    rng = np.random.default_rng(derive_page_seed(seed, f"scaled:{index}"))
+    families = sorted(mix)
+    weights = np.array([mix[name] for name in families], dtype=np.float64)
+    family = families[int(rng.choice(len(families), p=weights / weights.sum()))]
+    spec = ScaledPageSpec(
+        family=family,
+        margin=int(rng.integers(100, 201)),
+        line_height=int(rng.integers(28, 49)),
+        texture=round(float(rng.uniform(1.0, 2.0)), 2),
+        angle=round(float(rng.uniform(-4.0, 4.0)), 2) if family == "rotation" else 0.0,
+        amplitude=round(float(rng.uniform(8.0, 30.0)), 1) if family == "warp" else 0.0,
+        gutter_width=int(rng.integers(120, 261)) if family == "spread" else 0,
+        shadow_side=(
+            str(rng.choice(["left", "right"])) if family == "shadow" else "none"
+        ),
+        shadow_width=int(rng.integers(80, 201)) if family == "shadow" else 0,
+        shadow_min=(
+            round(float(rng.uniform(0.45, 0.7)), 2) if family == "shadow" else 1.0
+        ),
     )
-    return img, truth, manifest
+    return f"s{index:06d}_{family}", spec
 
 
-def build_pages(
-    rng: np.random.Generator,
-) -> List[Tuple[Image.Image, TruthPage, ManifestEntry]]:
-    pages: List[Tuple[Image.Image, TruthPage, ManifestEntry]] = []
-    img, truth, manifest = build_clean_single(rng, WIDTH, HEIGHT)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_clean_double(rng, WIDTH, HEIGHT)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_running_head(rng, WIDTH, HEIGHT)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_ornament(rng, WIDTH, HEIGHT)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_footnotes_marginalia(rng, WIDTH, HEIGHT)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_blank_verso(rng, WIDTH, HEIGHT)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_plate(rng, WIDTH, HEIGHT)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_shadow_page(
-        rng,
-        WIDTH,
-        HEIGHT,
-        "left",
-        "p08_shadow_left",
-        21.16,
+def scaled_page_spec(page_id: str, spec: ScaledPageSpec) -> PageSpec:
+    family = spec.family
+    width = WIDTH * 2 if family == "spread" else WIDTH
+    height = HEIGHT
+    margin = spec.margin
+    content = (margin, margin + 40, width - margin, height - margin)
+    ops = [op("canvas"), op("texture", strength=spec.texture)]
+    gutter_side = "none"
+    gutter_width = 0
+    baseline: Optional[float] = float(spec.line_height)
+    reasons: Tuple[str, ...] = ("low-shading-confidence",)
+
+    if family == "double":
+        gap = 80
+        column_width = (width - 2 * margin - gap) // 2
+        left = (margin, margin + 40, margin + column_width, height - margin)
+        right = (
+            margin + column_width + gap,
+            margin + 40,
+            width - margin,
+            height - margin,
+        )
+        ops.append(op("text", box=left, line_height=spec.line_height))
+        ops.append(op("text", box=right, line_height=spec.line_height))
+    elif family == "spread":
+        half = spec.gutter_width // 2
+        left_box = (margin, margin + 40, WIDTH - margin - half, height - margin)
+        right_box = (
+            WIDTH + half + margin,
+            margin + 40,
+            width - margin,
+            height - margin,
+        )
+        ops.append(op("text", box=left_box, line_height=spec.line_height))
+        ops.append(op("text", box=right_box, line_height=spec.line_height))
+        ops.append(op("gutter", span=(WIDTH - half, WIDTH + half), **DARK_GUTTER))
+        content = (margin, margin, width - margin, height - margin)
+        gutter_side = "center"
+        gutter_width = spec.gutter_width
+        reasons = ("low-shading-confidence", "spread-split-low-confidence")
+    elif family == "plate":
+        content = (
+            margin + 100,
+            margin + 200,
+            width - margin - 100,
+            height - margin - 300,
+        )
+        ops.append(op("plate", box=content))
+        baseline = None
+        reasons = ("low-skew-confidence", "low-shading-confidence")
+    elif family == "ornament":
+        ops.append(op("ornament", center=(width // 2, margin + 120), size=120))
+        content = (margin, margin + 220, width - margin, height - margin)
+        ops.append(op("text", box=content, line_height=spec.line_height))
+    else:
+        ops.append(op("text", box=content, line_height=spec.line_height))
+
+    if family == "shadow":
+        ops.append(
+            op(
+                "shadow",
+                side=spec.shadow_side,
+                width=spec.shadow_width,
+                min_factor=spec.shadow_min,
+            )
+        )
+        ops.append(op("illumination", axis="x", start=0.95, end=1.0))
+        gutter_side = spec.shadow_side
+        gutter_width = spec.shadow_width
+    elif family == "rotation":
+        ops.append(op("rotate", angle=spec.angle))
+    elif family == "warp":
+        ops.append(op("curved_warp", amplitude=spec.amplitude))
+
+    strict = family in ("clean", "double", "plate", "ornament")
+    return PageSpec(
+        page_id=page_id,
+        description=f"scaled {family} page",
+        tags=("scaled", family),
+        ssim_threshold=0.99 if strict else 0.985,
+        ops=tuple(ops),
+        content_box=content,
+        baseline_spacing=baseline,
+        gutter_side=gutter_side,
+        gutter_width=gutter_width,
+        review_reasons=reasons,
+        width=width,
+        height=height,
     )
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_shadow_page(
-        rng,
-        WIDTH,
-        HEIGHT,
-        "right",
-        "p09_shadow_right",
-        25.58,
+
+
+PageResult = Tuple["Image.Image", "TruthPage", "ManifestEntry"]
+
+
+@dataclass(frozen=True)
+class PageJob:
+    page_id: str
+    render: Callable[[np.random.Generator], PageResult]
+    spread: bool = False
+
+
+PAGE_JOBS: List[PageJob] = [
+    PageJob(spec.page_id, partial(render_spec, spec=spec), spread=spec.spread)
+    for spec in PAGE_SPECS
+]
+
+
+def iter_scaled_jobs(
+    seed: int, count: int, mix: Optional[Dict[str, float]] = None
+) -> Iterator[PageJob]:
+    mix = mix or DEFAULT_MIX
+    for index in range(count):
+        page_id, spec = sample_scaled_spec(seed, index, mix)
+        page = scaled_page_spec(page_id, spec)
+        yield PageJob(page_id, partial(render_spec, spec=page), spread=page.spread)
+
+
+def render_page(
+    job: PageJob,
+    seed: int,
+    color_mode: str = "RGB",
+    dpi: int = DPI,
+    max_tile_mb: Optional[float] = None,
+    label_masks: bool = False,
+) -> PageResult:
+    with render_settings(color_mode, dpi, max_tile_mb, label_masks):
+        _operator_ms.clear()
+        rng = seed_everything(derive_page_seed(seed, job.page_id))
+        return job.render(rng)
+
+
+def _timed(render: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, float]]:
+    # Runs in the worker, so the operator timings travel back with the page.
+    return render(*args), operator_timings()
+
+
+def _init_worker() -> None:
+    cv2.setNumThreads(1)
+
+
+def max_page_bytes(dpi: int, color_mode: str) -> int:
+    # Spreads are the largest pages: two page widths at the render scale.
+    scale = dpi / DPI
+    channels = 1 if color_mode == "L" else 3
+    return int(round(WIDTH * 2 * scale)) * int(round(HEIGHT * scale)) * channels
+
+
+@dataclass(frozen=True)
+class ArenaImage:
+    slot: int
+    size: Tuple[int, int]
+    mode: str
+
+
+def slot_pixels(
+    buffer: mmap.mmap, offset: int, size: Tuple[int, int], mode: str
+) -> np.ndarray:
+    # A writable array over the slot's bytes; nothing is copied.
+    width, height = size
+    shape = (height, width) if mode == "L" else (height, width, 3)
+    return np.ndarray(shape, dtype=np.uint8, buffer=buffer, offset=offset)
+
+
+class PageArena:
+    """Memory-mapped file of fixed page slots shared with render workers.
+
+    Workers write finished pixels into a slot and return an ArenaImage
+    handle instead of pickling the page. Encoders read the slot in place and
+    it goes back to the free list once every output level is encoded, so a
+    handful of slots is recycled across the whole corpus.
+    """
+
+    def __init__(self, slots: int, slot_bytes: int) -> None:
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self.slot_bytes = -(-slot_bytes // granularity) * granularity
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        fd, self.path = tempfile.mkstemp(prefix="golden-pages-", dir=directory)
+        try:
+            os.ftruncate(fd, slots * self.slot_bytes)
+            self._map = mmap.mmap(fd, slots * self.slot_bytes)
+        finally:
+            os.close(fd)
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+        self._users: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        return self._free.get()
+
+    def retain(self, slot: int, users: int) -> None:
+        with self._lock:
+            self._users[slot] = users
+
+    def discard(self, slot: int) -> None:
+        self._free.put(slot)
+
+    def release(self, slot: int) -> None:
+        with self._lock:
+            self._users[slot] -= 1
+            if self._users[slot] > 0:
+                return
+            del self._users[slot]
+        self._free.put(slot)
+
+    def view(self, handle: ArenaImage) -> np.ndarray:
+        """The slot's pixels in place; only valid until the slot is released."""
+        return slot_pixels(
+            self._map, handle.slot * self.slot_bytes, handle.size, handle.mode
+        )
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except BufferError:
+            # A failed encode's traceback still holds a slot view; the
+            # mapping is freed with it.
+            pass
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "PageArena":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+# Arena files mapped by this worker process, kept for the pool's lifetime.
+_arena_maps: Dict[str, mmap.mmap] = {}
+
+
+def render_to_arena(
+    job: PageJob, seed: int, options: tuple, path: str, slot: int, slot_bytes: int
+) -> Tuple[Union[Image.Image, ArenaImage], TruthPage, ManifestEntry]:
+    img, truth, entry = render_page(job, seed, *options)
+    channels = 1 if img.mode == "L" else 3
+    if img.width * img.height * channels > slot_bytes:
+        return img, truth, entry
+    if path not in _arena_maps:
+        with open(path, "r+b") as f:
+            _arena_maps[path] = mmap.mmap(f.fileno(), 0)
+    # Pillow stores RGB padded to 4 bytes per pixel, so np.asarray packs the
+    # page once and the copy into the slot is the only other pass.
+    pixels = slot_pixels(_arena_maps[path], slot * slot_bytes, img.size, img.mode)
+    np.copyto(pixels, np.asarray(img))
+    return ArenaImage(slot, img.size, img.mode), truth, entry
+
+
+def estimate_page_bytes(
+    job: PageJob,
+    dpi: int = DPI,
+    color_mode: str = "RGB",
+    max_tile_mb: Optional[float] = None,
+) -> int:
+    # Calibrated on 600 DPI renders. Pillow keeps RGB at 4 bytes per pixel and
+    # a page holds two Pillow frames plus two numpy copies at a time.
+    # Full-frame effects add a float32 page, a float32 noise or mask plane
+    # and the 6 B/px remap grid of warped pages.
+    pixels = max_page_bytes(dpi, "L") // (1 if job.spread else 2)
+    channels = 1 if color_mode == "L" else 3
+    per_pixel = 2 * (4 if channels == 3 else 1) + 2 * channels
+    if max_tile_mb is None:
+        return RENDER_BASE_BYTES + pixels * (per_pixel + 4 * channels + 4 + 6)
+    tile_bytes = int(max_tile_mb * 1024 * 1024)
+    return RENDER_BASE_BYTES + pixels * per_pixel + tile_bytes
+
+
+class MemoryScheduler:
+    """Admit render jobs largest-first while their estimated peaks fit a budget.
+
+    Jobs are pulled lazily into a lookahead window of at most ``lookahead``
+    entries, kept sorted by estimated peak bytes (longest-processing-time
+    order, since cost tracks pixel count). Admission is first-fit: the
+    largest windowed job that fits next to the running ones goes next, so
+    each job is estimated once and scheduling costs O(log lookahead). A job
+    larger than the whole budget runs alone.
+    """
+
+    def __init__(
+        self,
+        jobs: Iterable[PageJob],
+        estimate: Callable[[PageJob], int],
+        budget_bytes: int,
+        report: Optional[Callable[[str, dict], None]] = None,
+        lookahead: int = 32,
+    ) -> None:
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1")
+        self._jobs = iter(jobs)
+        self._estimate = estimate
+        self.lookahead = lookahead
+        # Ascending (cost, -arrival) keys with their jobs, so the rightmost
+        # entry that fits is the largest one and ties go to the earliest job.
+        self._keys: List[Tuple[int, int]] = []
+        self._window: List[Tuple[int, PageJob]] = []
+        self._pulled = 0
+        self.budget_bytes = budget_bytes
+        self.in_flight_bytes = 0
+        self.peak_bytes = 0
+        self.running: Dict[str, int] = {}
+        self._report = report or (lambda kind, attrs: None)
+
+    def _fill(self) -> None:
+        while len(self._window) < self.lookahead:
+            job = next(self._jobs, None)
+            if job is None:
+                return
+            cost = self._estimate(job)
+            key = (cost, -self._pulled)
+            self._pulled += 1
+            index = bisect.bisect(self._keys, key)
+            self._keys.insert(index, key)
+            self._window.insert(index, (cost, job))
+
+    def _attrs(self, job: PageJob, cost: int) -> dict:
+        return {
+            "pageId": job.page_id,
+            "estimatedBytes": cost,
+            "queued": len(self._window),
+            "admitted": len(self.running),
+            "inFlightBytes": self.in_flight_bytes,
+            "budgetBytes": self.budget_bytes,
+        }
+
+    def admit(self) -> Optional[PageJob]:
+        self._fill()
+        if not self._window:
+            return None
+        if self.running:
+            free = self.budget_bytes - self.in_flight_bytes
+            index = bisect.bisect(self._keys, (free, 1)) - 1
+            if index < 0:
+                return None
+        else:
+            index = len(self._window) - 1
+        del self._keys[index]
+        cost, job = self._window.pop(index)
+        self.running[job.page_id] = cost
+        self.in_flight_bytes += cost
+        self.peak_bytes = max(self.peak_bytes, self.in_flight_bytes)
+        if cost > self.budget_bytes:
+            self._report("over-budget", self._attrs(job, cost))
+        self._report("admit", self._attrs(job, cost))
+        return job
+
+    def finish(self, job: PageJob) -> None:
+        cost = self.running.pop(job.page_id)
+        self.in_flight_bytes -= cost
+        self._report("finish", self._attrs(job, cost))
+
+    def close(self) -> None:
+        self._report(
+            "summary",
+            {
+                "budgetBytes": self.budget_bytes,
+                "peakInFlightBytes": self.peak_bytes,
+                "workerPeakRssBytes": _children_peak_rss(),
+            },
+        )
+
+
+def _children_peak_rss() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def build_pages(
+    seed: int,
+    workers: int = 1,
+    jobs: Optional[Iterable[PageJob]] = None,
+    color_mode: str = "RGB",
+    dpi: int = DPI,
+    max_tile_mb: Optional[float] = None,
+    arena: Optional[PageArena] = None,
+    mem_budget: Optional[int] = None,
+    report: Optional[Callable[[str, dict], None]] = None,
+    label_masks: bool = False,
+) -> Iterator[PageResult]:
+    jobs = PAGE_JOBS if jobs is None else jobs
+    options = (color_mode, dpi, max_tile_mb, label_masks)
+    report = report or (lambda kind, attrs: None)
+    if workers <= 1:
+        for job in jobs:
+            page = render_page(job, seed, *options)
+            report(
+                "operators", {"pageId": job.page_id, "operatorMs": operator_timings()}
+            )
+            yield page
+        return
+    scheduler: Optional[MemoryScheduler] = None
+    if mem_budget is not None:
+        estimate = partial(
+            estimate_page_bytes, dpi=dpi, color_mode=color_mode, max_tile_mb=max_tile_mb
+        )
+        scheduler = MemoryScheduler(
+            jobs, estimate, mem_budget, report, lookahead=max(32, 4 * workers)
+        )
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+
+        def submit(job: PageJob) -> Future:
+            if arena is None:
+                return pool.submit(_timed, render_page, job, seed, *options)
+            # Blocks until the encoders have finished with an earlier page.
+            slot = arena.acquire()
+            future = pool.submit(
+                _timed,
+                render_to_arena,
+                job,
+                seed,
+                options,
+                arena.path,
+                slot,
+                arena.slot_bytes,
+            )
+            future.add_done_callback(partial(_reclaim_slot, arena, slot))
+            return future
+
+        if scheduler is None:
+            results = _ordered_pages(jobs, submit, workers)
+        else:
+            results = _scheduled_pages(scheduler, submit, workers)
+        for page, timings in results:
+            report("operators", {"pageId": page[2].id, "operatorMs": timings})
+            yield page
+    if scheduler is not None:
+        # Worker peaks are only visible once the pool has shut down.
+        scheduler.close()
+
+
+def _ordered_pages(
+    jobs: Iterable[PageJob], submit: Callable[[PageJob], Future], workers: int
+) -> Iterator[Tuple[PageResult, Dict[str, float]]]:
+    # Keep at most one page per worker in flight so memory stays bounded by
+    # the pool size rather than the corpus size.
+    pending: Deque[Future] = deque()
+    for job in jobs:
+        pending.append(submit(job))
+        if len(pending) >= workers:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _scheduled_pages(
+    scheduler: MemoryScheduler, submit: Callable[[PageJob], Future], workers: int
+) -> Iterator[Tuple[PageResult, Dict[str, float]]]:
+    # Pages are yielded as they finish, so budget frees up as soon as a
+    # worker is done rather than when the oldest page is.
+    running: Dict[Future, PageJob] = {}
+    while True:
+        while len(running) < workers:
+            job = scheduler.admit()
+            if job is None:
+                break
+            running[submit(job)] = job
+        if not running:
+            break
+        done, _pending = wait(running, return_when=FIRST_COMPLETED)
+        for future in sorted(done, key=lambda f: running[f].page_id):
+            job = running.pop(future)
+            scheduler.finish(job)
+            yield future.result()
+
+
+def _reclaim_slot(arena: PageArena, slot: int, future: Future) -> None:
+    # Pages that failed or did not fit were never written to their slot.
+    if future.exception() is not None:
+        arena.discard(slot)
+    elif not isinstance(future.result()[0][0], ArenaImage):
+        arena.discard(slot)
+
+
+def render_fingerprint(
+    job: PageJob, seed: int, options: Tuple[str, int, Optional[float]]
+) -> Tuple[str, str]:
+    img, truth, _entry = render_page(job, seed, *options)
+    pixels = hashlib.sha256(f"{img.mode}:{img.size}:".encode("utf-8"))
+    pixels.update(img.tobytes())
+    payload = json.dumps(truth.model_dump(exclude_none=True), indent=2)
+    return pixels.hexdigest(), hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def verify_determinism(
+    seed: int,
+    jobs: Iterable[PageJob],
+    workers: int = 2,
+    color_mode: str = "RGB",
+    dpi: int = DPI,
+    max_tile_mb: Optional[float] = None,
+) -> Iterator[Tuple[PageJob, Tuple[str, str], Tuple[str, str]]]:
+    # Both renders of a page run at the same time in different workers, so
+    # any dependence on process state, scheduling or threads shows up as a
+    # digest mismatch.
+    options = (color_mode, dpi, max_tile_mb)
+    workers = max(2, workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending: Deque[Tuple[PageJob, Future, Future]] = deque()
+        for job in jobs:
+            first = pool.submit(render_fingerprint, job, seed, options)
+            second = pool.submit(render_fingerprint, job, seed, options)
+            pending.append((job, first, second))
+            if len(pending) * 2 >= workers:
+                job, first, second = pending.popleft()
+                yield job, first.result(), second.result()
+        while pending:
+            job, first, second = pending.popleft()
+            yield job, first.result(), second.result()
+
+
+def dependency_versions() -> Dict[str, str]:
+    import PIL
+
+    return {
+        "numpy": np.__version__,
+        "pillow": PIL.__version__,
+        "opencv": cv2.__version__,
+        "imagehash": getattr(imagehash, "__version__", "unknown"),
+    }
+
+
+def _shared_render_source() -> str:
+    # Everything above the first page builder (canvas, effects, geometry,
+    # writers) and the truth models can change any page, so it is hashed into
+    # every key. models.py is read as text so keying does not load pydantic.
+    first_builder = min(
+        inspect.getsourcelines(_unwrap_builder(job.render)[0])[1] for job in PAGE_JOBS
     )
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_spread(rng)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_curved_warp(rng)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_rotation_perspective(rng)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_rotation_only(rng)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_spread_light_gutter(rng)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_crop_adjustment(rng)
-    pages.append((img, truth, manifest))
-    img, truth, manifest = build_overlay_element_classes(rng)
-    pages.append((img, truth, manifest))
-
-    return pages
+    lines = inspect.getsource(sys.modules[__name__]).splitlines(keepends=True)
+    models_source = Path(__file__).with_name("models.py").read_text()
+    return "".join(lines[: first_builder - 1]) + models_source
+
+
+def _unwrap_builder(render: Callable) -> Tuple[Callable, Dict[str, Any]]:
+    if isinstance(render, partial):
+        return render.func, dict(render.keywords)
+    return render, {}
+
+
+def page_cache_key(
+    job: PageJob, seed: int, shared_hash: str, color_mode: str = "RGB"
+) -> str:
+    builder, kwargs = _unwrap_builder(job.render)
+    material = {
+        "pageId": job.page_id,
+        "seed": derive_page_seed(seed, job.page_id),
+        "builder": hashlib.sha256(inspect.getsource(builder).encode()).hexdigest(),
+        "kwargs": {key: repr(value) for key, value in sorted(kwargs.items())},
+        "shared": shared_hash,
+        "size": [WIDTH, HEIGHT, DPI],
+        "colorMode": color_mode,
+        "deps": dependency_versions(),
+    }
+    payload = json.dumps(material, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def page_cache_keys(seed: int, color_mode: str = "RGB") -> Dict[str, str]:
+    shared = hashlib.sha256(_shared_render_source().encode()).hexdigest()
+    return {
+        job.page_id: page_cache_key(job, seed, shared, color_mode) for job in PAGE_JOBS
+    }
+
+
+class BuildCache:
+    """Per-output build index mapping page ids to cache keys and checksums."""
+
+    VERSION = 1
+
+    def __init__(self, path: Path, records: Optional[Dict[str, dict]] = None) -> None:
+        self.path = path
+        self.records: Dict[str, dict] = records or {}
+
+    @staticmethod
+    def index_path(out_root: Path) -> Path:
+        return out_root / ".cache" / "build-index.json"
+
+    @classmethod
+    def load(cls, out_root: Path) -> "BuildCache":
+        path = cls.index_path(out_root)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(path)
+        if payload.get("version") != cls.VERSION:
+            return cls(path)
+        return cls(path, payload.get("pages", {}))
+
+    def lookup(
+        self, page_id: str, key: str, inputs_dir: Path, truth_dir: Path
+    ) -> Optional[ManifestEntry]:
+        record = self.records.get(page_id)
+        if record is None or record.get("key") != key:
+            return None
+        entry = models.ManifestEntry(**record["entry"])
+        if file_sha256(inputs_dir / f"{page_id}.png") != record.get("image"):
+            return None
+        if file_sha256(truth_dir / entry.truthFile) != record.get("truth"):
+            return None
+        return entry
+
+    def record(self, key: str, written: "WrittenPage") -> None:
+        self.records[written.truth.pageId] = {
+            "key": key,
+            "image": written.image_sha256,
+            "truth": written.truth_sha256,
+            "entry": written.entry.model_dump(exclude_none=True),
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": self.VERSION, "pages": dict(sorted(self.records.items()))}
+        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+class ChecksumIndex:
+    """sha256 of every file in an output level, written next to manifest.json."""
+
+    VERSION = 1
+    NAME = "checksums.json"
+
+    def __init__(self, root: Path, files: Optional[Dict[str, str]] = None) -> None:
+        self.root = root
+        self.files: Dict[str, str] = files or {}
+
+    @classmethod
+    def load(cls, root: Path) -> "ChecksumIndex":
+        payload = json.loads((root / cls.NAME).read_text(encoding="utf-8"))
+        if payload.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported checksum index version in {root}")
+        return cls(root, payload["files"])
+
+    def add(self, path: Path, digest: str) -> None:
+        self.files[path.relative_to(self.root).as_posix()] = digest
+
+    def save(self) -> None:
+        payload = {
+            "version": self.VERSION,
+            "algorithm": "sha256",
+            "files": dict(sorted(self.files.items())),
+        }
+        (self.root / self.NAME).write_text(
+            json.dumps(payload, indent=2), encoding="utf-8"
+        )
+
+    def verify(self, threads: int = 4) -> Iterator[Tuple[str, Optional[str]]]:
+        # file_digest streams each file through hashlib, which drops the GIL
+        # while hashing, so a thread pool keeps several file reads in flight.
+        names = sorted(self.files)
+        with ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="golden-verify"
+        ) as pool:
+            digests = pool.map(lambda name: file_sha256(self.root / name), names)
+            yield from zip(names, digests, strict=True)
+
+    def stale_sidecars(self) -> List[str]:
+        # Expected sidecars record the checksum of the input they were
+        # blessed from; a mismatch means the input changed since blessing.
+        stale = []
+        for path in sorted((self.root / "expected" / "sidecars").glob("*.json")):
+            try:
+                source = json.loads(path.read_text(encoding="utf-8")).get("source", {})
+            except json.JSONDecodeError:
+                continue
+            digest = self.files.get(f"inputs/{path.stem}.png")
+            if digest is not None and source.get("checksum") not in (None, digest):
+                stale.append(path.stem)
+        return stale
+
+
+@dataclass(frozen=True)
+class OutputLevel:
+    dpi: int
+    root: Path
+
+    @property
+    def inputs_dir(self) -> Path:
+        return self.root / "inputs"
+
+    @property
+    def truth_dir(self) -> Path:
+        return self.root / "truth"
+
+    @property
+    def labels_dir(self) -> Path:
+        return self.root / "labels"
+
+    @property
+    def pack_path(self) -> Path:
+        return self.root / "corpus.pack"
+
+    @property
+    def factor(self) -> float:
+        return self.dpi / DPI
+
+    @property
+    def image_size(self) -> Tuple[int, int]:
+        return int(round(WIDTH * self.factor)), int(round(HEIGHT * self.factor))
+
+
+@dataclass
+class WrittenPage:
+    truth: TruthPage
+    entry: ManifestEntry
+    image_path: Path
+    truth_path: Path
+    image_sha256: str
+    truth_sha256: str
+    queue_depth: int
+    dpi: int = DPI
+    labels_path: Optional[Path] = None
+    labels_sha256: Optional[str] = None
+
+
+@contextmanager
+def open_level(
+    img: Union[Image.Image, ArenaImage],
+    size: Tuple[int, int],
+    arena: Optional[PageArena] = None,
+) -> Iterator[Image.Image]:
+    """The page at `size` for the duration of one encode.
+
+    Arena pages are resampled straight from the slot, and full-size L pages
+    wrap it without a copy (RGB needs one to reach Pillow's 4-byte layout),
+    so the slot is released only when the block exits.
+    """
+    if not isinstance(img, ArenaImage):
+        yield resample_image(img, size)
+        return
+    pixels = arena.view(img)
+    try:
+        if img.size != size:
+            pixels = cv2.resize(pixels, size, interpolation=cv2.INTER_AREA)
+        yield Image.fromarray(pixels)
+    finally:
+        arena.release(img.slot)
+
+
+def save_level(
+    img: Union[Image.Image, ArenaImage],
+    size: Tuple[int, int],
+    path: Path,
+    arena: Optional[PageArena] = None,
+) -> str:
+    with open_level(img, size, arena) as page:
+        return save_image(page, path)
+
+
+def pack_level(
+    img: Union[Image.Image, ArenaImage],
+    size: Tuple[int, int],
+    codec: str,
+    arena: Optional[PageArena] = None,
+) -> PackedPage:
+    with open_level(img, size, arena) as page:
+        return pack_pixels(page, codec)
+
+
+def _encode_inline(encode: Callable[..., Any], *args: Any) -> Future:
+    # encoders=0: encode on the calling thread, one page at a time.
+    future: Future = Future()
+    try:
+        future.set_result(encode(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def write_pages(
+    pages: Iterable[PageResult],
+    levels: List[OutputLevel],
+    encoders: int = 2,
+    arena: Optional[PageArena] = None,
+    packs: Optional[Dict[int, PackWriter]] = None,
+) -> Iterator[WrittenPage]:
+    # PNG encoding releases the GIL inside Pillow's zlib encoder, so a small
+    # thread pool overlaps compression with rendering of the next page. At
+    # most `encoders` images wait in the queue to keep memory bounded. Pages
+    # are rendered at the first (highest) level; the encoder threads derive
+    # lower levels with area resampling, one level at a time. With packs the
+    # threads only resample and compress; pages are appended in order here.
+    # With no encoders every page is encoded inline before the next render.
+    # Worker pages may arrive before this process has touched PIL or numpy.
+    preload(np, Image)
+    with (
+        ThreadPoolExecutor(max_workers=encoders, thread_name_prefix="golden-png")
+        if encoders > 0
+        else nullcontext()
+    ) as pool:
+        submit = _encode_inline if pool is None else pool.submit
+        pending: Deque[Tuple[Future, WrittenPage]] = deque()
+
+        def drain(limit: int) -> Iterator[WrittenPage]:
+            while len(pending) > limit:
+                future, written = pending.popleft()
+                result = future.result()
+                if isinstance(result, PackedPage):
+                    pack = packs[written.dpi]
+                    truth = written.truth.model_dump(exclude_none=True)
+                    labels = written.truth.labels
+                    if labels is not None:
+                        labels = labels.model_dump()
+                    result = pack.add(written.truth.pageId, result, truth, labels)
+                written.image_sha256 = result
+                written.queue_depth = len(pending)
+                yield written
+
+        for img, truth, entry in pages:
+            if isinstance(img, ArenaImage):
+                arena.retain(img.slot, len(levels))
+            for level in levels:
+                level_truth = scale_truth(truth, level.factor)
+                bounds = level_truth.pageBoundsPx
+                size = (bounds[2] + 1, bounds[3] + 1)
+                if packs:
+                    pack = packs[level.dpi]
+                    img_path = truth_path = pack.path
+                    truth_sha = hashlib.sha256(dump_json(level_truth)).hexdigest()
+                    future = submit(pack_level, img, size, pack.codec, arena)
+                else:
+                    img_path = level.inputs_dir / f"{truth.pageId}.png"
+                    truth_path = level.truth_dir / entry.truthFile
+                    truth_sha = save_json(level_truth, truth_path)
+                    future = submit(save_level, img, size, img_path, arena)
+                written = WrittenPage(
+                    level_truth,
+                    entry,
+                    img_path,
+                    truth_path,
+                    "",
+                    truth_sha,
+                    0,
+                    level.dpi,
+                )
+                if level_truth.labels is not None and not packs:
+                    written.labels_path = level.labels_dir / f"{truth.pageId}.json"
+                    written.labels_sha256 = save_labels(
+                        level_truth.labels, written.labels_path
+                    )
+                pending.append((future, written))
+                yield from drain(encoders)
+            del img
+        yield from drain(0)
+
+
+def encode_frame(
+    img: Union[Image.Image, ArenaImage],
+    size: Tuple[int, int],
+    fmt: str,
+    arena: Optional[PageArena] = None,
+) -> Tuple[dict, bytes]:
+    with open_level(img, size, arena) as page:
+        return encode_pixels(page, fmt)
+
+
+def stream_pages(
+    pages: Iterable[PageResult],
+    sink: FrameSink,
+    fmt: str = "raw",
+    inflight: int = 4,
+    encoders: int = 2,
+    arena: Optional[PageArena] = None,
+) -> Iterator[Tuple[ManifestEntry, int, int]]:
+    # Encoder threads turn pages into frame payloads and this thread writes
+    # them in order. At most `inflight` frames wait for the sink, so when the
+    # consumer falls behind its blocking writes stall the queue and, through
+    # the lazily consumed `pages`, rendering itself.
+    preload(np, Image)
+    with (
+        ThreadPoolExecutor(max_workers=encoders, thread_name_prefix="golden-stream")
+        if encoders > 0
+        else nullcontext()
+    ) as pool:
+        submit = _encode_inline if pool is None else pool.submit
+        pending: Deque[Tuple[Future, TruthPage, ManifestEntry]] = deque()
+
+        def drain(limit: int) -> Iterator[Tuple[ManifestEntry, int, int]]:
+            while len(pending) > limit:
+                future, truth, entry = pending.popleft()
+                fields, payload = future.result()
+                header = {
+                    "kind": "page",
+                    "pageId": truth.pageId,
+                    **fields,
+                    "truth": truth.model_dump(exclude_none=True),
+                    "entry": entry.model_dump(exclude_none=True),
+                }
+                if truth.labels is not None:
+                    header["labels"] = truth.labels.model_dump()
+                yield entry, sink.write(header, payload), len(pending)
+
+        for img, truth, entry in pages:
+            if isinstance(img, ArenaImage):
+                arena.retain(img.slot, 1)
+            bounds = truth.pageBoundsPx
+            size = (bounds[2] + 1, bounds[3] + 1)
+            future = submit(encode_frame, img, size, fmt, arena)
+            pending.append((future, truth, entry))
+            del img
+            yield from drain(inflight)
+        yield from drain(0)
+
+
+def validate_levels(
+    reporter: RunReporter, indexes: List[ChecksumIndex], threads: int
+) -> None:
+    failures: List[str] = []
+    total = sum(len(index.files) for index in indexes)
+    with reporter.phase("validate", total=total) as phase:
+        for index in indexes:
+            for name, digest in index.verify(threads):
+                if digest is None:
+                    status = "missing"
+                elif digest != index.files[name]:
+                    status = "mismatch"
+                else:
+                    status = "ok"
+                phase.tick(1, attrs={"file": str(index.root / name), "status": status})
+                if status != "ok":
+                    failures.append(f"{index.root / name} ({status})")
+            stale = index.stale_sidecars()
+            if stale:
+                reporter.warning(
+                    f"{len(stale)} expected sidecar(s) in {index.root} were blessed "
+                    "from different inputs",
+                    attrs={"pages": stale},
+                )
+    if failures:
+        raise RuntimeError(
+            f"Checksum verification failed for {len(failures)} file(s): "
+            + ", ".join(failures[:5])
+        )
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate golden corpus v1")
     parser.add_argument("--seed", type=int, default=1337)
-    parser.add_argument("--out", type=str, required=True)
+    parser.add_argument("--out", type=str, default=None)
     parser.add_argument("--run-id", type=str, default=None)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Render pages in a process pool of this size (output is identical for any N).",
+    )
+    parser.add_argument(
+        "--encoders",
+        type=int,
+        default=2,
+        help="Background PNG encoder threads overlapping with rendering "
+        "(0 encodes on the main thread).",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=None,
+        metavar="PAGE_ID",
+        help="Regenerate only these pages (repeatable); others come from the build cache.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the build cache and regenerate every page.",
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=None,
+        help="Generate N parametric pages sampled from --mix instead of the golden set.",
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=None,
+        help="Family weights for --pages, e.g. clean=4,spread=1,warp=1 "
+        f"(families: {', '.join(SCALED_FAMILIES)}).",
+    )
+    parser.add_argument(
+        "--color-mode",
+        choices=COLOR_MODES,
+        default="RGB",
+        help="Render and save pages as RGB or single-channel L images.",
+    )
+    parser.add_argument(
+        "--dpi-levels",
+        type=parse_dpi_levels,
+        default=None,
+        help="Render each page once at the highest DPI and write one corpus per "
+        "level under <out>/dpi<N>, e.g. 150,300,600.",
+    )
+    parser.add_argument(
+        "--max-tile-mb",
+        type=float,
+        default=None,
+        help="Process effects, masks and warps in horizontal bands whose float "
+        "working buffers fit this budget (output is identical to full-frame).",
+    )
+    parser.add_argument(
+        "--mem-budget",
+        type=parse_size,
+        default=None,
+        help="Admit worker renders largest-first only while their estimated peak "
+        "memory fits this budget, e.g. 6G or 1500M (plain numbers are MB).",
+    )
+    parser.add_argument(
+        "--pack",
+        choices=PACK_CODECS,
+        default=None,
+        help="Write each level as one memory-mappable corpus.pack of raw or "
+        "zlib-compressed page buffers with embedded truth, instead of PNG/JSON files.",
+    )
+    parser.add_argument(
+        "--label-masks",
+        action="store_true",
+        help="Also write a run-length-encoded per-pixel class mask per page to "
+        "labels/<id>.json (or into the pack), warped like the page.",
+    )
+    parser.add_argument(
+        "--stream",
+        type=str,
+        default=None,
+        metavar="TARGET",
+        help="Write pages as length-prefixed frames (JSON header with truth, then "
+        "pixels) to stdout (-) or this Unix socket path instead of a corpus.",
+    )
+    parser.add_argument(
+        "--stream-format",
+        choices=STREAM_FORMATS,
+        default="raw",
+        help="Frame payload: raw page pixels or PNG bytes.",
+    )
+    parser.add_argument(
+        "--stream-inflight",
+        type=int,
+        default=4,
+        help="Encoded frames allowed to wait for the consumer before rendering pauses.",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Only re-hash an existing corpus under --out against its checksums.json.",
+    )
+    parser.add_argument(
+        "--verify-determinism",
+        action="store_true",
+        help="Render the selected pages (--only, --pages or all) twice concurrently "
+        "and compare digests instead of writing a corpus.",
+    )
+    parser.add_argument(
+        "--verify-threads",
+        type=int,
+        default=4,
+        help="Threads hashing files in the validate phase.",
+    )
     args = parser.parse_args()
+    if args.out is None and not (args.verify_determinism or args.stream):
+        parser.error("--out is required")
+    if args.stream is not None:
+        for flag, value in (
+            ("--verify", args.verify),
+            ("--verify-determinism", args.verify_determinism),
+            ("--only", args.only),
+            ("--dpi-levels", args.dpi_levels),
+            ("--pack", args.pack),
+        ):
+            if value:
+                parser.error(f"--stream cannot be combined with {flag}")
+        if args.stream_inflight < 1:
+            parser.error("--stream-inflight must be >= 1")
+    if args.verify and args.verify_determinism:
+        parser.error("--verify cannot be combined with --verify-determinism")
+    if args.pages is not None and args.pages < 1:
+        parser.error("--pages must be >= 1")
+    if args.pages is None and args.mix is not None:
+        parser.error("--mix requires --pages")
+    if args.pages is not None and args.only:
+        parser.error("--only cannot be combined with --pages")
+    if args.dpi_levels is not None and args.only:
+        parser.error("--only cannot be combined with --dpi-levels")
+    if args.pack is not None and args.only:
+        parser.error("--only cannot be combined with --pack")
+    if args.label_masks and args.only:
+        parser.error("--only cannot be combined with --label-masks")
+    if args.no_cache and args.only:
+        parser.error("--only cannot be combined with --no-cache")
+    known_ids = {job.page_id for job in PAGE_JOBS}
+    only = set(args.only or [])
+    if only - known_ids:
+        parser.error(f"unknown page id(s): {', '.join(sorted(only - known_ids))}")
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if args.encoders < 0:
+        parser.error("--encoders must be >= 0")
+    if args.max_tile_mb is not None and args.max_tile_mb <= 0:
+        parser.error("--max-tile-mb must be > 0")
+    if args.verify_threads < 1:
+        parser.error("--verify-threads must be >= 1")
 
     run_id = args.run_id or f"golden-{args.seed}-{int(time.time() * 1000)}"
     obs_path = Path(__file__).resolve().parents[1] / "observability"
@@ -959,57 +2850,370 @@ def main() -> None:
         sys.path.append(str(obs_path))
     from py_reporter import create_run_reporter
 
-    reporter = create_run_reporter("golden_corpus", run_id=run_id)
+    # Frames own stdout when streaming there, so only the events file is kept.
+    reporter = create_run_reporter(
+        "golden_corpus", run_id=run_id, enable_console=args.stream != "-"
+    )
 
     try:
+        if args.verify:
+            out_root = Path(args.out)
+            roots = sorted(
+                path.parent for path in out_root.glob(f"**/{ChecksumIndex.NAME}")
+            )
+            if not roots:
+                raise RuntimeError(f"No {ChecksumIndex.NAME} under {out_root}")
+            indexes = [ChecksumIndex.load(root) for root in roots]
+            validate_levels(reporter, indexes, args.verify_threads)
+            print(f"Golden corpus at {out_root} matches its checksums")
+            reporter.finalize(
+                {
+                    "files": sum(len(index.files) for index in indexes),
+                    "levels": [str(root) for root in roots],
+                }
+            )
+            return
+        if args.verify_determinism:
+            if args.pages is not None:
+                jobs = list(iter_scaled_jobs(args.seed, args.pages, args.mix))
+            else:
+                jobs = [job for job in PAGE_JOBS if not only or job.page_id in only]
+            dpi = DPI if args.dpi_levels is None else args.dpi_levels[0]
+            diverged = []
+            with reporter.phase("verify-determinism", total=len(jobs)) as phase:
+                for job, first, second in verify_determinism(
+                    args.seed,
+                    jobs,
+                    workers=args.workers,
+                    color_mode=args.color_mode,
+                    dpi=dpi,
+                    max_tile_mb=args.max_tile_mb,
+                ):
+                    stable = first == second
+                    phase.tick(
+                        1,
+                        attrs={
+                            "pageId": job.page_id,
+                            "stable": stable,
+                            "image": first[0],
+                            "truth": first[1],
+                        },
+                    )
+                    if not stable:
+                        diverged.append(job.page_id)
+            if diverged:
+                raise RuntimeError(
+                    f"Non-deterministic output for {len(diverged)} page(s): "
+                    + ", ".join(diverged)
+                )
+            print(f"{len(jobs)} page(s) rendered identically twice")
+            reporter.finalize({"pages": len(jobs), "dpi": dpi})
+            return
+
+        operator_ms: Dict[str, float] = {}
+
+        def report_build(kind: str, attrs: dict) -> None:
+            if kind == "operators":
+                for label, ms in attrs["operatorMs"].items():
+                    operator_ms[label] = operator_ms.get(label, 0.0) + ms
+                reporter.log_event(
+                    "metric",
+                    phase="generate",
+                    ms=int(sum(attrs["operatorMs"].values())),
+                    attrs=attrs,
+                )
+                return
+            if kind == "over-budget":
+                reporter.warning(
+                    f"{attrs['pageId']} is estimated above --mem-budget; "
+                    "rendering it alone",
+                    attrs=attrs,
+                )
+                return
+            reporter.log_event(
+                "metric", phase="schedule", attrs={"event": kind, **attrs}
+            )
+
+        if args.stream is not None:
+            seed_everything(args.seed)
+            if args.pages is not None:
+                jobs = iter_scaled_jobs(args.seed, args.pages, args.mix)
+                total = args.pages
+            else:
+                jobs = PAGE_JOBS
+                total = len(PAGE_JOBS)
+            entries: List[ManifestEntry] = []
+            start = time.perf_counter()
+            # Unstreamed frames keep their arena slot until encoded.
+            arena_slots = args.workers + args.stream_inflight + 1
+            with (
+                FrameSink(args.stream) as sink,
+                (
+                    PageArena(arena_slots, max_page_bytes(DPI, args.color_mode))
+                    if args.workers > 1
+                    else nullcontext()
+                ) as arena,
+                reporter.phase("stream", total=total) as phase,
+            ):
+                sink.write(
+                    {
+                        "kind": "start",
+                        "version": STREAM_VERSION,
+                        "seed": args.seed,
+                        "dpi": DPI,
+                        "colorMode": args.color_mode,
+                        "format": args.stream_format,
+                        "pages": total,
+                    }
+                )
+                pages = build_pages(
+                    args.seed,
+                    workers=args.workers,
+                    jobs=jobs,
+                    color_mode=args.color_mode,
+                    max_tile_mb=args.max_tile_mb,
+                    arena=arena,
+                    mem_budget=args.mem_budget,
+                    report=report_build,
+                    label_masks=args.label_masks,
+                )
+                for entry, size, depth in stream_pages(
+                    pages,
+                    sink,
+                    args.stream_format,
+                    inflight=args.stream_inflight,
+                    encoders=args.encoders,
+                    arena=arena,
+                ):
+                    entries.append(entry)
+                    phase.tick(
+                        1,
+                        attrs={"pageId": entry.id, "bytes": size, "queueDepth": depth},
+                    )
+                if args.pages is not None:
+                    entries.sort(key=lambda e: e.id)
+                manifest = models.Manifest(
+                    version="1",
+                    seed=args.seed,
+                    dpi=DPI,
+                    imageSizePx={"width": WIDTH, "height": HEIGHT},
+                    pages=entries,
+                )
+                sink.write(
+                    {
+                        "kind": "end",
+                        "pages": len(entries),
+                        "manifest": manifest.model_dump(exclude_none=True),
+                    }
+                )
+            seconds = max(time.perf_counter() - start, 1e-9)
+            if args.stream != "-":
+                print(f"Streamed {len(entries)} page(s) to {args.stream}")
+            reporter.finalize(
+                {
+                    "pages": len(entries),
+                    "bytes": sink.bytes,
+                    "format": args.stream_format,
+                    "inflight": args.stream_inflight,
+                    "pagesPerSecond": round(len(entries) / seconds, 2),
+                    "megabytesPerSecond": round(sink.bytes / 1024 / 1024 / seconds, 1),
+                    "operatorMs": {
+                        label: round(ms, 1) for label, ms in sorted(operator_ms.items())
+                    },
+                }
+            )
+            return
+
         with reporter.phase("prepare") as phase:
-            rng = seed_everything(args.seed)
+            seed_everything(args.seed)
             out_root = Path(args.out)
-            inputs_dir = out_root / "inputs"
-            truth_dir = out_root / "truth"
-            expected_dir = out_root / "expected"
-            inputs_dir.mkdir(parents=True, exist_ok=True)
-            truth_dir.mkdir(parents=True, exist_ok=True)
-            expected_dir.mkdir(parents=True, exist_ok=True)
-            phase.set(1, 1)
-
-        with reporter.phase("generate") as phase:
-            pages = build_pages(rng)
-            phase.set(len(pages), len(pages))
-
-        with reporter.phase("write-truth", total=len(pages)) as phase:
-            for img, truth, entry in pages:
-                img_path = inputs_dir / f"{truth.pageId}.png"
-                save_image(img, img_path)
-                truth_path = truth_dir / entry.truthFile
-                save_json(truth, truth_path)
-                phase.tick(1, attrs={"pageId": truth.pageId, "image": str(img_path)})
-
-        with reporter.phase("validate", total=len(pages)) as phase:
-            missing = []
-            for _img, truth, entry in pages:
-                img_path = inputs_dir / f"{truth.pageId}.png"
-                truth_path = truth_dir / entry.truthFile
-                if not img_path.exists() or not truth_path.exists():
-                    missing.append((truth.pageId, str(img_path), str(truth_path)))
-                phase.tick(1)
-            if missing:
-                raise RuntimeError(f"Missing outputs for {len(missing)} page(s)")
-
-        with reporter.phase("manifest") as phase:
-            manifest = Manifest(
-                version="1",
-                seed=args.seed,
-                dpi=DPI,
-                imageSizePx={"width": WIDTH, "height": HEIGHT},
-                pages=[entry for _img, _truth, entry in pages],
+            if args.dpi_levels is None:
+                levels = [OutputLevel(DPI, out_root)]
+            else:
+                levels = [
+                    OutputLevel(dpi, out_root / f"dpi{dpi}") for dpi in args.dpi_levels
+                ]
+            for level in levels:
+                if args.pack is None:
+                    level.inputs_dir.mkdir(parents=True, exist_ok=True)
+                    level.truth_dir.mkdir(parents=True, exist_ok=True)
+                (level.root / "expected").mkdir(parents=True, exist_ok=True)
+            inputs_dir = levels[0].inputs_dir
+            truth_dir = levels[0].truth_dir
+            cache: Optional[BuildCache] = None
+            keys: Dict[str, str] = {}
+            by_id: Dict[str, ManifestEntry] = {}
+            jobs: Iterable[PageJob]
+            if args.pages is not None:
+                jobs = iter_scaled_jobs(args.seed, args.pages, args.mix)
+                total = args.pages
+            elif (
+                args.dpi_levels is not None or args.pack is not None or args.label_masks
+            ):
+                # The build cache only covers single-level PNG corpora.
+                jobs = PAGE_JOBS
+                total = len(PAGE_JOBS)
+            else:
+                if args.no_cache:
+                    cache = BuildCache(BuildCache.index_path(out_root))
+                else:
+                    cache = BuildCache.load(out_root)
+                keys = page_cache_keys(args.seed, args.color_mode)
+                planned: List[PageJob] = []
+                stale: List[str] = []
+                for job in PAGE_JOBS:
+                    cached = None
+                    if not only or job.page_id not in only:
+                        cached = cache.lookup(
+                            job.page_id, keys[job.page_id], inputs_dir, truth_dir
+                        )
+                    if cached is not None:
+                        by_id[job.page_id] = cached
+                    elif only and job.page_id not in only:
+                        stale.append(job.page_id)
+                    else:
+                        planned.append(job)
+                if stale:
+                    raise RuntimeError(
+                        "--only reuses every other page from the build cache, but "
+                        f"{len(stale)} page(s) are missing or stale: "
+                        f"{', '.join(stale[:5])}; run without --only to rebuild them"
+                    )
+                jobs = planned
+                total = len(planned)
+            phase.set(
+                1,
+                1,
+                attrs={
+                    "cached": len(by_id),
+                    "render": total,
+                    "only": sorted(only),
+                    "scaled": args.pages is not None,
+                    "dpiLevels": [level.dpi for level in levels],
+                },
             )
-            manifest_path = out_root / "manifest.json"
-            save_json(manifest, manifest_path)
-            phase.set(1, 1)
+
+        indexes = {level.dpi: ChecksumIndex(level.root) for level in levels}
+        packs: Dict[int, PackWriter] = {}
+        if args.pack is not None:
+            packs = {
+                level.dpi: PackWriter(level.pack_path, args.pack) for level in levels
+            }
+        level_entries: Dict[int, Dict[str, ManifestEntry]] = {
+            level.dpi: {} for level in levels
+        }
+        written_total = total * len(levels)
+        # Worker pages travel through a shared memory-mapped arena; enough
+        # slots for every in-flight render plus every page queued to encode.
+        arena_slots = args.workers + args.encoders + 1
+        with (
+            (
+                PageArena(arena_slots, max_page_bytes(levels[0].dpi, args.color_mode))
+                if args.workers > 1
+                else nullcontext()
+            ) as arena,
+            reporter.phase("generate", total=total) as gen_phase,
+            reporter.phase("write-truth", total=written_total) as write_phase,
+        ):
+
+            def rendered() -> Iterator[PageResult]:
+                for page in build_pages(
+                    args.seed,
+                    workers=args.workers,
+                    jobs=jobs,
+                    color_mode=args.color_mode,
+                    dpi=levels[0].dpi,
+                    max_tile_mb=args.max_tile_mb,
+                    arena=arena,
+                    mem_budget=args.mem_budget,
+                    report=report_build,
+                    label_masks=args.label_masks,
+                ):
+                    gen_phase.tick(
+                        1, attrs={"pageId": page[1].pageId, "workers": args.workers}
+                    )
+                    yield page
+
+            for written in write_pages(
+                rendered(), levels, encoders=args.encoders, arena=arena, packs=packs
+            ):
+                write_phase.tick(
+                    1,
+                    attrs={
+                        "pageId": written.truth.pageId,
+                        "image": str(written.image_path),
+                        "dpi": written.dpi,
+                        "queueDepth": written.queue_depth,
+                    },
+                )
+                if not packs:
+                    index = indexes[written.dpi]
+                    index.add(written.image_path, written.image_sha256)
+                    index.add(written.truth_path, written.truth_sha256)
+                if written.labels_path is not None:
+                    index.add(written.labels_path, written.labels_sha256)
+                if cache is not None:
+                    cache.record(keys[written.truth.pageId], written)
+                level_entries[written.dpi][written.truth.pageId] = written.entry
+            if cache is not None:
+                cache.save()
+                # Every reused page, --only included, was verified against these
+                # digests on lookup.
+                for page_id, entry in by_id.items():
+                    record = cache.records[page_id]
+                    indexes[DPI].add(inputs_dir / f"{page_id}.png", record["image"])
+                    indexes[DPI].add(truth_dir / entry.truthFile, record["truth"])
+
+        with reporter.phase("manifest", total=len(levels)) as phase:
+            for level in levels:
+                written_ids = level_entries[level.dpi]
+                if args.pages is not None:
+                    # Scheduled runs finish out of order; ids sort by index.
+                    entries = sorted(written_ids.values(), key=lambda e: e.id)
+                else:
+                    # Cached pages only exist for single-level builds.
+                    merged = {**by_id, **written_ids}
+                    entries = [
+                        merged[job.page_id]
+                        for job in PAGE_JOBS
+                        if job.page_id in merged
+                    ]
+                width, height = level.image_size
+                manifest = models.Manifest(
+                    version="1",
+                    seed=args.seed,
+                    dpi=level.dpi,
+                    imageSizePx={"width": width, "height": height},
+                    pages=entries,
+                )
+                if packs:
+                    # Page digests live in the pack index; the index here
+                    # covers the container as a whole.
+                    pack = packs[level.dpi]
+                    pack.close(manifest.model_dump(exclude_none=True))
+                    indexes[level.dpi].add(pack.path, file_sha256(pack.path))
+                manifest_path = level.root / "manifest.json"
+                indexes[level.dpi].add(
+                    manifest_path, save_json(manifest, manifest_path)
+                )
+                indexes[level.dpi].save()
+                phase.tick(1, attrs={"dpi": level.dpi})
+
+        validate_levels(reporter, list(indexes.values()), args.verify_threads)
 
         print(f"Golden corpus written to {out_root}")
-        reporter.finalize({"pages": len(pages), "output": str(out_root)})
+        reporter.finalize(
+            {
+                "pages": len(entries),
+                "rendered": total,
+                "cached": len(entries) - total,
+                "dpiLevels": [level.dpi for level in levels],
+                "output": str(out_root),
+                "operatorMs": {
+                    label: round(ms, 1) for label, ms in sorted(operator_ms.items())
+                },
+            }
+        )
     except Exception as exc:
         tb = traceback.extract_tb(exc.__traceback__)
         location = tb[-1] if tb else None
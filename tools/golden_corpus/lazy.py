@@ -0,0 +1,37 @@
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return `name` as a module that only executes on first attribute access.
+
+    Already-imported modules are returned as is. A missing module still fails
+    here, at import time, rather than at first use.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(importlib.import_module(parent), child, module)
+    return module
+
+
+def preload(*modules: ModuleType) -> None:
+    """Finish loading lazy modules before threads share them.
+
+    LazyLoader only became thread-safe in Python 3.12; before that two threads
+    touching a pending module at once can see it half-initialised.
+    """
+    for module in modules:
+        # Any attribute access makes LazyLoader finish executing the module.
+        _ = module.__name__
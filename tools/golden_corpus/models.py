@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Ornament(BaseModel):
+    box: List[int]
+    hash: str
+
+
+class Gutter(BaseModel):
+    side: str
+    widthPx: int
+
+
+class BaselineGrid(BaseModel):
+    medianSpacingPx: Optional[float]
+
+
+class LabelMask(BaseModel):
+    # Row-major run-length encoding: `values[i]` repeated `counts[i]` times
+    # fills the sizePx[1] x sizePx[0] mask; values index `classes`.
+    sizePx: List[int]
+    classes: List[str]
+    values: List[int]
+    counts: List[int]
+
+
+class TruthPage(BaseModel):
+    pageId: str
+    pageBoundsPx: List[int]
+    contentBoxPx: List[int]
+    gutter: Gutter
+    baselineGrid: BaselineGrid
+    ornaments: List[Ornament]
+    shouldSplit: bool
+    expectedReviewReasons: List[str]
+    # Written to its own labels/<id>.json, never into the truth JSON.
+    labels: Optional[LabelMask] = Field(default=None, exclude=True)
+
+
+class ManifestEntry(BaseModel):
+    id: str
+    description: str
+    tags: List[str]
+    truthFile: str
+    ssimThreshold: float
+    ornamentHash: Optional[str] = None
+
+
+class Manifest(BaseModel):
+    version: str
+    seed: int
+    dpi: int
+    imageSizePx: dict
+    pages: List[ManifestEntry]
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+HASH_BITS = 64
+CHUNKS = 4
+CHUNK_BITS = HASH_BITS // CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+# Past this chunk radius enumerating neighbours costs more than a scan.
+MAX_CHUNK_RADIUS = 3
+
+
+@dataclass(frozen=True)
+class OrnamentRecord:
+    hash: str
+    corpus: str
+    pageId: str
+    box: Optional[Tuple[int, ...]] = None
+
+
+def _chunks(value: int) -> List[int]:
+    return [(value >> (i * CHUNK_BITS)) & CHUNK_MASK for i in range(CHUNKS)]
+
+
+def _flip_masks(radius: int) -> List[int]:
+    # Every CHUNK_BITS-bit mask with at most `radius` bits set.
+    return [
+        sum(1 << bit for bit in bits)
+        for count in range(radius + 1)
+        for bits in combinations(range(CHUNK_BITS), count)
+    ]
+
+
+_FLIPS = {radius: _flip_masks(radius) for radius in range(MAX_CHUNK_RADIUS + 1)}
+
+
+class OrnamentIndex:
+    """Multi-index hash table over 64-bit perceptual hashes.
+
+    Each hash is split into four 16-bit chunks with one table per chunk. Two
+    hashes within Hamming distance k agree to within k // 4 bits on at least
+    one chunk, so a query only probes chunk values within that radius and
+    checks the few candidates it finds, instead of scanning every ornament.
+    """
+
+    VERSION = 1
+
+    def __init__(self, records: Iterable[OrnamentRecord] = ()) -> None:
+        self.records: List[OrnamentRecord] = []
+        self._values: List[int] = []
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(CHUNKS)]
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: OrnamentRecord) -> None:
+        value = int(record.hash, 16)
+        slot = len(self.records)
+        self.records.append(record)
+        self._values.append(value)
+        for table, chunk in zip(self._tables, _chunks(value), strict=True):
+            table.setdefault(chunk, []).append(slot)
+
+    def corpora(self) -> List[str]:
+        return sorted({record.corpus for record in self.records})
+
+    def without(self, corpora: Iterable[str]) -> "OrnamentIndex":
+        dropped = set(corpora)
+        return OrnamentIndex(r for r in self.records if r.corpus not in dropped)
+
+    def query(self, hash_hex: str, distance: int) -> List[Tuple[int, OrnamentRecord]]:
+        value = int(hash_hex, 16)
+        radius = distance // CHUNKS
+        if radius > MAX_CHUNK_RADIUS:
+            slots: Iterable[int] = range(len(self._values))
+        else:
+            seen = set()
+            flips = _FLIPS[radius]
+            for table, chunk in zip(self._tables, _chunks(value), strict=True):
+                for flip in flips:
+                    seen.update(table.get(chunk ^ flip, ()))
+            slots = seen
+        matches = []
+        for slot in slots:
+            d = (self._values[slot] ^ value).bit_count()
+            if d <= distance:
+                matches.append((d, slot))
+        matches.sort()
+        return [(d, self.records[slot]) for d, slot in matches]
+
+    def query_many(
+        self, hashes: Iterable[str], distance: int
+    ) -> Iterator[Tuple[str, List[Tuple[int, OrnamentRecord]]]]:
+        for hash_hex in hashes:
+            yield hash_hex, self.query(hash_hex, distance)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": self.VERSION,
+            "records": [asdict(record) for record in self.records],
+        }
+        path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "OrnamentIndex":
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls()
+        if payload.get("version") != cls.VERSION:
+            raise ValueError(f"{path} has unsupported index version")
+        return cls(
+            OrnamentRecord(
+                hash=item["hash"],
+                corpus=item["corpus"],
+                pageId=item["pageId"],
+                box=None if item.get("box") is None else tuple(item["box"]),
+            )
+            for item in payload["records"]
+        )
+
+
+def iter_corpus_ornaments(root: Path) -> Iterator[OrnamentRecord]:
+    """Ornaments of one corpus level: truth files, a pack, or the manifest."""
+    corpus = root.resolve().as_posix()
+    if root.is_file():
+        root = root.parent
+    manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+    truth_dir = root / "truth"
+    pack_path = root / "corpus.pack"
+    pack = None
+    if not truth_dir.is_dir() and pack_path.is_file():
+        from pack import CorpusPack
+
+        pack = CorpusPack(pack_path)
+    try:
+        for entry in manifest["pages"]:
+            truth = None
+            if pack is not None and entry["id"] in pack:
+                truth = pack.truth(entry["id"])
+            elif (truth_dir / entry["truthFile"]).is_file():
+                truth_path = truth_dir / entry["truthFile"]
+                truth = json.loads(truth_path.read_text(encoding="utf-8"))
+            if truth is not None:
+                for ornament in truth.get("ornaments", []):
+                    yield OrnamentRecord(
+                        ornament["hash"], corpus, entry["id"], tuple(ornament["box"])
+                    )
+            elif entry.get("ornamentHash"):
+                yield OrnamentRecord(entry["ornamentHash"], corpus, entry["id"])
+    finally:
+        if pack is not None:
+            pack.close()
+
+
+def corpus_roots(paths: Iterable[Path]) -> List[Path]:
+    # A --dpi-levels output holds one corpus per dpi<N> directory.
+    roots: List[Path] = []
+    for path in paths:
+        if (path / "manifest.json").is_file() or path.suffix == ".pack":
+            roots.append(path)
+        else:
+            roots.extend(sorted(p.parent for p in path.glob("dpi*/manifest.json")))
+    return roots
+
+
+def read_hashes(args: argparse.Namespace) -> List[str]:
+    hashes = list(args.hash or [])
+    if args.hashes_file is not None:
+        text = args.hashes_file.read_text(encoding="utf-8")
+        hashes.extend(line.strip() for line in text.splitlines() if line.strip())
+    for root in corpus_roots(args.from_corpus or []):
+        hashes.extend(record.hash for record in iter_corpus_ornaments(root))
+    for value in hashes:
+        try:
+            if len(value) * 4 != HASH_BITS:
+                raise ValueError
+            int(value, 16)
+        except ValueError:
+            raise ValueError(f"not a 64-bit hex phash: {value!r}") from None
+    return hashes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Index ornament perceptual hashes across corpora and query them"
+    )
+    parser.add_argument("--run-id", type=str, default=None)
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, text in (
+        ("build", "Create the index from these corpora, replacing any existing one."),
+        ("add", "Insert these corpora, replacing their previous entries."),
+    ):
+        sub = commands.add_parser(name, help=text)
+        sub.add_argument("--index", type=Path, required=True)
+        sub.add_argument(
+            "corpora",
+            type=Path,
+            nargs="+",
+            help="Corpus directories (with manifest.json), dpi-level roots or packs.",
+        )
+    query = commands.add_parser("query", help="Find ornaments near the given hashes.")
+    query.add_argument("--index", type=Path, required=True)
+    query.add_argument("--hash", action="append", default=None, help="Repeatable.")
+    query.add_argument(
+        "--hashes-file", type=Path, default=None, help="One hex hash per line."
+    )
+    query.add_argument(
+        "--from-corpus",
+        type=Path,
+        action="append",
+        default=None,
+        help="Query with every ornament of this corpus (repeatable).",
+    )
+    query.add_argument("--distance", type=int, default=6, help="Max Hamming distance.")
+    args = parser.parse_args()
+    if args.command == "query":
+        if not (args.hash or args.hashes_file or args.from_corpus):
+            parser.error("query needs --hash, --hashes-file or --from-corpus")
+        if not 0 <= args.distance <= HASH_BITS:
+            parser.error(f"--distance must be between 0 and {HASH_BITS}")
+
+    run_id = args.run_id or f"golden-ornaments-{int(time.time() * 1000)}"
+    obs_path = Path(__file__).resolve().parents[1] / "observability"
+    if str(obs_path) not in sys.path:
+        sys.path.append(str(obs_path))
+    from py_reporter import create_run_reporter
+
+    # Query results are JSON lines on stdout, so only the events file is kept.
+    reporter = create_run_reporter(
+        "golden_ornaments", run_id=run_id, enable_console=args.command != "query"
+    )
+
+    try:
+        with reporter.phase("load", total=1) as phase:
+            if args.command == "build":
+                index = OrnamentIndex()
+            else:
+                index = OrnamentIndex.load(args.index)
+            phase.set(1, 1, attrs={"ornaments": len(index)})
+
+        if args.command in ("build", "add"):
+            roots = corpus_roots(args.corpora)
+            if not roots:
+                raise RuntimeError("No corpus manifests found")
+            names = [root.resolve().as_posix() for root in roots]
+            with reporter.phase("index", total=len(roots)) as phase:
+                index = index.without(names)
+                for root in roots:
+                    before = len(index)
+                    for record in iter_corpus_ornaments(root):
+                        index.add(record)
+                    phase.tick(
+                        1, attrs={"corpus": str(root), "added": len(index) - before}
+                    )
+                index.save(args.index)
+            print(f"{len(index)} ornament(s) from {len(index.corpora())} corpora")
+            reporter.finalize(
+                {"ornaments": len(index), "corpora": len(index.corpora())}
+            )
+            return
+
+        hashes = read_hashes(args)
+        with reporter.phase("query", total=len(hashes)) as phase:
+            start = time.perf_counter()
+            matched = 0
+            for hash_hex, matches in index.query_many(hashes, args.distance):
+                matched += bool(matches)
+                result = {
+                    "query": hash_hex,
+                    "matches": [
+                        {"distance": d, **asdict(record)} for d, record in matches
+                    ],
+                }
+                print(json.dumps(result))
+                phase.tick(1)
+            ms = (time.perf_counter() - start) * 1000
+        reporter.log_event(
+            "metric",
+            phase="query",
+            ms=int(ms),
+            attrs={
+                "queries": len(hashes),
+                "matched": matched,
+                "distance": args.distance,
+                "ornaments": len(index),
+                "msPerQuery": round(ms / max(1, len(hashes)), 4),
+            },
+        )
+        reporter.finalize({"queries": len(hashes), "matched": matched})
+    except Exception as exc:
+        tb = traceback.extract_tb(exc.__traceback__)
+        location = tb[-1] if tb else None
+        reporter.error(
+            "GOLDEN_ORNAMENTS_FAILED",
+            str(exc),
+            file=location.filename if location else str(Path.cwd() / "UNKNOWN"),
+            line=location.lineno if location else 0,
+            col=0,
+            exc=exc,
+        )
+        reporter.finalize({"status": "fail"})
+        raise
+
+
+if __name__ == "__main__":
+    main()
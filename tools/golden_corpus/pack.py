@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+MAGIC = b"ASTPACK1"
+HEADER = struct.Struct("<8sQQ")
+ALIGNMENT = 4096
+CODECS = ("raw", "zlib")
+
+
+@dataclass(frozen=True)
+class PackedPage:
+    data: bytes
+    shape: Tuple[int, ...]
+    mode: str
+    codec: str
+    sha256: str
+
+
+def pack_pixels(img: Image.Image, codec: str = "raw") -> PackedPage:
+    # tobytes() is already the packed row-major layout np.asarray would copy.
+    raw = img.tobytes()
+    shape: Tuple[int, ...] = (img.height, img.width)
+    if len(img.getbands()) > 1:
+        shape += (len(img.getbands()),)
+    digest = hashlib.sha256(raw).hexdigest()
+    # Level 1 costs a fraction of PNG encoding and still shrinks paper pages
+    # several-fold.
+    data = zlib.compress(raw, 1) if codec == "zlib" else raw
+    return PackedPage(data, shape, img.mode, codec, digest)
+
+
+class PackWriter:
+    """Streams page buffers into a single aligned container file.
+
+    Layout: a fixed header (magic, index offset, index length), page buffers
+    each starting on a 4 KiB boundary, then a JSON index with one record per
+    page (id, offset, byte length, shape, dtype, mode, codec, sha256 of the
+    raw pixels, truth, optional run-length label mask) and the manifest. The header is patched on close, so
+    pages can be appended as they are rendered.
+    """
+
+    def __init__(self, path: Path, codec: str = "raw") -> None:
+        if codec not in CODECS:
+            raise ValueError(f"Unknown pack codec {codec!r}")
+        self.path = path
+        self.codec = codec
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("wb")
+        self._file.write(HEADER.pack(MAGIC, 0, 0))
+        self.pages: List[dict] = []
+
+    def _align(self) -> int:
+        offset = self._file.tell()
+        padding = -offset % ALIGNMENT
+        if padding:
+            self._file.write(b"\0" * padding)
+        return offset + padding
+
+    def add(
+        self,
+        page_id: str,
+        page: PackedPage,
+        truth: dict,
+        labels: Optional[dict] = None,
+    ) -> str:
+        offset = self._align()
+        self._file.write(page.data)
+        record = {
+            "id": page_id,
+            "offset": offset,
+            "nbytes": len(page.data),
+            "shape": list(page.shape),
+            "dtype": "uint8",
+            "mode": page.mode,
+            "codec": page.codec,
+            "sha256": page.sha256,
+            "truth": truth,
+        }
+        if labels is not None:
+            record["labels"] = labels
+        self.pages.append(record)
+        return page.sha256
+
+    def close(self, manifest: Optional[dict] = None) -> None:
+        if self._file.closed:
+            return
+        offset = self._align()
+        index = json.dumps(
+            {"version": 1, "manifest": manifest, "pages": self.pages}
+        ).encode("utf-8")
+        self._file.write(index)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, offset, len(index)))
+        self._file.close()
+
+    def __enter__(self) -> "PackWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class CorpusPack:
+    """Read-only, memory-mapped view of a corpus written with --pack.
+
+    `array()` returns raw pages as numpy views straight into the mapping, so
+    fetching a page copies nothing until its pixels are touched; zlib pages
+    are decompressed on access. Views keep the mapping alive after close().
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, offset, length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a corpus pack")
+        if length == 0:
+            raise ValueError(f"{self.path} was not closed; the index is missing")
+        index = json.loads(self._map[offset : offset + length])
+        self.manifest: Optional[dict] = index.get("manifest")
+        self._pages: Dict[str, dict] = {page["id"]: page for page in index["pages"]}
+
+    @property
+    def page_ids(self) -> List[str]:
+        return list(self._pages)
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._pages)
+
+    def __contains__(self, page_id: object) -> bool:
+        return page_id in self._pages
+
+    def record(self, page_id: str) -> dict:
+        return self._pages[page_id]
+
+    def truth(self, page_id: str) -> dict:
+        return self._pages[page_id]["truth"]
+
+    def array(self, page_id: str) -> np.ndarray:
+        page = self._pages[page_id]
+        shape = tuple(page["shape"])
+        if page["codec"] == "zlib":
+            start = page["offset"]
+            with memoryview(self._map) as view:
+                raw = zlib.decompress(view[start : start + page["nbytes"]])
+            return np.frombuffer(raw, dtype=page["dtype"]).reshape(shape)
+        return np.frombuffer(
+            self._map,
+            dtype=page["dtype"],
+            count=page["nbytes"],
+            offset=page["offset"],
+        ).reshape(shape)
+
+    def labels(self, page_id: str) -> Optional[np.ndarray]:
+        mask = self._pages[page_id].get("labels")
+        if mask is None:
+            return None
+        width, height = mask["sizePx"]
+        values = np.asarray(mask["values"], dtype=np.uint8)
+        return np.repeat(values, mask["counts"]).reshape(height, width)
+
+    def image(self, page_id: str) -> Image.Image:
+        return Image.fromarray(self.array(page_id), mode=self._pages[page_id]["mode"])
+
+    def verify(self, page_id: str) -> bool:
+        digest = hashlib.sha256(self.array(page_id)).hexdigest()
+        return digest == self._pages[page_id]["sha256"]
+
+    def close(self) -> None:
+        try:
+            self._map.close()
+        except BufferError:
+            # Arrays handed out by array() still reference the mapping; it is
+            # released when the last of them is garbage collected.
+            pass
+
+    def __enter__(self) -> "CorpusPack":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
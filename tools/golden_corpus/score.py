@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+import argparse
+import filecmp
+import json
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = REPO_ROOT / "tests" / "fixtures" / "golden_corpus" / "v1"
+FILTERS = ("box", "gaussian")
+# Luma weights and constants used by ssim.js, which the desktop golden test
+# scores with, so thresholds mean the same thing in both places.
+LUMA = np.array([0.11402, 0.58704, 0.29894], dtype=np.float32)
+K1 = 0.01
+K2 = 0.03
+MIN_LEVEL_SIDE = 64
+
+
+@dataclass(frozen=True)
+class ScoreOptions:
+    filter: str = "box"
+    window: int = 11
+    downsample: bool = True
+    levels: int = 3
+    margin: float = 0.02
+    tile_rows: int = 512
+
+
+@dataclass
+class PageScore:
+    pageId: str
+    threshold: float
+    score: Optional[float]
+    passed: bool
+    level: int
+    size: Optional[Tuple[int, int]]
+    earlyExit: bool
+    reason: Optional[str] = None
+    ms: int = 0
+
+
+def load_luma(path: Path) -> Optional[np.ndarray]:
+    if not path.is_file():
+        return None
+    bgr = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if bgr is None:
+        return None
+    # cv2.transform saturates back to uint8, rounding like ssim.js's integer
+    # grey conversion.
+    return cv2.transform(bgr, LUMA[None, :]).astype(np.float32)
+
+
+def auto_downsample(luma: np.ndarray) -> np.ndarray:
+    # ssim.js "original" downsampling: average f x f blocks, with f chosen so
+    # the shorter side lands near 256 pixels.
+    height, width = luma.shape
+    factor = max(1, int(round(min(height, width) / 256)))
+    if factor == 1:
+        return luma
+    size = (width // factor, height // factor)
+    return cv2.resize(luma, size, interpolation=cv2.INTER_AREA)
+
+
+def pyramid(luma: np.ndarray, levels: int, window: int) -> List[np.ndarray]:
+    stack = [luma]
+    while len(stack) < levels and min(stack[-1].shape) // 2 >= max(
+        MIN_LEVEL_SIDE, window
+    ):
+        height, width = stack[-1].shape
+        stack.append(
+            cv2.resize(
+                stack[-1], (width // 2, height // 2), interpolation=cv2.INTER_AREA
+            )
+        )
+    return stack
+
+
+def _local_mean(band: np.ndarray, options: ScoreOptions) -> np.ndarray:
+    size = (options.window, options.window)
+    if options.filter == "gaussian":
+        return cv2.GaussianBlur(band, size, 1.5, borderType=cv2.BORDER_REFLECT)
+    return cv2.boxFilter(band, -1, size, borderType=cv2.BORDER_REFLECT)
+
+
+def ssim(x: np.ndarray, y: np.ndarray, options: ScoreOptions) -> float:
+    # Mean SSIM over every window that fits inside the image, computed in
+    # horizontal tiles with a halo so the float maps stay small. Each tile's
+    # valid windows see exactly the pixels a full-frame pass would.
+    c1 = (K1 * 255) ** 2
+    c2 = (K2 * 255) ** 2
+    halo = options.window // 2
+    height, width = x.shape
+    if height <= 2 * halo or width <= 2 * halo:
+        return float(np.array_equal(x, y))
+    total = 0.0
+    for top in range(halo, height - halo, options.tile_rows):
+        bottom = min(top + options.tile_rows, height - halo)
+        rows = slice(top - halo, bottom + halo)
+        a = x[rows]
+        b = y[rows]
+        mu_a = _local_mean(a, options)
+        mu_b = _local_mean(b, options)
+        var_a = _local_mean(a * a, options) - mu_a * mu_a
+        var_b = _local_mean(b * b, options) - mu_b * mu_b
+        cov = _local_mean(a * b, options) - mu_a * mu_b
+        mu_ab = mu_a * mu_b
+        num = (2 * mu_ab + c1) * (2 * cov + c2)
+        den = (mu_a * mu_a + mu_b * mu_b + c1) * (var_a + var_b + c2)
+        valid = (num / den)[halo:-halo, halo : width - halo]
+        total += float(valid.sum(dtype=np.float64))
+    return total / ((height - 2 * halo) * (width - 2 * halo))
+
+
+def score_page(task: Tuple[str, float, Path, Path], options: ScoreOptions) -> PageScore:
+    page_id, threshold, expected_path, actual_path = task
+    start = time.perf_counter()
+
+    def result(**fields: object) -> PageScore:
+        ms = int((time.perf_counter() - start) * 1000)
+        return PageScore(pageId=page_id, threshold=threshold, ms=ms, **fields)
+
+    # Deterministic pipelines mostly reproduce the blessed bytes exactly;
+    # comparing files is far cheaper than decoding two PNGs.
+    try:
+        identical = filecmp.cmp(expected_path, actual_path, shallow=False)
+    except FileNotFoundError:
+        identical = False
+    if identical:
+        return result(
+            score=1.0,
+            passed=True,
+            level=0,
+            size=None,
+            earlyExit=True,
+            reason="identical",
+        )
+    expected = load_luma(expected_path)
+    actual = load_luma(actual_path)
+    if expected is None or actual is None:
+        missing = "expected" if expected is None else "actual"
+        return result(
+            score=None,
+            passed=False,
+            level=0,
+            size=None,
+            earlyExit=False,
+            reason=f"missing-{missing}",
+        )
+    if expected.shape != actual.shape:
+        return result(
+            score=None,
+            passed=False,
+            level=0,
+            size=None,
+            earlyExit=False,
+            reason="size-mismatch",
+        )
+    if options.downsample:
+        expected = auto_downsample(expected)
+        actual = auto_downsample(actual)
+    levels = list(
+        zip(
+            pyramid(expected, options.levels, options.window),
+            pyramid(actual, options.levels, options.window),
+            strict=True,
+        )
+    )
+    # Downsampling averages small shifts and noise away, so coarse levels
+    # overstate similarity: a coarse score well below the threshold fails
+    # the page, but a pass is only decided at full resolution.
+    for level in range(len(levels) - 1, -1, -1):
+        x, y = levels[level]
+        score = ssim(x, y, options)
+        if level == 0 or score < threshold - options.margin:
+            break
+    height, width = x.shape
+    return result(
+        score=score,
+        passed=score >= threshold,
+        level=level,
+        size=(width, height),
+        earlyExit=level > 0,
+    )
+
+
+def _init_worker() -> None:
+    cv2.setNumThreads(1)
+
+
+def score_pages(
+    tasks: List[Tuple[str, float, Path, Path]],
+    options: ScoreOptions,
+    workers: int = 1,
+) -> Iterator[PageScore]:
+    if workers <= 1:
+        for task in tasks:
+            yield score_page(task, options)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        yield from pool.map(
+            score_page, tasks, [options] * len(tasks), chunksize=chunksize
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Score pipeline outputs against blessed golden images with SSIM"
+    )
+    parser.add_argument(
+        "--actual",
+        type=Path,
+        required=True,
+        help="Directory of normalized PNGs from a pipeline run.",
+    )
+    parser.add_argument(
+        "--expected",
+        type=Path,
+        default=FIXTURES / "expected" / "normalized",
+        help="Directory of blessed normalized PNGs.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=FIXTURES / "manifest.json",
+        help="Manifest providing page ids and ssimThreshold values.",
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--filter", choices=FILTERS, default="box")
+    parser.add_argument("--window", type=int, default=11)
+    parser.add_argument(
+        "--no-downsample",
+        action="store_true",
+        help="Score at native resolution instead of ssim.js-style ~256px images.",
+    )
+    parser.add_argument(
+        "--levels",
+        type=int,
+        default=3,
+        help="Pyramid levels tried coarse-to-fine (1 disables early exit).",
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=0.02,
+        help="A coarse score this far below the threshold fails the page early.",
+    )
+    parser.add_argument("--tile-rows", type=int, default=512)
+    parser.add_argument("--report", type=Path, default=None)
+    parser.add_argument("--run-id", type=str, default=None)
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    if args.window < 3 or args.window % 2 == 0:
+        parser.error("--window must be an odd number >= 3")
+    if args.levels < 1:
+        parser.error("--levels must be >= 1")
+    if args.tile_rows < 1:
+        parser.error("--tile-rows must be >= 1")
+    options = ScoreOptions(
+        filter=args.filter,
+        window=args.window,
+        downsample=not args.no_downsample,
+        levels=args.levels,
+        margin=args.margin,
+        tile_rows=args.tile_rows,
+    )
+
+    run_id = args.run_id or f"golden-ssim-{int(time.time() * 1000)}"
+    obs_path = Path(__file__).resolve().parents[1] / "observability"
+    if str(obs_path) not in sys.path:
+        sys.path.append(str(obs_path))
+    from py_reporter import create_run_reporter
+
+    reporter = create_run_reporter("golden_ssim", run_id=run_id)
+
+    try:
+        with reporter.phase("prepare") as phase:
+            manifest = json.loads(args.manifest.read_text(encoding="utf-8"))
+            tasks = [
+                (
+                    entry["id"],
+                    float(entry["ssimThreshold"]),
+                    args.expected / f"{entry['id']}.png",
+                    args.actual / f"{entry['id']}.png",
+                )
+                for entry in manifest["pages"]
+            ]
+            phase.set(1, 1, attrs={"pages": len(tasks), **asdict(options)})
+
+        scores: List[PageScore] = []
+        with reporter.phase("score", total=len(tasks)) as phase:
+            for page in score_pages(tasks, options, args.workers):
+                scores.append(page)
+                reporter.log_event(
+                    "metric", phase="score", ms=page.ms, attrs=asdict(page)
+                )
+                phase.tick(1, attrs={"pageId": page.pageId})
+                if not page.passed:
+                    detail = (
+                        page.reason
+                        if page.score is None
+                        else f"SSIM {page.score:.4f} < {page.threshold}"
+                    )
+                    reporter.warning(
+                        f"{page.pageId}: {detail}", attrs={"pageId": page.pageId}
+                    )
+
+        failed = [page.pageId for page in scores if not page.passed]
+        if args.report is not None:
+            args.report.parent.mkdir(parents=True, exist_ok=True)
+            report = {page.pageId: page.score for page in scores}
+            args.report.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"{len(scores) - len(failed)}/{len(scores)} page(s) met their threshold")
+        reporter.finalize(
+            {
+                "status": "fail" if failed else "ok",
+                "pages": len(scores),
+                "failed": failed,
+                "earlyExits": sum(page.earlyExit for page in scores),
+            }
+        )
+        if failed:
+            sys.exit(1)
+    except Exception as exc:
+        tb = traceback.extract_tb(exc.__traceback__)
+        location = tb[-1] if tb else None
+        reporter.error(
+            "GOLDEN_SSIM_FAILED",
+            str(exc),
+            file=location.filename if location else str(Path.cwd() / "UNKNOWN"),
+            line=location.lineno if location else 0,
+            col=0,
+            exc=exc,
+        )
+        reporter.finalize({"status": "fail"})
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+MAGIC = b"ASTF"
+VERSION = 1
+# Magic, header length, payload length; big-endian so consumers in any
+# language can read it with a fixed-size read.
+FRAME = struct.Struct(">4sIQ")
+FORMATS = ("raw", "png")
+
+
+@dataclass(frozen=True)
+class Frame:
+    header: dict
+    payload: bytes
+
+    @property
+    def kind(self) -> str:
+        return self.header["kind"]
+
+
+def encode_pixels(img: Image.Image, fmt: str) -> Tuple[dict, bytes]:
+    """Payload bytes for a page plus the header fields needed to decode them."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown stream format {fmt!r}")
+    fields = {
+        "encoding": fmt,
+        "mode": img.mode,
+        "width": img.width,
+        "height": img.height,
+    }
+    if fmt == "png":
+        # The consumer decodes right away, so favour encode speed over size.
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG", compress_level=1)
+        return fields, buffer.getvalue()
+    fields["channels"] = len(img.getbands())
+    return fields, img.tobytes()
+
+
+def decode_pixels(frame: Frame) -> np.ndarray:
+    header = frame.header
+    if header["encoding"] == "png":
+        with Image.open(io.BytesIO(frame.payload)) as img:
+            return np.asarray(img)
+    shape: Tuple[int, ...] = (header["height"], header["width"])
+    if header["channels"] > 1:
+        shape += (header["channels"],)
+    return np.frombuffer(frame.payload, dtype=np.uint8).reshape(shape)
+
+
+class FrameSink:
+    """Writes length-prefixed frames to stdout or a Unix domain socket.
+
+    Each frame is FRAME (magic, header length, payload length), a compact
+    UTF-8 JSON header and the payload. Writes block while the reader is
+    behind, which is what throttles the generator.
+    """
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        self._socket: Optional[socket.socket] = None
+        if target == "-":
+            self._file: BinaryIO = sys.stdout.buffer
+        else:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(target)
+            self._file = self._socket.makefile("wb")
+        self.frames = 0
+        self.bytes = 0
+
+    def write(self, header: dict, payload: bytes = b"") -> int:
+        data = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        self._file.write(FRAME.pack(MAGIC, len(data), len(payload)))
+        self._file.write(data)
+        self._file.write(payload)
+        self._file.flush()
+        size = FRAME.size + len(data) + len(payload)
+        self.frames += 1
+        self.bytes += size
+        return size
+
+    def close(self) -> None:
+        if self._socket is None:
+            self._file.flush()
+            return
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> "FrameSink":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+def _read_exact(source: BinaryIO, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = source.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frames(source: BinaryIO) -> Iterator[Frame]:
+    """Frames from a stream until EOF; a truncated frame is an error."""
+    while True:
+        prefix = _read_exact(source, FRAME.size)
+        if not prefix:
+            return
+        if len(prefix) < FRAME.size:
+            raise EOFError("stream ended inside a frame prefix")
+        magic, header_len, payload_len = FRAME.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"bad frame magic {magic!r}")
+        body = _read_exact(source, header_len + payload_len)
+        if len(body) < header_len + payload_len:
+            raise EOFError("stream ended inside a frame")
+        yield Frame(json.loads(body[:header_len]), body[header_len:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Consume a generate.py --stream feed and report its throughput"
+    )
+    parser.add_argument(
+        "--listen",
+        type=Path,
+        default=None,
+        help="Accept one connection on this Unix socket path instead of reading stdin.",
+    )
+    parser.add_argument(
+        "--decode", action="store_true", help="Also decode every page to pixels."
+    )
+    args = parser.parse_args()
+
+    server = None
+    if args.listen is None:
+        source: BinaryIO = sys.stdin.buffer
+    else:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if args.listen.exists():
+            os.unlink(args.listen)
+        server.bind(str(args.listen))
+        server.listen(1)
+        connection, _addr = server.accept()
+        source = connection.makefile("rb")
+    start = time.perf_counter()
+    pages = 0
+    payload_bytes = 0
+    end: Optional[dict] = None
+    for frame in read_frames(source):
+        payload_bytes += len(frame.payload)
+        if frame.kind == "page":
+            pages += 1
+            if args.decode:
+                decode_pixels(frame)
+        elif frame.kind == "end":
+            end = frame.header
+    seconds = time.perf_counter() - start
+    if server is not None:
+        source.close()
+        connection.close()
+        server.close()
+        os.unlink(args.listen)
+    if end is None:
+        raise SystemExit("stream closed without an end frame")
+    print(
+        json.dumps(
+            {
+                "pages": pages,
+                "payloadBytes": payload_bytes,
+                "seconds": round(seconds, 3),
+                "pagesPerSecond": round(pages / max(seconds, 1e-9), 2),
+                "megabytesPerSecond": round(
+                    payload_bytes / 1024 / 1024 / max(seconds, 1e-9), 1
+                ),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
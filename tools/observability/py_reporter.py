@@ -26,19 +26,29 @@ else:
     TimeElapsedColumn: TypeAlias = Any
     TimeRemainingColumn: TypeAlias = Any
 
-try:
-    from rich.progress import (  # type: ignore[import-not-found]
-        BarColumn,
-        Progress,
-        TaskID,
-        TextColumn,
-        TimeElapsedColumn,
-        TimeRemainingColumn,
-    )
+# rich is imported on the first progress update rather than at module load:
+# it dominates import time, and reporters that only log events or run with
+# the console disabled never draw a bar.
+_RICH_AVAILABLE: Optional[bool] = None
+
+
+def _rich_available() -> bool:
+    global _RICH_AVAILABLE, BarColumn, Progress, TextColumn
+    global TimeElapsedColumn, TimeRemainingColumn
+    if _RICH_AVAILABLE is None:
+        try:
+            from rich.progress import (  # type: ignore[import-not-found]
+                BarColumn,
+                Progress,
+                TextColumn,
+                TimeElapsedColumn,
+                TimeRemainingColumn,
+            )
 
-    _RICH_AVAILABLE = True
-except Exception:  # pragma: no cover - fallback
-    _RICH_AVAILABLE = False
+            _RICH_AVAILABLE = True
+        except Exception:  # pragma: no cover - fallback
+            _RICH_AVAILABLE = False
+    return _RICH_AVAILABLE
 
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -159,7 +169,7 @@ class RunReporter:
         self._emit(event)
 
     def _ensure_progress(self) -> None:
-        if not _RICH_AVAILABLE:
+        if not _rich_available():
             return
         if self._progress is None:
             self._progress = Progress(
@@ -178,7 +188,7 @@ class RunReporter:
             self._progress_started = True
 
     def _get_task(self, phase: str, total: Optional[int]) -> Optional[TaskID]:
-        if not _RICH_AVAILABLE:
+        if not self.enable_console or not _rich_available():
             return None
         self._ensure_progress()
         if self._progress is None:
@@ -212,14 +222,15 @@ class RunReporter:
     def _set(
         self, phase: str, current: int, total: Optional[int], attrs: Optional[dict]
     ) -> None:
+        # Counters always advance; only the emitted events are throttled.
+        self._phase_current[phase] = current
+        if total is not None:
+            self._phase_total[phase] = total
         now = time.time()
         last = self._last_progress_at.get(phase, 0.0)
         if now - last < self.min_progress_interval_s:
             return
         self._last_progress_at[phase] = now
-        self._phase_current[phase] = current
-        if total is not None:
-            self._phase_total[phase] = total
         self.log_event(
             "progress",
             phase=phase,
@@ -252,6 +263,9 @@ class RunReporter:
             ms=duration_ms,
             counters=self._maybe_counters(phase),
         )
+        task_id = self._tasks.get(phase)
+        if self._progress and task_id is not None:
+            self._progress.update(task_id, completed=self._phase_current.get(phase, 0))
         if self.enable_console:
             print(
                 f"{_timestamp()} [{status}] {phase} ({_format_duration(duration_ms)})"